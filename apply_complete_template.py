@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import re
 
-def apply_complete_discord_template():
-    """Apply complete Discord template to ALL application files"""
-    
-    # Complete Discord CSS template
-    discord_template_css = '''        /* Base styles with CSS variables for easier theming */
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from page_corpus import iter_pages
+
+# Complete Discord CSS template
+DISCORD_TEMPLATE_CSS = '''        /* Base styles with CSS variables for easier theming */
         :root {
             --primary-color: #06a3be;
             --primary-hover: #048ea6;
@@ -328,16 +329,35 @@ def apply_complete_discord_template():
             transform: translateY(-5px);
         }'''
 
-    files_to_fix = [f for f in os.listdir('pages/applications') if f.endswith('.html') and f != 'Discord.html']
+# Find the style section
+STYLE_PATTERN = r'<style>(.*?)</style>'
+
+def apply_template(content):
+    """Return a Splice replacing its style section with the template, or None"""
+    # Replace everything in the style tag with the complete Discord template
+    new_style_content = f'<style>\n{DISCORD_TEMPLATE_CSS}\n    </style>'
+    splice = Splice(content)
+    if not splice.sub(STYLE_PATTERN, new_style_content, re.DOTALL):
+        return None
+    return splice
+
+def apply_complete_discord_template(dry_run=False, **io_options):
+    """Apply complete Discord template to ALL application files"""
     
     applications_dir = 'pages/applications'
+    files_to_fix = (f for f in iter_pages(applications_dir)
+                    if f.endswith('.html') and os.path.basename(f) != 'Discord.html')
+    
     success_count = 0
+    page_count = 0
     
-    print(f"Applying complete Discord template to {len(files_to_fix)} files...")
+    print(f"Applying complete Discord template to the pages in {applications_dir}...")
+    writer = PageWriter('apply_complete_template', dry_run, **io_options)
     print("=" * 50)
     
-    for filename in files_to_fix:
-        file_path = os.path.join(applications_dir, filename)
+    for file_path in writer.begin(files_to_fix):
+        filename = os.path.basename(file_path)
+        page_count += 1
         
         if not os.path.exists(file_path):
             print(f"❌ File not found: {filename}")
@@ -345,21 +365,13 @@ def apply_complete_discord_template():
             
         try:
             # Read the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = writer.read(file_path)
             
-            # Find the style section
-            style_pattern = r'<style>(.*?)</style>'
-            match = re.search(style_pattern, content, re.DOTALL)
+            new_content = writer.apply(apply_template, content)
             
-            if match:
-                # Replace everything in the style tag with the complete Discord template
-                new_style_content = f'<style>\n{discord_template_css}\n    </style>'
-                new_content = re.sub(style_pattern, new_style_content, content, flags=re.DOTALL)
-                
+            if new_content is not None:
                 # Write the updated content back
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                writer.write(file_path, content, new_content)
                 
                 print(f"✅ Applied complete template: {filename}")
                 success_count += 1
@@ -370,7 +382,8 @@ def apply_complete_discord_template():
             print(f"❌ Error processing {filename}: {str(e)}")
     
     print("=" * 50)
-    print(f"Successfully applied complete template to {success_count}/{len(files_to_fix)} files")
+    print(f"Successfully applied complete template to {success_count}/{page_count} files")
+    writer.finish()
     
     print("\n📋 Complete Discord template includes:")
     print("• CSS Variables for consistent theming")
@@ -382,4 +395,7 @@ def apply_complete_discord_template():
     print("• All styling elements from Discord page")
 
 if __name__ == "__main__":
-    apply_complete_discord_template()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Apply the complete Discord template to all application pages")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+    apply_complete_discord_template(**batch_options(args))
\ No newline at end of file
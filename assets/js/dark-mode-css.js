@@ -0,0 +1,19 @@
+// Shortcut Sensei - Dark mode stylesheet switch
+// split_dark_css.py moves a page's .dark-mode rules into a stylesheet linked
+// with media="(prefers-color-scheme: dark)", so it never blocks the first
+// paint in light mode (the browser still fetches it at low priority). Once
+// the page turns dark, by the toggle or any other script adding dark-mode to
+// <body>, the stylesheet is applied whatever the system preference.
+(function () {
+    const sheets = document.querySelectorAll('link[data-dark-css]');
+    if (sheets.length === 0) return;
+
+    const update = () => {
+        if (!document.body.classList.contains('dark-mode')) return;
+        sheets.forEach(link => { link.media = 'all'; });
+        observer.disconnect();
+    };
+    const observer = new MutationObserver(update);
+    observer.observe(document.body, { attributes: true, attributeFilter: ['class'] });
+    update();
+})();
@@ -0,0 +1,110 @@
+// Shortcut Sensei - Lazy shortcut tables
+// Table bodies moved out of the page by build_lazy_tables.py carry
+// data-lazy-src and a placeholder row linking to the fragment page (the
+// no-JS fallback). Their rows are fetched when the table nears the viewport,
+// when the page's shortcut filter is used, or when a link targets the section.
+class LazyShortcutTables {
+    constructor() {
+        this.pending = new Map();
+        document.querySelectorAll('tbody[data-lazy-src]').forEach(body => {
+            this.pending.set(body, null);
+        });
+        if (this.pending.size === 0) return;
+
+        this.observeTables();
+        this.setupSearchHook();
+        this.loadTargetSection();
+        window.addEventListener('hashchange', () => this.loadTargetSection());
+        window.addEventListener('beforeprint', () => this.loadAll());
+    }
+
+    observeTables() {
+        if (!('IntersectionObserver' in window)) {
+            this.loadAll();
+            return;
+        }
+        this.observer = new IntersectionObserver(entries => {
+            entries.forEach(entry => {
+                if (entry.isIntersecting) {
+                    this.load(entry.target.tBodies[0]);
+                }
+            });
+        }, { rootMargin: '400px 0px' });
+        this.pending.forEach((_, body) => this.observer.observe(body.closest('table')));
+    }
+
+    setupSearchHook() {
+        const filterInput = document.getElementById('shortcut-filter') || document.getElementById('shortcut-search');
+        if (!filterInput) return;
+
+        // Runs before the page's own keyup filter; once the rows are in,
+        // replay the events so the filter sees them
+        filterInput.addEventListener('input', async () => {
+            if (this.pending.size === 0) return;
+            await this.loadAll();
+            filterInput.dispatchEvent(new Event('input'));
+            filterInput.dispatchEvent(new KeyboardEvent('keyup'));
+        });
+    }
+
+    loadTargetSection() {
+        const target = window.location.hash && document.getElementById(decodeURIComponent(window.location.hash.slice(1)));
+        const container = target && target.closest('.table-container');
+        const body = container && container.querySelector('tbody[data-lazy-src]');
+        if (body) {
+            this.load(body).then(() => target.scrollIntoView());
+        }
+    }
+
+    loadAll() {
+        return Promise.all([...this.pending.keys()].map(body => this.load(body)));
+    }
+
+    load(body) {
+        if (!this.pending.has(body)) return Promise.resolve();
+        if (!this.pending.get(body)) {
+            this.pending.set(body, this.fetchRows(body).finally(() => this.pending.delete(body)));
+        }
+        return this.pending.get(body);
+    }
+
+    async fetchRows(body) {
+        const url = new URL(body.getAttribute('data-lazy-src'), document.baseURI);
+        try {
+            const response = await fetch(url);
+            if (!response.ok) throw new Error(`HTTP ${response.status}`);
+            const fragment = new DOMParser().parseFromString(await response.text(), 'text/html');
+            const rows = fragment.querySelector('tbody');
+            if (!rows) throw new Error('no table body');
+
+            body.replaceChildren(...[...rows.children].map(row => document.importNode(row, true)));
+            body.removeAttribute('data-lazy-src');
+            body.addEventListener('click', event => this.copyFromRow(event));
+        } catch (error) {
+            // The placeholder link still leads to the rows
+            console.error('Error loading shortcut table:', url.href, error);
+        }
+        if (this.observer) this.observer.unobserve(body.closest('table'));
+    }
+
+    // The page binds its copy buttons on load, so loaded rows are handled here
+    copyFromRow(event) {
+        const button = event.target.closest('.copy-btn');
+        if (!button) return;
+        const shortcut = button.getAttribute('data-shortcut');
+        if (typeof window.copyShortcut === 'function') {
+            window.copyShortcut(shortcut);
+        } else if (navigator.clipboard) {
+            navigator.clipboard.writeText(shortcut);
+        }
+        const tooltip = button.querySelector('.tooltiptext');
+        if (tooltip) {
+            tooltip.classList.add('visible');
+            setTimeout(() => tooltip.classList.remove('visible'), 2000);
+        }
+    }
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+    window.lazyShortcutTables = new LazyShortcutTables();
+});
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Build the site-wide anchor index and sitemap, and repair duplicate ids.
+
+Every deployed page is read through the pre-parsed page cache for its
+title, its h2/h3 headings that carry an id (the deep-linkable sections)
+and every id attribute. The results are written to:
+
+    assets/data/anchors.json   per page: title, url, table of contents
+                               (headings with id, text and level) and any
+                               ids that occur more than once
+    sitemap.xml                one <url> per indexable page
+
+Pages marked noindex (such as the lazy table fragments) stay out of both,
+as do the test pages, the header/footer partials, the Firebase placeholder
+page and backup, copy and old versions of pages that are deployed
+alongside the real ones (UNLISTED_DIRS, UNLISTED_PAGES, UNLISTED_NAMES).
+The blog pages are listed once, from pages/blogs/ where
+generate_blog_pages.py renders them, not from the old copies at the root.
+
+The build is incremental. .anchor_index.json records each page's size,
+mtime and SHA-1 with the entry extracted from it; a page whose size and
+mtime are unchanged is not read at all, and one whose content hash is
+unchanged is not parsed again. The outputs are only rewritten when they
+change.
+
+--fix-ids renames the second and later elements sharing an id on a page to
+<id>-2, <id>-3, ... so anchors and getElementById() find one element.
+Links to the id keep pointing at the first one. Ids that the page's
+scripts look up (getElementById, querySelector) are reported for manual
+review instead, since the script may mean a later element. --toc writes an
+"On this page" list of the sections into pages with at least
+TOC_MIN_SECTIONS of them, between page-toc marker comments, and keeps it
+up to date on later runs. Both go through the batch page writer, so
+--dry-run shows the diffs.
+
+Usage:
+    python build_anchor_index.py [--fix-ids] [--toc] [--dry-run] [--base-url URL]
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+from urllib.parse import quote
+from xml.sax.saxutils import escape
+
+from check_links import UNDEPLOYED_DIRS
+from generate_blog_pages import BLOG_DIR
+from page_batch import PageWriter, add_batch_arguments, batch_options
+from page_cache import load_page, parse_bytes
+from page_corpus import find_pages
+from page_snapshots import atomic_write
+from shortcut_tables import cell_text
+
+ANCHORS_FILE = 'assets/data/anchors.json'
+SITEMAP_FILE = 'sitemap.xml'
+STATE_FILE = '.anchor_index.json'
+
+# Firebase Hosting default domain of the project in .github/workflows
+DEFAULT_BASE_URL = 'https://shortcut-sensei-1305f.web.app'
+
+# Deployed but not real pages: left out of the index, the sitemap and id fixes
+# (includes/ holds the header/footer partials, y/ the Firebase Hosting placeholder page)
+UNLISTED_DIRS = {'pages/test', 'includes', 'y'}
+UNLISTED_PAGES = {'header.html', 'footer.html'}
+UNLISTED_NAMES = re.compile(r'(?:^|[_ -])(?:old|backup|copy|fixed)(?:$|[_ -])', re.IGNORECASE)
+
+HEADING_TAGS = ('h2', 'h3')
+TOC_MIN_SECTIONS = 4
+TOC_START = '<!-- page-toc:start -->'
+TOC_END = '<!-- page-toc:end -->'
+
+# Bump when the extracted entry changes shape, so every page is read again
+INDEX_VERSION = 1
+
+_title_pattern = re.compile(rb'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+_noindex_pattern = re.compile(rb'<meta\s+name="robots"\s+content="[^"]*noindex', re.IGNORECASE)
+_id_pattern = re.compile(rb'(?<![\w:-])id\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_script_src_pattern = re.compile(r'<script\b[^>]*\bsrc\s*=\s*["\']([^"\'#?]+)', re.IGNORECASE)
+_script_id_pattern = re.compile(r'''getElementById\(\s*['"]([^'"]+)['"]'''
+                                r'''|(?:querySelector(?:All)?|\$)\(\s*['"]#([\w-]+)''')
+# Anchored at the line start: an unanchored [ \t]* retries from every blank of a long indent
+_toc_pattern = re.compile(r'^[ \t]*' + re.escape(TOC_START) + r'.*?' + re.escape(TOC_END) + r'\n',
+                          re.DOTALL | re.MULTILINE)
+
+
+def page_url(path):
+    return '/' + quote(path.replace(os.sep, '/'))
+
+
+def deployed_pages(root='.'):
+    """The deployed pages worth listing, without test pages and backup copies"""
+    paths = find_pages(root)
+    blog_names = {posixpath.basename(path.replace(os.sep, '/')) for path in paths
+                  if posixpath.dirname(path.replace(os.sep, '/')) == BLOG_DIR}
+    pages = []
+    for path in paths:
+        path_url = path.replace(os.sep, '/')
+        directory, name = posixpath.split(path_url)
+        if path_url.split('/', 1)[0] in UNDEPLOYED_DIRS or \
+                any(f'{directory}/'.startswith(f'{unlisted}/') for unlisted in UNLISTED_DIRS):
+            continue
+        if path_url in UNLISTED_PAGES or UNLISTED_NAMES.search(os.path.splitext(name)[0]):
+            continue
+        # Old copies of the generated blog pages
+        if not directory and name in blog_names:
+            continue
+        pages.append(path)
+    return pages
+
+
+def _headings(page):
+    """Return [(start, id, text, level)] for headings with an id, in page order"""
+    headings = []
+    for name in HEADING_TAGS:
+        closes = [start for _, start, _ in page.iter_tags(name, closing=True)]
+        for index, start, end in page.iter_tags(name):
+            anchor = page.tag_attrs(index).get('id')
+            if not anchor:
+                continue
+            close = next((c for c in closes if c > end), end)
+            headings.append((start, anchor, cell_text(page.text(end, close)), int(name[1])))
+    return sorted(headings)
+
+
+def _ids(page):
+    """Return {id: [(start, end) of the tags carrying it]} for every id on the page"""
+    ids = {}
+    for index, start, end in page.iter_tags():
+        tag = bytes(page.data[start:end])
+        if b'id' not in tag:
+            continue
+        match = _id_pattern.search(tag)
+        if match:
+            value = (match.group(1) if match.group(1) is not None else match.group(2)).decode('utf-8', 'replace')
+            ids.setdefault(value, []).append((start, end))
+    return ids
+
+
+def scan_page(path):
+    """Return the index entry for one page"""
+    with load_page(path) as page:
+        head = bytes(page.data[:8192])
+        title = _title_pattern.search(head)
+        headings = _headings(page)
+        ids = _ids(page)
+    return {
+        'title': ' '.join(html.unescape(title.group(1).decode('utf-8', 'replace')).split()) if title else '',
+        'url': page_url(path),
+        'indexable': not _noindex_pattern.search(head),
+        'toc': [{'id': anchor, 'text': text, 'level': level} for _, anchor, text, level in headings],
+        'duplicates': sorted(value for value, spans in ids.items() if len(spans) > 1 and value),
+    }
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('version') == INDEX_VERSION:
+            return state['pages']
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    return {}
+
+
+def update_index(paths, state):
+    """Return ({path: entry}, scanned paths), reusing state entries for unchanged pages"""
+    entries = {}
+    scanned = []
+    for path in paths:
+        stat = os.stat(path)
+        cached = state.get(path)
+        if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+            entries[path] = cached['entry']
+            continue
+        with open(path, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()
+        if not cached or cached['sha1'] != digest:
+            cached = {'sha1': digest, 'entry': scan_page(path)}
+            scanned.append(path)
+        state[path] = dict(cached, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        entries[path] = cached['entry']
+    for path in set(state) - set(paths):
+        del state[path]
+    return entries, scanned
+
+
+def script_ids(content, path):
+    """Ids looked up by the page's inline scripts and the local script files it loads"""
+    sources = [content]
+    for match in _script_src_pattern.finditer(content):
+        src = match.group(1)
+        if '//' in src:
+            continue
+        script = src.lstrip('/') if src.startswith('/') else os.path.join(os.path.dirname(path), src)
+        try:
+            with open(os.path.normpath(script), 'r', encoding='utf-8') as f:
+                sources.append(f.read())
+        except (OSError, UnicodeDecodeError):
+            continue
+    return {m.group(1) or m.group(2) for text in sources for m in _script_id_pattern.finditer(text)}
+
+
+def rename_duplicates(content, path):
+    """Return (content, [(old, new)], [held ids]) with later duplicate ids renamed
+
+    Ids the page's scripts look up are held for manual review instead: the
+    script may mean the later element, which renaming would hide from it.
+    """
+    # Spans from the text being edited: the file on disk may differ (CRLF line ends)
+    data = content.encode('utf-8')
+    ids = _ids(parse_bytes(data, path))
+    scripted = script_ids(content, path)
+    taken = set(ids)
+    edits = []
+    renames = []
+    held = []
+    for value, spans in ids.items():
+        if not value or len(spans) < 2:
+            continue
+        if value in scripted:
+            held.append(value)
+            continue
+        number = 2
+        for start, end in spans[1:]:
+            while f'{value}-{number}' in taken:
+                number += 1
+            new = f'{value}-{number}'
+            taken.add(new)
+            match = _id_pattern.search(data, start, end)
+            group = 1 if match.group(1) is not None else 2
+            edits.append((match.start(group), match.end(group), new.encode('utf-8')))
+            renames.append((value, new))
+    for start, end, replacement in sorted(edits, reverse=True):
+        data = data[:start] + replacement + data[end:]
+    return data.decode('utf-8'), renames, held
+
+
+def render_toc(entry, indent):
+    lines = [TOC_START, '<nav class="page-toc" aria-label="On this page">', '    <ul>']
+    for heading in entry['toc']:
+        if heading['level'] == 2:
+            lines.append(f'        <li><a href="#{html.escape(heading["id"])}">{html.escape(heading["text"])}</a></li>')
+    lines += ['    </ul>', '</nav>', TOC_END]
+    return ''.join(indent + line + '\n' for line in lines)
+
+
+def insert_toc(content, entry):
+    """Return the page with its table of contents block added or refreshed"""
+    sections = [heading for heading in entry['toc'] if heading['level'] == 2]
+    existing = _toc_pattern.search(content)
+    if len(sections) < TOC_MIN_SECTIONS:
+        return _toc_pattern.sub('', content) if existing else content
+    if existing:
+        indent = re.match(r'[ \t]*', existing.group(0)).group(0)
+        return content[:existing.start()] + render_toc(entry, indent) + content[existing.end():]
+
+    # Before the first section, or the table container that holds it
+    heading = re.search(r'<h2\b[^>]*\bid\s*=\s*"' + re.escape(sections[0]['id']) + '"', content)
+    if heading is None:
+        return content
+    position = heading.start()
+    container = content.rfind('<div class="table-container"', 0, position)
+    if container != -1 and '</div>' not in content[container:position]:
+        position = container
+    line_start = content.rfind('\n', 0, position) + 1
+    indent = re.match(r'[ \t]*', content[line_start:]).group(0)
+    return content[:line_start] + render_toc(entry, indent) + content[line_start:]
+
+
+def rewrite_page(path, content, entry, fix_ids, toc):
+    """Return (content, [(old id, new id)], [held ids]) for one page"""
+    renames = []
+    held = []
+    if fix_ids and entry['duplicates']:
+        content, renames, held = rename_duplicates(content, path)
+    if toc:
+        content = insert_toc(content, entry)
+    return content, renames, held
+
+
+def rewrite_pages(entries, fix_ids, toc, dry_run=False, **io_options):
+    """Rename duplicate ids and/or refresh tables of contents; return the pages changed"""
+    paths = [path for path, entry in entries.items()
+             if (fix_ids and entry['duplicates']) or (toc and entry['indexable'])]
+    writer = PageWriter('build_anchor_index', dry_run, **io_options)
+    changed = []
+    for path in writer.begin(paths):
+        try:
+            content = writer.read(path)
+            new_content, renames, held = writer.apply(rewrite_page, path, content, entries[path], fix_ids, toc)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error processing {path}: {e}")
+            continue
+        for old, new in renames:
+            print(f"🔧 {path}: id \"{old}\" → \"{new}\"")
+        for value in held:
+            print(f"⚠️  {path}: duplicate id \"{value}\" is looked up by the page's scripts; left for manual review")
+        if new_content != content:
+            writer.write(path, content, new_content)
+            changed.append(path)
+    writer.finish()
+    return changed
+
+
+def render_sitemap(entries, base_url):
+    lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+             '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+    for path, entry in sorted(entries.items()):
+        if entry['indexable']:
+            lines.append(f'  <url><loc>{escape(base_url.rstrip("/") + entry["url"])}</loc></url>')
+    lines.append('</urlset>')
+    return '\n'.join(lines) + '\n'
+
+
+def render_anchors(entries):
+    pages = {path.replace(os.sep, '/'): {key: entry[key] for key in ('title', 'url', 'toc', 'duplicates')}
+             for path, entry in sorted(entries.items()) if entry['indexable']}
+    return json.dumps({'pages': pages}, indent=1, ensure_ascii=False) + '\n'
+
+
+def write_if_changed(path, content):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            if f.read() == content:
+                return False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    atomic_write(path, content)
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the anchor index and sitemap, and repair duplicate ids")
+    parser.add_argument('--fix-ids', action='store_true', help="Rename duplicate ids (later ones get a -N suffix)")
+    parser.add_argument('--toc', action='store_true',
+                        help=f"Write a table of contents into pages with {TOC_MIN_SECTIONS}+ sections")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL, help=f"Site URL for the sitemap "
+                                                                    f"(default: {DEFAULT_BASE_URL})")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    paths = deployed_pages()
+    state = load_state()
+    entries, scanned = update_index(paths, state)
+    print(f"⚓ {len(paths)} pages, {len(scanned)} scanned, {len(paths) - len(scanned)} unchanged")
+    print("=" * 50)
+
+    if args.fix_ids or args.toc:
+        options = batch_options(args)
+        changed = rewrite_pages(entries, args.fix_ids, args.toc, **options)
+        if changed and not options['dry_run']:
+            entries, rescanned = update_index(paths, state)
+            scanned += rescanned
+        print("=" * 50)
+
+    for path, entry in sorted(entries.items()):
+        if entry['duplicates'] and not args.fix_ids:
+            print(f"⚠️  {path}: duplicate ids {', '.join(entry['duplicates'])}")
+
+    if args.dry_run:
+        return
+    for path, content in ((ANCHORS_FILE, render_anchors(entries)),
+                          (SITEMAP_FILE, render_sitemap(entries, args.base_url))):
+        status = "📝 Wrote" if write_if_changed(path, content) else "✔️  Up to date:"
+        print(f"{status} {path}")
+    atomic_write(STATE_FILE, json.dumps({'version': INDEX_VERSION, 'pages': state}) + '\n')
+    anchors = sum(len(entry['toc']) for entry in entries.values() if entry['indexable'])
+    duplicates = sum(1 for entry in entries.values() if entry['duplicates'])
+    print(f"{anchors} anchors indexed, {duplicates} pages with duplicate ids")
+
+
+if __name__ == "__main__":
+    main()
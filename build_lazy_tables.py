@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Move the rows of long application pages' later tables into fragments.
+
+The first --inline sections (tables) of a page stay in the HTML. For every
+later table the <tbody> rows are moved, byte for byte, into a fragment page
+under assets/fragments/<page>/<section>.html, and the table body keeps
+only a placeholder row linking to it:
+
+    <tbody data-lazy-src="../../assets/fragments/discord/search-shortcuts.html" data-lazy-rows="12">
+
+assets/js/lazy-tables.js (added to the page) fetches a fragment when its
+table nears the viewport, when the page's shortcut filter is used or when a
+link targets the section. Without JavaScript the placeholder link opens the
+fragment page, which is a plain table of the section's shortcuts.
+
+The transform is reversible: every build first puts any fragments back into
+the page, so rebuilding with a different --inline count or --min-rows
+reshapes the page, and --restore leaves the page exactly as it was before
+the first build. Fragment rows are read back by shortcut_tables.py, so the
+other generators still see every shortcut. Pages and fragments are only
+rewritten when their content changes.
+
+Usage:
+    python build_lazy_tables.py [--inline N] [--min-rows N] [--dry-run] [paths...]
+    python build_lazy_tables.py --restore [--dry-run] [paths...]
+"""
+
+import argparse
+import bisect
+import html
+import os
+import posixpath
+import re
+from urllib.parse import quote
+
+from page_batch import PageWriter, add_batch_arguments, batch_options
+from page_cache import parse_bytes
+from shortcut_tables import application_name, fragment_path, row_shortcut, slugify, table_sections
+from template_drift import application_pages
+
+FRAGMENT_DIR = 'assets/fragments'
+LOADER_SCRIPT = 'assets/js/lazy-tables.js'
+
+DEFAULT_INLINE_SECTIONS = 3
+# Pages with fewer shortcut rows than this are left whole
+DEFAULT_MIN_ROWS = 85
+
+FRAGMENT_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <meta name="robots" content="noindex">
+    <title>{title}</title>
+</head>
+<body>
+    <h1>{title}</h1>
+    <p><a href="{back}">All {application} shortcuts</a></p>
+    <table>{thead}
+        <tbody>{rows}</tbody>
+    </table>
+</body>
+</html>
+'''
+
+_lazy_body_pattern = re.compile(
+    r'<tbody data-lazy-src="([^"]*)" data-lazy-rows="\d+"([^>]*)>.*?</tbody>', re.DOTALL)
+_fragment_rows_pattern = re.compile(r'<tbody>(.*)</tbody>', re.DOTALL)
+_thead_pattern = re.compile(rb'<thead\b.*?</thead>', re.DOTALL | re.IGNORECASE)
+_header_cell_pattern = re.compile(rb'<th\b', re.IGNORECASE)
+_loader_pattern = re.compile(r'[ \t]*<script src="([^"]*lazy-tables\.js)" defer></script>\n')
+
+
+def _url(from_dir, path):
+    return quote(posixpath.relpath(path, from_dir or '.'))
+
+
+def read_fragment_rows(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        match = _fragment_rows_pattern.search(f.read())
+    if not match:
+        raise ValueError(f"{path}: no table body")
+    return match.group(1)
+
+
+def restore_content(path, content, keep_loader=False):
+    """Return the page with every lazy table body put back and the loader removed
+
+    With keep_loader the loader tag stays where it is, for lazy_content()
+    to reuse, so a rebuild does not move it.
+    """
+    def inline(match):
+        rows = read_fragment_rows(fragment_path(path, match.group(1)))
+        return f'<tbody{match.group(2)}>{rows}</tbody>'
+    content = _lazy_body_pattern.sub(inline, content)
+    return content if keep_loader else _loader_pattern.sub('', content)
+
+
+def lazy_content(path, content, inline_sections, min_rows):
+    """Return (page content, {fragment path: content}) for one restored page"""
+    data = content.encode('utf-8')
+    page = parse_bytes(data, path)
+    table_starts, sections = table_sections(page)
+    row_counts = {}
+    for ordinal, start, end in page.iter_rows():
+        if row_shortcut(page.data, start, end):
+            row_counts[ordinal] = row_counts.get(ordinal, 0) + 1
+    if sum(row_counts.values()) < min_rows:
+        return content, {}
+
+    closes = [start for _, start, _ in page.iter_tags('tbody', closing=True)]
+    application = application_name(page)
+    page_dir = posixpath.dirname(path.replace(os.sep, '/'))
+    fragment_dir = posixpath.join(FRAGMENT_DIR, slugify(os.path.splitext(os.path.basename(path))[0]))
+    fragments = {}
+    edits = []
+    for index, start, end in page.iter_tags('tbody'):
+        ordinal = bisect.bisect_right(table_starts, start) - 1
+        close = next((c for c in closes if c > end), None)
+        if ordinal < inline_sections or close is None or not row_counts.get(ordinal):
+            continue
+        section, section_id = sections[ordinal]
+        name = slugify(section_id or page.tag_attrs(index).get('id', '') or f'section-{ordinal + 1}')
+        target = posixpath.join(fragment_dir, name + '.html')
+        number = 2
+        while target in fragments:
+            target = posixpath.join(fragment_dir, f'{name}-{number}.html')
+            number += 1
+
+        thead = _thead_pattern.search(data, table_starts[ordinal], start)
+        columns = len(_header_cell_pattern.findall(thead.group(0))) if thead else 2
+        rows = data[end:close].decode('utf-8')
+        back = _url(posixpath.dirname(target), path.replace(os.sep, '/'))
+        fragments[target] = FRAGMENT_TEMPLATE.format(
+            title=html.escape(f'{application} {section}'.strip() if section else application),
+            application=html.escape(application),
+            back=back + ('#' + section_id if section_id else ''),
+            thead=('\n        ' + thead.group(0).decode('utf-8')) if thead else '',
+            rows=rows,
+        )
+
+        source = _url(page_dir, target)
+        count = row_counts[ordinal]
+        indent = rows[:len(rows) - len(rows.lstrip())]
+        closing_indent = rows[len(rows.rstrip()):]
+        link = f'<a href="{source}">Show the {count} shortcuts in this section</a>'
+        cells = ['<td></td>', f'<td>{link}</td>'] + ['<td></td>'] * max(0, columns - 2)
+        placeholder = f'{indent}<tr class="lazy-placeholder">{"".join(cells)}</tr>{closing_indent}'
+        opening = f'<tbody data-lazy-src="{source}" data-lazy-rows="{count}"'
+        edits.append((start, start + len(b'<tbody'), opening.encode('utf-8')))
+        edits.append((end, close, placeholder.encode('utf-8')))
+
+    if not edits:
+        return _loader_pattern.sub('', content), {}
+    for start, end, replacement in reversed(edits):
+        data = data[:start] + replacement + data[end:]
+    content = data.decode('utf-8')
+    loader = _url(page_dir, LOADER_SCRIPT)
+    existing = _loader_pattern.search(content)
+    body_end = content.rfind('</body>')
+    if existing:
+        # Keep the tag where it is (later tools add scripts after it); only its src is fixed
+        content = content[:existing.start(1)] + loader + content[existing.end(1):]
+    elif body_end != -1:
+        line_start = content.rfind('\n', 0, body_end) + 1
+        content = (content[:line_start] + f'    <script src="{loader}" defer></script>\n'
+                   + content[line_start:])
+    return content, fragments
+
+
+def transform_page(path, content, inline_sections, min_rows, restore=False):
+    """Return (page content, {fragment path: content}) for one page, restored or rebuilt"""
+    restored = restore_content(path, content, keep_loader=not restore)
+    if restore:
+        return restored, {}
+    return lazy_content(path, restored, inline_sections, min_rows)
+
+
+def build_lazy_tables(paths=None, inline_sections=DEFAULT_INLINE_SECTIONS, min_rows=DEFAULT_MIN_ROWS,
+                      restore=False, dry_run=False, **io_options):
+    """Rebuild (or restore) the lazy tables of the given application pages"""
+    paths = paths or application_pages()
+    action = "Restoring" if restore else f"Building lazy tables ({inline_sections} sections inline) for"
+    print(f"{action} {len(paths)} pages...")
+    writer = PageWriter('build_lazy_tables', dry_run, **io_options)
+    writer.prefetch(paths)
+
+    results = {}
+    for path in paths:
+        try:
+            content = writer.read(path)
+            results[path] = (content,) + writer.apply(transform_page, path, content, inline_sections,
+                                                      min_rows, restore)
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            print(f"❌ Error processing {path}: {e}")
+
+    # Fragment files that the new pages no longer point at are removed
+    old_fragments = set()
+    for path, (content, new_content, fragments) in results.items():
+        old_fragments.update(fragment_path(path, m.group(1)) for m in _lazy_body_pattern.finditer(content))
+    new_fragments = {os.path.normpath(fragment): text
+                     for _, _, fragments in results.values() for fragment, text in fragments.items()}
+    stale = sorted(old_fragments - set(new_fragments))
+
+    changed_fragments = []
+    for fragment, text in sorted(new_fragments.items()):
+        try:
+            with open(fragment, 'r', encoding='utf-8') as f:
+                if f.read() == text:
+                    continue
+        except FileNotFoundError:
+            pass
+        changed_fragments.append(fragment)
+
+    changed_pages = [path for path, (content, new_content, _) in results.items() if new_content != content]
+    writer.snapshot(changed_pages + changed_fragments + stale)
+    print("=" * 50)
+
+    # Fragments go first, so a page never points at a fragment that is not there yet
+    for fragment in changed_fragments:
+        if not dry_run:
+            os.makedirs(os.path.dirname(fragment), exist_ok=True)
+        old = ''
+        if os.path.exists(fragment):
+            with open(fragment, 'r', encoding='utf-8') as f:
+                old = f.read()
+        writer.write(fragment, old, new_fragments[fragment])
+    failed = writer.io.flush() if changed_fragments else []
+    if failed:
+        for path, error in failed:
+            print(f"❌ Error writing {path}: {error}")
+        print("Pages left unchanged")
+        writer.finish()
+        return
+
+    for path in changed_pages:
+        content, new_content, fragments = results[path]
+        writer.write(path, content, new_content)
+        if restore:
+            print(f"↩️  Restored {path}")
+        else:
+            print(f"📦 {path}: {len(fragments)} sections moved to fragments")
+    for path, (content, new_content, fragments) in results.items():
+        if path not in changed_pages:
+            print(f"✔️  Up to date: {path}")
+
+    failed = writer.finish()
+    if not dry_run and not failed:
+        for fragment in stale:
+            os.unlink(fragment)
+            print(f"🗑️  Removed {fragment}")
+            if not os.listdir(os.path.dirname(fragment)):
+                os.rmdir(os.path.dirname(fragment))
+    print("=" * 50)
+    print(f"{len(changed_pages)} pages and {len(changed_fragments)} fragments updated, "
+          f"{len(stale)} fragments removed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move later shortcut tables into lazily loaded fragments")
+    parser.add_argument('paths', nargs='*', help="Application pages (default: all)")
+    parser.add_argument('--inline', type=int, default=DEFAULT_INLINE_SECTIONS,
+                        help=f"Sections kept in the page (default: {DEFAULT_INLINE_SECTIONS})")
+    parser.add_argument('--min-rows', type=int, default=DEFAULT_MIN_ROWS,
+                        help=f"Leave pages with fewer shortcut rows whole (default: {DEFAULT_MIN_ROWS})")
+    parser.add_argument('--restore', action='store_true', help="Put every fragment back into its page")
+    add_batch_arguments(parser, stream=False)
+    args = parser.parse_args()
+
+    build_lazy_tables(args.paths, args.inline, args.min_rows, args.restore, **batch_options(args))
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Compile the quiz question bank from the shortcut tables.
+
+Every shortcut in the application pages (see shortcut_tables.py) becomes
+one multiple-choice question, either "Which shortcut ...?" (pick the key
+combination) or "What does <keys> do?" (pick the description). Distractor
+combinations come from the same application and category first, then from
+other applications' shortcuts with similar keys (the same modifiers or the
+same final key), then from the rest of the application. Distractor
+descriptions come from the same category, then the same application. The
+question type, distractors and option order are seeded by the shortcut id,
+so a rebuild without page changes produces the same bank.
+
+The bank is assets/data/quiz-bank.bin, little-endian:
+
+    header      magic "SSQB", version (u16), app count (u16),
+                question count (u32), index offset (u32)       16 bytes
+    app table   per app: first question (u32), question count (u32),
+                name (UTF-8, NUL padded)                        APP_ENTRY_SIZE each
+    index       per question: offset (u32), length (u32)        INDEX_ENTRY_SIZE each
+    records     one UTF-8 JSON object per question
+
+Questions are grouped by application, so question i is located with one
+fixed-width index read and fetched with a second range read of just its
+record. The quiz page reads the header and app table, then a handful of
+random questions, without downloading the whole bank.
+
+Each application's questions are compiled into .quiz_cache/<app>.json and
+only recompiled when that application's shortcuts change, or when the
+combinations its cross-application distractors are drawn from (those
+similar to its own "which shortcut" answers) change. The bank itself is
+only rewritten when its bytes change.
+
+Usage:
+    python build_quiz_bank.py [--force] [--stats]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import struct
+from urllib.parse import quote
+
+from page_snapshots import atomic_write
+from shortcut_tables import load_shortcuts, slugify
+
+BANK_FILE = 'assets/data/quiz-bank.bin'
+CACHE_DIR = '.quiz_cache'
+
+MAGIC = b'SSQB'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+APP_ENTRY = struct.Struct('<II56s')
+INDEX_ENTRY = struct.Struct('<II')
+APP_ENTRY_SIZE = APP_ENTRY.size
+INDEX_ENTRY_SIZE = INDEX_ENTRY.size
+
+OPTION_COUNT = 4
+
+# Bump when question generation changes, so every application is recompiled
+COMPILER_VERSION = 1
+
+
+def _seeded(*parts):
+    return hashlib.sha1(':'.join(str(p) for p in parts).encode('utf-8')).digest()
+
+
+def _keys(combination):
+    return combination.split(' + ')
+
+
+def _similar(a, b):
+    """Same modifier set or the same final key"""
+    keys_a, keys_b = _keys(a), _keys(b)
+    return keys_a[-1] == keys_b[-1] or (len(keys_a) > 1 and keys_a[:-1] == keys_b[:-1])
+
+
+def _pick(shortcut, pools, exclude, count):
+    """Take up to count distinct values from the pools in order, seeded per shortcut"""
+    picked = []
+    for pool in pools:
+        for value in sorted(set(pool) - exclude, key=lambda v: _seeded(shortcut['id'], v)):
+            if len(picked) == count:
+                return picked
+            if value not in picked:
+                picked.append(value)
+    return picked
+
+
+def _asks_combination(shortcut):
+    """Whether the shortcut's question asks for the combination (else the description)"""
+    return _seeded(shortcut['id'], 'type')[0] % 2
+
+
+def app_vocabulary(app_shortcuts, vocabulary):
+    """The combinations of vocabulary an application's questions can take distractors from"""
+    by_last = {}
+    by_modifiers = {}
+    for combination in vocabulary:
+        keys = _keys(combination)
+        by_last.setdefault(keys[-1], []).append(combination)
+        if len(keys) > 1:
+            by_modifiers.setdefault(tuple(keys[:-1]), []).append(combination)
+    used = set()
+    for shortcut in app_shortcuts:
+        if _asks_combination(shortcut):
+            keys = _keys(shortcut['combination'])
+            used.update(by_last.get(keys[-1], ()))
+            used.update(by_modifiers.get(tuple(keys[:-1]), ()))
+    return sorted(used)
+
+
+def make_question(shortcut, app_shortcuts, vocabulary):
+    """Return the question record for one shortcut, or None without enough distractors"""
+    application = shortcut['application']
+    same_category = [s for s in app_shortcuts if s['category'] == shortcut['category']]
+    if _asks_combination(shortcut):
+        question = f"In {application}, which shortcut does this: \"{shortcut['description'].rstrip('.')}\"?"
+        correct = shortcut['combination']
+        # Any description sharing this combination would make a second right answer
+        exclude = {correct} | {s['combination'] for s in app_shortcuts
+                               if s['description'] == shortcut['description']}
+        pools = (
+            [s['combination'] for s in same_category],
+            [combination for combination in vocabulary if _similar(combination, correct)],
+            [s['combination'] for s in app_shortcuts],
+        )
+    else:
+        question = f"What does {shortcut['combination']} do in {application}?"
+        correct = shortcut['description']
+        exclude = {correct} | {s['description'] for s in app_shortcuts
+                               if s['combination'] == shortcut['combination']}
+        pools = (
+            [s['description'] for s in same_category],
+            [s['description'] for s in app_shortcuts],
+        )
+    distractors = _pick(shortcut, pools, exclude, OPTION_COUNT - 1)
+    if len(distractors) < OPTION_COUNT - 1:
+        return None
+    options = sorted([correct] + distractors, key=lambda v: _seeded(shortcut['id'], 'order', v))
+
+    url = '/' + quote(shortcut['page'])
+    if shortcut['section_id']:
+        url += '#' + quote(shortcut['section_id'])
+    return {
+        'id': shortcut['id'],
+        'app': application,
+        'category': shortcut['category'],
+        'difficulty': shortcut['difficulty'],
+        'question': question,
+        'options': options,
+        'correct_answer': correct,
+        'url': url,
+    }
+
+
+def group_by_app(shortcuts):
+    apps = {}
+    for shortcut in shortcuts:
+        apps.setdefault(shortcut['application'], []).append(shortcut)
+    return dict(sorted(apps.items()))
+
+
+def compile_app(application, app_shortcuts, vocabulary, force=False):
+    """Return (questions, compiled) for one application, using the cache when current"""
+    # Keyed on the vocabulary entries this application draws from, not the whole
+    # vocabulary, so a new shortcut elsewhere only recompiles applications with similar keys
+    vocabulary = app_vocabulary(app_shortcuts, vocabulary)
+    key = hashlib.sha1(json.dumps([COMPILER_VERSION, vocabulary, app_shortcuts],
+                                  sort_keys=True).encode('utf-8')).hexdigest()
+    cache_path = os.path.join(CACHE_DIR, slugify(application) + '.json')
+    if not force:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cached['questions'], False
+        except (FileNotFoundError, ValueError):
+            pass
+    questions = [q for q in (make_question(s, app_shortcuts, vocabulary) for s in app_shortcuts) if q]
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    atomic_write(cache_path, json.dumps({'key': key, 'questions': questions}, ensure_ascii=False))
+    return questions, True
+
+
+def pack_bank(apps):
+    """Pack {application: [questions]} into the bank format"""
+    records = []
+    app_table = []
+    for application, questions in apps.items():
+        name = application.encode('utf-8')[:APP_ENTRY.size - 8]
+        app_table.append(APP_ENTRY.pack(len(records), len(questions), name))
+        records.extend(json.dumps(q, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+                       for q in questions)
+
+    index_offset = HEADER.size + APP_ENTRY_SIZE * len(app_table)
+    offset = index_offset + INDEX_ENTRY_SIZE * len(records)
+    index = []
+    for record in records:
+        index.append(INDEX_ENTRY.pack(offset, len(record)))
+        offset += len(record)
+    header = HEADER.pack(MAGIC, VERSION, len(app_table), len(records), index_offset)
+    return b''.join([header] + app_table + index + records)
+
+
+def read_question(data, number):
+    """Decode question number from a packed bank (what the client does with range reads)"""
+    magic, version, app_count, count, index_offset = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a version %d quiz bank" % VERSION)
+    offset, length = INDEX_ENTRY.unpack_from(data, index_offset + number * INDEX_ENTRY_SIZE)
+    return json.loads(data[offset:offset + length].decode('utf-8'))
+
+
+def build_bank(force=False):
+    """Compile changed applications and rewrite the bank if it changed; return a summary"""
+    shortcuts = load_shortcuts()
+    vocabulary = sorted({s['combination'] for s in shortcuts})
+
+    apps = {}
+    compiled = []
+    for application, app_shortcuts in group_by_app(shortcuts).items():
+        questions, recompiled = compile_app(application, app_shortcuts, vocabulary, force)
+        if questions:
+            apps[application] = questions
+        if recompiled:
+            compiled.append(application)
+
+    bank = pack_bank(apps)
+    try:
+        with open(BANK_FILE, 'rb') as f:
+            changed = f.read() != bank
+    except FileNotFoundError:
+        changed = True
+    if changed:
+        os.makedirs(os.path.dirname(BANK_FILE), exist_ok=True)
+        atomic_write(BANK_FILE, bank)
+    return {'shortcuts': len(shortcuts), 'apps': apps, 'compiled': compiled,
+            'changed': changed, 'size': len(bank)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the quiz question bank from the shortcut tables")
+    parser.add_argument('--force', action='store_true', help="Recompile every application")
+    parser.add_argument('--stats', action='store_true', help="Print question counts per application")
+    args = parser.parse_args()
+
+    summary = build_bank(args.force)
+    questions = sum(len(q) for q in summary['apps'].values())
+    print(f"❓ {questions} questions from {summary['shortcuts']} shortcuts in {len(summary['apps'])} applications")
+    print("=" * 50)
+    for application in summary['compiled']:
+        print(f"🔨 Compiled {application}")
+    if args.stats:
+        for application, app_questions in summary['apps'].items():
+            print(f"   {application}: {len(app_questions)}")
+    print("=" * 50)
+    status = "📝 Wrote" if summary['changed'] else "✔️  Up to date:"
+    print(f"{len(summary['compiled'])} applications compiled, "
+          f"{len(summary['apps']) - len(summary['compiled'])} cached")
+    print(f"{status} {BANK_FILE} ({summary['size']:,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed shortcut-of-the-day schedule.
+
+The candidate pool is every shortcut in the application pages (see
+shortcut_tables.py). For each year a deterministic schedule is computed
+with one shortcut per day. It is balanced across applications, categories
+and difficulties. A shortcut is not repeated within REPEAT_WINDOW days (so
+not within a year while the pool lasts), and an application does not come
+back within APP_GAP days. Small classes (there are few advanced shortcuts)
+run out first and the balance shifts to the rest rather than repeating.
+
+Each year is written to assets/data/shortcut-of-the-day-<year>.jsonl as
+fixed-width records: day N of the year (1-based) is the RECORD_SIZE bytes
+at offset (N - 1) * RECORD_SIZE, one ASCII JSON object padded with spaces.
+scripts/shortcut-of-the-day.js fetches just that record with an HTTP
+Range request, a few hundred bytes instead of the whole shortcut list.
+
+The schedule is a pure function of the year and the pool, so rebuilding
+without page changes writes nothing.
+
+Usage:
+    python build_shortcut_schedule.py [--year YEAR ...] [--stats]
+"""
+
+import argparse
+import calendar
+import datetime
+import hashlib
+import json
+import os
+from collections import deque
+from urllib.parse import quote
+
+from page_snapshots import atomic_write
+from shortcut_tables import load_shortcuts
+
+OUTPUT_DIR = 'assets/data'
+RECORD_SIZE = 512
+# Fields encode_record() shortens, in order, while they are longer than the floor
+SHORTENED_FIELDS = (('tip', 20), ('description', 1), ('tip', 1), ('combination', 1))
+
+REPEAT_WINDOW = 366
+APP_GAP = 3
+
+
+def output_path(year):
+    return os.path.join(OUTPUT_DIR, f'shortcut-of-the-day-{year}.jsonl')
+
+
+def _seeded(year, *parts):
+    """Deterministic per-year tie-break key"""
+    return hashlib.sha1(':'.join(str(p) for p in (year,) + parts).encode('utf-8')).digest()
+
+
+def build_schedule(shortcuts, year):
+    """Return one shortcut per day of the year"""
+    days = 366 if calendar.isleap(year) else 365
+    buckets = {}
+    for shortcut in sorted(shortcuts, key=lambda s: _seeded(year, s['id'])):
+        key = (shortcut['application'], shortcut['category'], shortcut['difficulty'])
+        buckets.setdefault(key, deque()).append(shortcut)
+
+    apps = {key[0] for key in buckets}
+    categories = {key[1] for key in buckets}
+    difficulties = {key[2] for key in buckets}
+    app_count = dict.fromkeys(apps, 0)
+    category_count = dict.fromkeys(categories, 0)
+    difficulty_count = dict.fromkeys(difficulties, 0)
+    last_used = {}
+    recent_apps = deque(maxlen=APP_GAP)
+
+    schedule = []
+    for day in range(days):
+        best_key, best_score = None, None
+        for relax in (False, True):
+            for key, queue in buckets.items():
+                app, category, difficulty = key
+                if not relax and app in recent_apps:
+                    continue
+                if day - last_used.get(queue[0]['id'], -REPEAT_WINDOW) < REPEAT_WINDOW and not relax:
+                    continue
+                # Usage counts scaled by the number of values, so each
+                # dimension is balanced towards an equal share
+                score = (app_count[app] * len(apps) + category_count[category] * len(categories)
+                         + difficulty_count[difficulty] * len(difficulties),
+                         _seeded(year, day, *key))
+                if best_score is None or score < best_score:
+                    best_key, best_score = key, score
+            if best_key is not None:
+                break
+
+        queue = buckets[best_key]
+        shortcut = queue.popleft()
+        queue.append(shortcut)
+        last_used[shortcut['id']] = day
+        recent_apps.append(best_key[0])
+        app_count[best_key[0]] += 1
+        category_count[best_key[1]] += 1
+        difficulty_count[best_key[2]] += 1
+        schedule.append(shortcut)
+    return schedule
+
+
+def day_record(shortcut, date):
+    """The JSON object the client renders, in the shape of its built-in list"""
+    url = '/' + quote(shortcut['page'])
+    if shortcut['section_id']:
+        url += '#' + quote(shortcut['section_id'])
+    tip = f"From {shortcut['section']} in the {shortcut['application']} shortcuts." \
+        if shortcut['section'] else f"From the {shortcut['application']} shortcuts."
+    return {
+        'date': date.isoformat(),
+        'id': shortcut['id'],
+        'combination': shortcut['combination'],
+        'description': shortcut['description'],
+        'application': shortcut['application'],
+        'category': shortcut['category'],
+        'difficulty': shortcut['difficulty'],
+        'tip': tip,
+        'url': url,
+        'relatedShortcuts': [],
+    }
+
+
+def encode_record(record):
+    """Encode a record as exactly RECORD_SIZE ASCII bytes, shortening long text
+
+    The tip goes first, then the description; the combination is only
+    shortened when those are down to the ellipsis. A record that still does
+    not fit raises ValueError.
+    """
+    while True:
+        encoded = json.dumps(record, separators=(',', ':')) + '\n'
+        if len(encoded) <= RECORD_SIZE:
+            return encoded[:-1].ljust(RECORD_SIZE - 1) + '\n'
+        field = next((field for field, floor in SHORTENED_FIELDS if len(record[field]) > floor), None)
+        if field is None:
+            raise ValueError(f"shortcut {record['id']} does not fit in {RECORD_SIZE} bytes")
+        overflow = len(encoded) - RECORD_SIZE
+        record[field] = record[field][:max(0, len(record[field]) - overflow - 1)].rstrip() + '…'
+
+
+def write_year(shortcuts, year):
+    """Write one year's schedule file; return (path, schedule, changed)"""
+    start = datetime.date(year, 1, 1)
+    schedule = build_schedule(shortcuts, year)
+    content = ''.join(encode_record(day_record(shortcut, start + datetime.timedelta(days=day)))
+                      for day, shortcut in enumerate(schedule))
+    path = output_path(year)
+    try:
+        with open(path, 'r', encoding='ascii') as f:
+            if f.read() == content:
+                return path, schedule, False
+    except FileNotFoundError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write(path, content, encoding='ascii')
+    return path, schedule, True
+
+
+def print_stats(schedule):
+    counts = {}
+    for shortcut in schedule:
+        for field in ('application', 'category', 'difficulty'):
+            counts.setdefault(field, {}).setdefault(shortcut[field], 0)
+            counts[field][shortcut[field]] += 1
+    for field, values in counts.items():
+        low, high = min(values.values()), max(values.values())
+        print(f"   {field}: {len(values)} values, {low}-{high} days each")
+    print(f"   distinct shortcuts: {len({s['id'] for s in schedule})}")
+
+
+def main():
+    this_year = datetime.date.today().year
+    parser = argparse.ArgumentParser(description="Build the shortcut-of-the-day schedule files")
+    parser.add_argument('--year', type=int, action='append',
+                        help=f"Year to build (repeatable; default: {this_year} and {this_year + 1})")
+    parser.add_argument('--stats', action='store_true', help="Print balance statistics per year")
+    args = parser.parse_args()
+
+    shortcuts = load_shortcuts()
+    print(f"⌨️  Candidate pool: {len(shortcuts)} shortcuts")
+    print("=" * 50)
+    for year in args.year or [this_year, this_year + 1]:
+        path, schedule, changed = write_year(shortcuts, year)
+        status = "📝 Wrote" if changed else "✔️  Up to date:"
+        print(f"{status} {path} ({len(schedule)} days, {os.path.getsize(path):,} bytes)")
+        if args.stats:
+            print_stats(schedule)
+
+
+if __name__ == "__main__":
+    main()
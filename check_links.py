@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Site-wide link and reference graph checker.
+
+Every page, stylesheet and script is read once (in parallel) and every
+href/src attribute, CSS url() and quoted site path in JavaScript is
+extracted. References are resolved against a path index built from a
+single walk of the tree, with resolutions cached per directory, so the
+same relative link on thirty sibling pages is resolved once.
+
+Reports broken links (with a suggested target when exactly one file has
+the link's file name), orphan pages that nothing links to, and assets no
+page, stylesheet or script mentions. --fix rewrites the broken links that
+have a suggestion, through the batch page writer, so --dry-run shows the
+diffs first.
+
+Usage:
+    python check_links.py [--json] [--workers N]
+    python check_links.py --fix [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import posixpath
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import unquote
+
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from page_corpus import EXCLUDED_DIRS, is_page, read_page
+
+# Files that count as assets when looking for unreferenced ones
+ASSET_EXTENSIONS = ('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico',
+                    '.woff', '.woff2', '.ttf', '.mp4', '.webm', '.pdf')
+SOURCE_EXTENSIONS = ('.css', '.js')
+
+# Directories that are not deployed (see firebase.json "ignore")
+UNDEPLOYED_DIRS = {'scripts', 'docs'}
+
+# Pages reachable without an inbound link
+ENTRY_PAGES = {'index.html', '404.html'}
+
+_ref_pattern = re.compile(r'(?<![\w:-])(href|src)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+_css_url_pattern = re.compile(r'url\(\s*(?:"([^"]*)"|\'([^\']*)\'|([^)\'"\s]+))\s*\)')
+# Only starts at a quote, so long unquoted runs (base64 data) are scanned once
+_js_path_pattern = re.compile(r'["\'`]([^"\'`\s<>()]+\.(?:html?|css|js|png|jpe?g|gif|webp|avif|svg|ico))["\'`]',
+                              re.IGNORECASE)
+
+_external_prefixes = ('mailto:', 'tel:', 'javascript:', 'data:', 'blob:', 'about:', '//')
+
+
+def is_local(value):
+    """Return True if a reference points at a file in this site"""
+    value = value.strip()
+    if not value or value.startswith('#') or '://' in value:
+        return False
+    if value.lower().startswith(_external_prefixes):
+        return False
+    # Template placeholders and string concatenation in inline scripts
+    return not any(marker in value for marker in ('${', '{{', '{%', '+', '\\'))
+
+
+def extract_references(path):
+    """Return (refs, mentions) for one source file
+
+    refs are (line, kind, value, start, end) for references that resolve
+    relative to the file; mentions are bare paths quoted in scripts, whose
+    base directory is only known at runtime.
+    """
+    content = read_page(path)
+    line_starts = None
+    refs = []
+
+    def line_of(offset):
+        nonlocal line_starts
+        if line_starts is None:
+            line_starts = [m.end() for m in re.finditer('\n', content)]
+        low, high = 0, len(line_starts)
+        while low < high:
+            mid = (low + high) // 2
+            if line_starts[mid] <= offset:
+                low = mid + 1
+            else:
+                high = mid
+        return low + 1
+
+    if is_page(path):
+        for match in _ref_pattern.finditer(content):
+            group = 2 if match.group(2) is not None else 3
+            if is_local(match.group(group)):
+                refs.append((line_of(match.start()), match.group(1).lower(), match.group(group),
+                             match.start(group), match.end(group)))
+    if is_page(path) or path.endswith('.css'):
+        for match in _css_url_pattern.finditer(content):
+            group = next(g for g in (1, 2, 3) if match.group(g) is not None)
+            if is_local(match.group(group)):
+                refs.append((line_of(match.start()), 'url', match.group(group),
+                             match.start(group), match.end(group)))
+    mentions = []
+    if is_page(path) or path.endswith('.js'):
+        mentions = sorted({m.group(1) for m in _js_path_pattern.finditer(content) if is_local(m.group(1))})
+    return refs, mentions
+
+
+class PathIndex:
+    """Every file and directory under root, with cached reference resolution"""
+
+    def __init__(self, root='.'):
+        self.root = root
+        self.files = set()
+        self.dirs = set()
+        self.by_name = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = sorted(d for d in dirnames
+                                 if d not in EXCLUDED_DIRS and not d.startswith('.'))
+            rel_dir = os.path.relpath(dirpath, root).replace(os.sep, '/')
+            rel_dir = '' if rel_dir == '.' else rel_dir
+            self.dirs.add(rel_dir)
+            for filename in filenames:
+                rel_path = posixpath.join(rel_dir, filename)
+                self.files.add(rel_path)
+                self.by_name.setdefault(filename, []).append(rel_path)
+        self._cache = {}
+
+    def resolve(self, source, value):
+        """Return (target, suggestion) for a reference from source
+
+        target is the indexed file the reference points at, or None when it
+        is broken; suggestion is then the relative path to the only file with
+        the same name, if there is exactly one.
+        """
+        base = posixpath.dirname(source)
+        key = (base, value)
+        if key not in self._cache:
+            self._cache[key] = self._resolve(base, value)
+        return self._cache[key]
+
+    def _resolve(self, base, value):
+        url = unquote(value.split('#', 1)[0].split('?', 1)[0]).strip()
+        if not url:
+            # A query or fragment on the page itself
+            return posixpath.join(base, ''), None
+        if url.startswith('/'):
+            path = posixpath.normpath(url.lstrip('/'))
+        else:
+            path = posixpath.normpath(posixpath.join(base, url))
+        path = '' if path == '.' else path
+        if not path.startswith('../'):
+            if path in self.files:
+                return path, None
+            if path in self.dirs and posixpath.join(path, 'index.html') in self.files:
+                return posixpath.join(path, 'index.html'), None
+        matches = self.by_name.get(posixpath.basename(url), [])
+        if len(matches) != 1:
+            return None, None
+        suggestion = posixpath.relpath(matches[0], base or '.')
+        return None, suggestion + value[len(value.split('#', 1)[0].split('?', 1)[0]):]
+
+    def find_mentioned(self, mention):
+        """Return indexed files a script path could refer to"""
+        tail = posixpath.normpath(mention.lstrip('/'))
+        while tail.startswith('../'):
+            tail = tail[3:]
+        tail = tail[2:] if tail.startswith('./') else tail
+        return [path for path in self.by_name.get(posixpath.basename(tail), [])
+                if path == tail or path.endswith('/' + tail)]
+
+
+def source_files(index):
+    """Return the pages, stylesheets and scripts that are scanned for references"""
+    return sorted(path for path in index.files
+                  if (is_page(path) or path.endswith(SOURCE_EXTENSIONS))
+                  and path.split('/', 1)[0] not in UNDEPLOYED_DIRS)
+
+
+def build_graph(index, workers=None):
+    """Extract and resolve every reference; return the link graph"""
+    sources = source_files(index)
+    if workers == 1 or len(sources) < 2:
+        extracted = [extract_references(os.path.join(index.root, s)) for s in sources]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            extracted = list(pool.map(extract_references,
+                                      [os.path.join(index.root, s) for s in sources], chunksize=8))
+
+    broken = []
+    referenced = set()
+    inbound = {}
+    reference_count = 0
+    for source, (refs, mentions) in zip(sources, extracted):
+        for line, kind, value, start, end in refs:
+            reference_count += 1
+            target, suggestion = index.resolve(source, value)
+            if target is None:
+                broken.append({'source': source, 'line': line, 'attr': kind, 'value': value,
+                               'suggestion': suggestion, 'span': (start, end)})
+                continue
+            referenced.add(target)
+            if target != source:
+                inbound.setdefault(target, set()).add(source)
+        for mention in mentions:
+            for target in index.find_mentioned(mention):
+                referenced.add(target)
+                if target != source:
+                    inbound.setdefault(target, set()).add(source)
+
+    pages = [s for s in sources if is_page(s)]
+    orphans = [page for page in pages
+               if page not in inbound and posixpath.basename(page) not in ENTRY_PAGES]
+    assets = sorted(path for path in index.files
+                    if path.lower().endswith(ASSET_EXTENSIONS)
+                    and path.split('/', 1)[0] not in UNDEPLOYED_DIRS)
+    unreferenced = [asset for asset in assets if asset not in referenced]
+    return {
+        'pages': len(pages),
+        'sources': len(sources),
+        'references': reference_count,
+        'assets': len(assets),
+        'broken': broken,
+        'orphans': orphans,
+        'unreferenced_assets': unreferenced,
+    }
+
+
+def fix_page_links(content, links):
+    """Return a Splice pointing a page's fixable links at their suggestions, or None"""
+    splice = Splice(content)
+    for link in links:
+        start, end = link['span']
+        if content[start:end] == link['value']:
+            splice.replace(start, end, link['suggestion'])
+    return splice or None
+
+
+def fix_links(graph, root='.', **batch):
+    """Rewrite broken links that have a unique suggested target; return the count"""
+    by_path = {}
+    for link in graph['broken']:
+        if link['suggestion'] is not None:
+            by_path.setdefault(os.path.join(root, link['source']), []).append(link)
+
+    writer = PageWriter('check_links', **batch)
+    fixed = 0
+    for path in writer.begin(by_path):
+        source = by_path[path][0]['source']
+        try:
+            content = writer.read(path)
+            new_content = writer.apply(fix_page_links, content, by_path[path])
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error processing {source}: {e}")
+            continue
+        if new_content:
+            writer.write(path, content, new_content)
+            print(f"🔧 Fixed {len(new_content.edits)} links: {source}")
+            fixed += len(new_content.edits)
+    writer.finish()
+    return fixed
+
+
+def print_report(graph, elapsed):
+    """Print a human readable link report"""
+    print(f"🔗 {graph['pages']} pages, {graph['sources']} sources, {graph['references']} references, "
+          f"{graph['assets']} assets ({elapsed * 1000:.0f} ms)")
+    print("=" * 50)
+    print(f"❌ Broken links: {len(graph['broken'])}")
+    for link in graph['broken']:
+        hint = f"  → {link['suggestion']}" if link['suggestion'] else ''
+        print(f"   {link['source']}:{link['line']}  {link['attr']}=\"{link['value']}\"{hint}")
+    print(f"\n🏝️  Orphan pages: {len(graph['orphans'])}")
+    for page in graph['orphans']:
+        print(f"   {page}")
+    print(f"\n📦 Unreferenced assets: {len(graph['unreferenced_assets'])}")
+    for asset in graph['unreferenced_assets']:
+        print(f"   {asset}")
+    fixable = sum(1 for link in graph['broken'] if link['suggestion'])
+    print("=" * 50)
+    print(f"{len(graph['broken'])} broken ({fixable} fixable with --fix), "
+          f"{len(graph['orphans'])} orphan pages, {len(graph['unreferenced_assets'])} unreferenced assets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check links and references across the site")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    parser.add_argument('--fix', action='store_true',
+                        help="Rewrite broken links whose file name matches exactly one file")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = PathIndex('.')
+    graph = build_graph(index, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.fix:
+        fix_links(graph, **batch_options(args))
+        return
+
+    if args.json:
+        for link in graph['broken']:
+            del link['span']
+        graph['elapsed_ms'] = round(elapsed * 1000, 1)
+        print(json.dumps(graph, indent=2))
+    else:
+        print_report(graph, elapsed)
+    sys.exit(1 if graph['broken'] else 0)
+
+
+if __name__ == "__main__":
+    main()
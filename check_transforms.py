@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Golden-file regression checks for the page transforms.
+
+Every registered transform is run over every fixture page in
+transform_goldens/inputs/ and its output is compared byte for byte with
+transform_goldens/expected/<transform>/<fixture>. The fixtures are trimmed
+copies of real pages/applications variants (old <header> markup, no :root
+marker, dark-mode search rules, the main-header layout). Cases run in
+parallel on a process pool.
+
+Usage:
+    python check_transforms.py                 # check every case
+    python check_transforms.py -k fix_logo     # only cases matching a substring
+    python check_transforms.py --update        # rewrite the golden outputs
+"""
+
+import argparse
+import difflib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from apply_complete_template import apply_template
+from fix_header_structure import fix_header
+from fix_logo_styling import fix_logo
+from fix_search_containers import replace_search_container_css
+from standardize_applications import standardize_content
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'transform_goldens')
+INPUT_DIR = os.path.join(GOLDEN_DIR, 'inputs')
+EXPECTED_DIR = os.path.join(GOLDEN_DIR, 'expected')
+
+# Transforms return the new page, or None when they leave the page alone
+TRANSFORMS = {
+    'fix_header': fix_header,
+    'fix_logo': fix_logo,
+    'search_container': replace_search_container_css,
+    'complete_template': apply_template,
+    'standardize': standardize_content,
+}
+
+MAX_DIFF_LINES = 40
+
+
+def run_transform(name, content):
+    """Apply a registered transform; unchanged pages come back as-is
+
+    Transforms return their edits as a page_batch.Splice, joined here.
+    """
+    result = TRANSFORMS[name](content)
+    return content if result is None else str(result)
+
+
+def run_case(name, fixture, update=False):
+    """Run one transform over one fixture; return (case, status, detail)"""
+    case = f'{name}/{fixture}'
+    with open(os.path.join(INPUT_DIR, fixture), 'rb') as f:
+        content = f.read().decode('utf-8')
+    try:
+        actual = run_transform(name, content).encode('utf-8')
+    except Exception as e:
+        return case, 'error', f'{type(e).__name__}: {e}'
+
+    expected_path = os.path.join(EXPECTED_DIR, name, fixture)
+    if update:
+        os.makedirs(os.path.dirname(expected_path), exist_ok=True)
+        with open(expected_path, 'wb') as f:
+            f.write(actual)
+        return case, 'updated', ''
+
+    try:
+        with open(expected_path, 'rb') as f:
+            expected = f.read()
+    except FileNotFoundError:
+        return case, 'missing', f'no golden output at {os.path.relpath(expected_path)}'
+    if actual == expected:
+        return case, 'ok', ''
+
+    diff = difflib.unified_diff(expected.decode('utf-8').splitlines(keepends=True),
+                                actual.decode('utf-8').splitlines(keepends=True),
+                                f'expected/{case}', f'actual/{case}')
+    lines = []
+    for line in diff:
+        if len(lines) == MAX_DIFF_LINES:
+            lines.append('... (diff truncated)\n')
+            break
+        lines.append(line)
+    return case, 'failed', ''.join(lines)
+
+
+def collect_cases(keyword=None):
+    fixtures = sorted(f for f in os.listdir(INPUT_DIR) if not f.startswith('.'))
+    cases = [(name, fixture) for name in TRANSFORMS for fixture in fixtures]
+    if keyword:
+        cases = [c for c in cases if keyword in f'{c[0]}/{c[1]}']
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check page transforms against golden outputs")
+    parser.add_argument('-k', dest='keyword', help="Only run cases whose name contains this")
+    parser.add_argument('--update', action='store_true', help="Rewrite golden outputs from the current transforms")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    cases = collect_cases(args.keyword)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        results = list(pool.map(run_case, [c[0] for c in cases], [c[1] for c in cases],
+                                [args.update] * len(cases)))
+    elapsed = time.perf_counter() - start
+
+    failures = 0
+    for case, status, detail in results:
+        if status in ('ok', 'updated'):
+            print(f"✅ {case}" if status == 'ok' else f"📝 {case} (golden updated)")
+            continue
+        failures += 1
+        print(f"❌ {case}: {status}")
+        if detail:
+            print(detail.rstrip('\n'))
+
+    print("=" * 50)
+    print(f"{len(results) - failures}/{len(results)} cases passed in {elapsed:.2f}s")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Content-hash manifest of the deployed files, and the delta to deploy.
+
+Every file Firebase Hosting would upload (the public directory of
+firebase.json without its ignore globs, see hosting_config.py) is listed
+with its size and SHA-256 in the manifest. Deploys run from a checkout, so
+only files git tracks count: caches, bytecode and other untracked files
+in a working tree are left out (--untracked lists everything on disk, for
+a deploy of local build outputs).
+
+The manifest of the last deploy is not kept in the repository. The merge
+workflow (.github/workflows/firebase-hosting-merge.yml) downloads it from
+the last successful deploy run as the deploy-manifest artifact, into
+.deploy-manifest.json (a dotfile, so it is never uploaded itself). It
+compares the build against it and lists only the added, changed and
+removed files, with the URLs a CDN purge needs. After a successful upload
+it records the build with --write and uploads the result as the next
+baseline. So a page batch that rewrites every page but changes three of
+them shows a three-file deploy.
+
+    python deploy_manifest.py                  show the delta against the last deploy's manifest
+    python deploy_manifest.py --json delta.json   also write it for upload/purge tooling
+    python deploy_manifest.py --write          record the tree as deployed (after a deploy)
+
+Hashes are cached in .deploy_hashes.json by size and mtime, so only files
+touched since the last run are read again.
+
+Usage:
+    python deploy_manifest.py [--against MANIFEST] [--json FILE] [--write] [--paths] [--untracked]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+from urllib.parse import quote
+
+from hosting_config import CONFIG_FILE, HostingConfig
+from page_snapshots import atomic_write
+
+MANIFEST_FILE = '.deploy-manifest.json'
+HASH_CACHE_FILE = '.deploy_hashes.json'
+MANIFEST_VERSION = 1
+HASH_CHUNK = 1048576
+
+
+def tracked_files(directory):
+    """Paths git tracks under a directory (relative to it), or None outside a repository"""
+    try:
+        result = subprocess.run(['git', '-C', directory, 'ls-files', '-z'],
+                                capture_output=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.decode('utf-8').split('\0')[:-1]
+
+
+def deploy_files(config, untracked=False):
+    """Sorted paths (relative to the public directory) of the files a deploy uploads
+
+    Only tracked files count unless untracked is set, or the public
+    directory is not in a git repository.
+    """
+    tracked = None if untracked else tracked_files(config.public)
+    if tracked is not None:
+        return sorted(path for path in tracked if not config.is_ignored(path)
+                      and os.path.isfile(os.path.join(config.public, path)))
+
+    files = []
+
+    def walk(directory, prefix):
+        with os.scandir(directory) as entries:
+            for entry in sorted(entries, key=lambda e: e.name):
+                relpath = prefix + entry.name
+                if config.is_ignored(relpath):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    walk(entry.path, relpath + '/')
+                elif entry.is_file():
+                    files.append(relpath)
+
+    walk(config.public, '')
+    return files
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_json(path, default=None):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return default
+
+
+def build_manifest(config, cache, untracked=False):
+    """Return (manifest, files hashed) for the tree, reusing cached hashes of unchanged files"""
+    files = {}
+    hashed = 0
+    fresh_cache = {}
+    for relpath in deploy_files(config, untracked):
+        stat = os.stat(os.path.join(config.public, relpath))
+        cached = cache.get(relpath)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            digest = cached[2]
+        else:
+            digest = file_hash(os.path.join(config.public, relpath))
+            hashed += 1
+        fresh_cache[relpath] = [stat.st_size, stat.st_mtime_ns, digest]
+        files[relpath] = {'sha256': digest, 'size': stat.st_size}
+    cache.clear()
+    cache.update(fresh_cache)
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'files': files,
+        'count': len(files),
+        'size': sum(entry['size'] for entry in files.values()),
+    }
+    return manifest, hashed
+
+
+def purge_urls(relpath):
+    """The URLs a CDN serves a file under"""
+    url = '/' + quote(relpath)
+    urls = [url]
+    if relpath == 'index.html' or relpath.endswith('/index.html'):
+        urls.append(url[:-len('index.html')])
+    return urls
+
+
+def diff_manifests(old, new):
+    """Return the delta between two manifests"""
+    old_files = old.get('files', {}) if old else {}
+    new_files = new['files']
+    added = sorted(set(new_files) - set(old_files))
+    removed = sorted(set(old_files) - set(new_files))
+    changed = sorted(path for path in set(new_files) & set(old_files)
+                     if new_files[path]['sha256'] != old_files[path]['sha256'])
+    return {
+        'added': added,
+        'changed': changed,
+        'removed': removed,
+        'upload_bytes': sum(new_files[path]['size'] for path in added + changed),
+        'purge': [url for path in changed + removed for url in purge_urls(path)],
+    }
+
+
+def render_manifest(manifest):
+    return json.dumps(manifest, indent=1, sort_keys=True) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List the files a deploy has to upload, by content hash")
+    parser.add_argument('--config', default=CONFIG_FILE, help=f"Hosting config (default: {CONFIG_FILE})")
+    parser.add_argument('--against', default=MANIFEST_FILE,
+                        help=f"Manifest of what is deployed (default: {MANIFEST_FILE})")
+    parser.add_argument('--json', help="Write the delta (added, changed, removed, purge URLs) to this file")
+    parser.add_argument('--write', action='store_true',
+                        help=f"Record the tree as deployed in {MANIFEST_FILE} (after a successful deploy)")
+    parser.add_argument('--paths', action='store_true', help="Print only the paths to upload, one per line")
+    parser.add_argument('--untracked', action='store_true',
+                        help="Include files git does not track (local build outputs)")
+    args = parser.parse_args()
+
+    config = HostingConfig.load(args.config)
+    cache = load_json(HASH_CACHE_FILE, {})
+    manifest, hashed = build_manifest(config, cache, args.untracked)
+    atomic_write(HASH_CACHE_FILE, json.dumps(cache) + '\n')
+    deployed = load_json(args.against)
+    delta = diff_manifests(deployed, manifest)
+
+    if args.paths:
+        for path in delta['added'] + delta['changed']:
+            print(path)
+        return
+
+    print(f"📦 {manifest['count']} files, {manifest['size']:,} bytes ({hashed} hashed, "
+          f"{manifest['count'] - hashed} unchanged since the last run)")
+    if deployed is None:
+        print(f"⚠️  No deployed manifest at {args.against}: every file counts as added")
+    print("=" * 50)
+    for label, marker in (('added', '➕'), ('changed', '✏️ '), ('removed', '➖')):
+        for path in delta[label]:
+            print(f"{marker} {path}")
+    print("=" * 50)
+    share = delta['upload_bytes'] / manifest['size'] if manifest['size'] else 0
+    print(f"{len(delta['added'])} added, {len(delta['changed'])} changed, {len(delta['removed'])} removed: "
+          f"{delta['upload_bytes']:,} bytes to upload ({share:.1%} of the site), "
+          f"{len(delta['purge'])} URLs to purge")
+
+    if args.json:
+        atomic_write(args.json, json.dumps(delta, indent=1) + '\n')
+        print(f"📝 Wrote {args.json}")
+    if args.write:
+        atomic_write(MANIFEST_FILE, render_manifest(manifest))
+        print(f"📝 Wrote {MANIFEST_FILE}")
+
+
+if __name__ == "__main__":
+    main()
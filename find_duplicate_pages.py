@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Find near-duplicate pages across the site using MinHash/LSH.
+
+Each page is shingled twice: word 5-grams of its visible text and 4-grams of
+its tag/class sequence. The shingle set is reduced to a MinHash signature
+(one-permutation hashing with densification, so each shingle is hashed once)
+and the signatures are banded into LSH buckets. Only pages that share a bucket
+are compared, so candidate clusters are found without an all-pairs scan.
+
+Usage:
+    python find_duplicate_pages.py [--threshold 0.8] [--exact] [--json] [paths...]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from collections import defaultdict
+
+from page_corpus import find_pages, read_page
+
+TEXT_SHINGLE_SIZE = 5
+STRUCTURE_SHINGLE_SIZE = 4
+DEFAULT_BANDS = 32
+DEFAULT_ROWS = 4
+DEFAULT_THRESHOLD = 0.8
+
+_MAX_HASH = (1 << 64) - 1
+
+_raw_text_pattern = re.compile(r'<(script|style)\b.*?</\1\s*>|<!--.*?-->', re.DOTALL | re.IGNORECASE)
+_tag_pattern = re.compile(r'<([a-zA-Z][\w-]*)([^>]*)>')
+_class_pattern = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+_word_pattern = re.compile(r'\w+')
+
+
+def _hash64(value):
+    """Stable 64-bit hash of a shingle (independent of PYTHONHASHSEED)"""
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def shingle_page(content):
+    """Return the set of hashed text and structure shingles for a page"""
+    shingles = set()
+
+    # Structure shingles: sequence of opening tags with their classes
+    tags = []
+    for match in _tag_pattern.finditer(content):
+        classes = _class_pattern.search(match.group(2))
+        tag = match.group(1).lower()
+        if classes:
+            tag += '.' + '.'.join(sorted(classes.group(1).split()))
+        tags.append(tag)
+    for i in range(max(len(tags) - STRUCTURE_SHINGLE_SIZE + 1, 0)):
+        shingles.add(_hash64('s:' + ' '.join(tags[i:i + STRUCTURE_SHINGLE_SIZE])))
+
+    # Text shingles: word n-grams of the visible text
+    text = _tag_pattern.sub(' ', _raw_text_pattern.sub(' ', content))
+    words = _word_pattern.findall(text.lower())
+    for i in range(max(len(words) - TEXT_SHINGLE_SIZE + 1, 0)):
+        shingles.add(_hash64('t:' + ' '.join(words[i:i + TEXT_SHINGLE_SIZE])))
+
+    return shingles
+
+
+def minhash_signature(shingles, num_hashes):
+    """Compute a densified one-permutation MinHash signature"""
+    signature = [None] * num_hashes
+    for h in shingles:
+        bucket = h % num_hashes
+        value = h // num_hashes
+        if signature[bucket] is None or value < signature[bucket]:
+            signature[bucket] = value
+
+    filled = [i for i, value in enumerate(signature) if value is not None]
+    if not filled:
+        return None
+
+    # Fill empty bins from the next non-empty bin to the right (rotation),
+    # offset by the distance so borrowed values stay distinguishable
+    offset = _MAX_HASH // num_hashes + 1
+    for i in range(num_hashes):
+        if signature[i] is None:
+            distance = 1
+            while signature[(i + distance) % num_hashes] is None:
+                distance += 1
+            signature[i] = signature[(i + distance) % num_hashes] + distance * offset
+    return signature
+
+
+def estimate_similarity(sig_a, sig_b):
+    """Estimate Jaccard similarity from two signatures"""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def jaccard(set_a, set_b):
+    """Exact Jaccard similarity of two shingle sets"""
+    if not set_a and not set_b:
+        return 1.0
+    return len(set_a & set_b) / len(set_a | set_b)
+
+
+def lsh_candidate_pairs(signatures, bands, rows):
+    """Return the set of page pairs that share at least one LSH bucket"""
+    buckets = defaultdict(list)
+    for path, signature in signatures.items():
+        for band in range(bands):
+            key = (band, tuple(signature[band * rows:(band + 1) * rows]))
+            buckets[key].append(path)
+
+    pairs = set()
+    for members in buckets.values():
+        for i in range(len(members)):
+            for j in range(i + 1, len(members)):
+                pairs.add(tuple(sorted((members[i], members[j]))))
+    return pairs
+
+
+def _cluster(pairs):
+    """Group scored pairs into connected clusters"""
+    parent = {}
+
+    def find(x):
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in pairs:
+        parent[find(a)] = find(b)
+
+    groups = defaultdict(list)
+    for node in parent:
+        groups[find(node)].append(node)
+    return [sorted(members) for members in groups.values()]
+
+
+def find_duplicates(paths, threshold=DEFAULT_THRESHOLD, bands=DEFAULT_BANDS,
+                    rows=DEFAULT_ROWS, exact=False):
+    """Find near-duplicate clusters among the given pages"""
+    num_hashes = bands * rows
+    shingle_sets = {}
+    signatures = {}
+    empty_pages = []
+
+    for path in paths:
+        content = read_page(path)
+        if not content.strip():
+            empty_pages.append(path)
+            continue
+        shingles = shingle_page(content)
+        signature = minhash_signature(shingles, num_hashes)
+        if signature is None:
+            empty_pages.append(path)
+            continue
+        signatures[path] = signature
+        if exact:
+            shingle_sets[path] = shingles
+
+    scored = {}
+    candidates = lsh_candidate_pairs(signatures, bands, rows)
+    for a, b in candidates:
+        if exact:
+            score = jaccard(shingle_sets[a], shingle_sets[b])
+        else:
+            score = estimate_similarity(signatures[a], signatures[b])
+        if score >= threshold:
+            scored[(a, b)] = score
+
+    clusters = []
+    for members in _cluster(scored):
+        member_set = set(members)
+        pairs = [{'a': a, 'b': b, 'similarity': round(score, 3)}
+                 for (a, b), score in sorted(scored.items())
+                 if a in member_set]
+        sizes = {m: os.path.getsize(m) for m in members}
+        clusters.append({
+            'pages': members,
+            'pairs': pairs,
+            'max_similarity': max(p['similarity'] for p in pairs),
+            # Keeping the largest copy, everything else could leave the build
+            'reclaimable_bytes': sum(sizes.values()) - max(sizes.values()),
+        })
+    clusters.sort(key=lambda c: (-c['max_similarity'], c['pages']))
+
+    return {
+        'pages_scanned': len(paths),
+        'candidate_pairs': len(candidates),
+        'threshold': threshold,
+        'clusters': clusters,
+        'empty_pages': sorted(empty_pages),
+    }
+
+
+def print_report(report):
+    """Print a human readable duplicate report"""
+    print(f"Scanned {report['pages_scanned']} pages, "
+          f"{report['candidate_pairs']} LSH candidate pairs")
+    print("=" * 50)
+
+    for cluster in report['clusters']:
+        print(f"\n🔁 Cluster of {len(cluster['pages'])} pages "
+              f"({cluster['reclaimable_bytes']:,} bytes reclaimable)")
+        for pair in cluster['pairs']:
+            print(f"   {pair['similarity']:.3f}  {pair['a']}  ↔  {pair['b']}")
+
+    if report['empty_pages']:
+        print("\n⚠️  Empty pages:")
+        for path in report['empty_pages']:
+            print(f"   {path}")
+
+    reclaimable = sum(c['reclaimable_bytes'] for c in report['clusters'])
+    print("=" * 50)
+    print(f"Found {len(report['clusters'])} duplicate clusters, "
+          f"{len(report['empty_pages'])} empty pages, "
+          f"{reclaimable:,} bytes reclaimable")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate pages with MinHash/LSH")
+    parser.add_argument('paths', nargs='*', help="Pages to scan (default: every page in the site)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Minimum similarity to report (default: %(default)s)")
+    parser.add_argument('--bands', type=int, default=DEFAULT_BANDS, help="LSH bands (default: %(default)s)")
+    parser.add_argument('--rows', type=int, default=DEFAULT_ROWS, help="Rows per LSH band (default: %(default)s)")
+    parser.add_argument('--exact', action='store_true',
+                        help="Score candidate pairs with exact Jaccard instead of the MinHash estimate")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    paths = args.paths or find_pages()
+    report = find_duplicates(paths, args.threshold, args.bands, args.rows, args.exact)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
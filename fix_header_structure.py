@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import re
 
-def fix_header_structure():
-    """Fix header structure in application HTML files"""
-    
-    # Define the correct header structure from Discord template
-    correct_header = '''<header class="main-header">
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from template_drift import drifted_pages
+
+# Define the correct header structure from Discord template
+CORRECT_HEADER = '''<header class="main-header">
     <div class="container">
         <div class="header-left">
             <div class="logo">
@@ -57,33 +58,34 @@ def fix_header_structure():
     </div>
 </header>'''
 
-    # Files to fix (ones with incorrect header structure)
-    files_to_fix = [
-        '7-zip.html',
-        'Acrobat Adobe Reader.html',
-        'Audacity.html', 
-        'Google Chrome.html',
-        'Microsoft Edge.html',
-        'Microsoft OneDrive.html',
-        'Microsoft OneNote.html',
-        'Microsoft Teams.html',
-        'Mozilla Thunderbird.html',
-        'Skype.html',
-        'Spotify.html',
-        'Telegram.html',
-        'Whatsapp.html',
-        'WinRAR.html',
-        'Zoom.html'
-    ]
+# Pattern to match the old header structure
+# This matches from <header> to </header> with any content in between
+OLD_HEADER_PATTERN = r'<header>.*?</header>'
+
+def fix_header(content):
+    """Return a Splice replacing the old header, or None if the page has none"""
+    splice = Splice(content)
+    if not splice.sub(OLD_HEADER_PATTERN, CORRECT_HEADER, re.DOTALL):
+        return None
+    return splice
+
+def fix_header_structure(dry_run=False, **io_options):
+    """Fix header structure in application HTML files"""
     
+    # Files to fix: every page whose header subtree drifted from the correct one,
+    # other than the template page (Discord.html) the correct header comes from
     applications_dir = 'pages/applications'
+    files_to_fix = drifted_pages('header', CORRECT_HEADER, applications_dir)
+    
     success_count = 0
     
     print(f"Fixing header structure in {len(files_to_fix)} files...")
+    writer = PageWriter('fix_header_structure', dry_run, **io_options)
+    paths = writer.begin(os.path.join(applications_dir, f) for f in files_to_fix)
     print("=" * 50)
     
-    for filename in files_to_fix:
-        file_path = os.path.join(applications_dir, filename)
+    for file_path in paths:
+        filename = os.path.basename(file_path)
         
         if not os.path.exists(file_path):
             print(f"❌ File not found: {filename}")
@@ -91,20 +93,13 @@ def fix_header_structure():
             
         try:
             # Read the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Pattern to match the old header structure
-            # This matches from <header> to </header> with any content in between
-            old_header_pattern = r'<header>.*?</header>'
+            content = writer.read(file_path)
             
             # Replace the old header with the correct one
-            if re.search(old_header_pattern, content, re.DOTALL):
-                new_content = re.sub(old_header_pattern, correct_header, content, flags=re.DOTALL)
-                
+            new_content = writer.apply(fix_header, content)
+            if new_content is not None:
                 # Write the updated content back
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(new_content)
+                writer.write(file_path, content, new_content)
                 
                 print(f"✅ Fixed header: {filename}")
                 success_count += 1
@@ -116,6 +111,7 @@ def fix_header_structure():
     
     print("=" * 50)
     print(f"Successfully fixed {success_count}/{len(files_to_fix)} files")
+    writer.finish()
     
     print("\n📋 Header structure now includes:")
     print("• Black header background with main-header class")
@@ -125,4 +121,7 @@ def fix_header_structure():
     print("• User menu with profile/settings options")
 
 if __name__ == "__main__":
-    fix_header_structure()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Replace drifted headers in the application pages")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+    fix_header_structure(**batch_options(args))
\ No newline at end of file
@@ -1,9 +1,34 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import re
 
-def fix_logo_styling():
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from selector_index import candidates
+
+# Patterns to remove old logo styling
+LOGO_ICON_CSS_PATTERN = r'\.logo-icon\s*{[^}]*}'
+LOGO_HOVER_PATTERN = r'\.logo\s+a:hover\s*{[^}]*}'
+
+# Pattern to match <a href="..."><i class="fas fa-keyboard logo-icon"></i> Shortcut Sensei</a>
+OLD_LOGO_HTML_PATTERN = r'<a href="([^"]*)">\s*<i class="fas fa-keyboard[^"]*"></i>\s*Shortcut Sensei\s*</a>'
+# Same link with different icon classes
+OLD_LOGO_HTML_PATTERN2 = r'<a href="([^"]*)">\s*<i class="[^"]*logo-icon[^"]*"></i>\s*Shortcut Sensei\s*</a>'
+NEW_LOGO_HTML = r'<a href="\1">Shortcut Sensei</a>'
+
+def fix_logo(content):
+    """Return a Splice removing the old logo-icon CSS and icon logo links"""
+    splice = Splice(content)
+    # Remove old logo-icon CSS
+    splice.sub(LOGO_ICON_CSS_PATTERN, '', re.DOTALL)
+    
+    # Ensure logo links don't have icons - fix any remaining old logo HTML
+    splice.sub(OLD_LOGO_HTML_PATTERN, NEW_LOGO_HTML)
+    splice.sub(OLD_LOGO_HTML_PATTERN2, NEW_LOGO_HTML)
+    return splice
+
+def fix_logo_styling(dry_run=False, **io_options):
     """Remove old cyan logo styling and ensure clean text logo"""
     
     files_to_fix = [
@@ -31,15 +56,21 @@ def fix_logo_styling():
     applications_dir = 'pages/applications'
     success_count = 0
     
+    # Skip pages the index shows have no logo icon markup or CSS left
+    with_logo_icon = {os.path.basename(f) for f in
+                      candidates('.logo-icon', '.fa-keyboard', directory=applications_dir)}
+    skipped = [f for f in files_to_fix if f not in with_logo_icon]
+    files_to_fix = [f for f in files_to_fix if f in with_logo_icon]
+    if skipped:
+        print(f"⏭️  Skipping {len(skipped)} files with no logo-icon markers")
+    
     print(f"Removing old logo styling from {len(files_to_fix)} files...")
+    writer = PageWriter('fix_logo_styling', dry_run, **io_options)
+    paths = writer.begin(os.path.join(applications_dir, f) for f in files_to_fix)
     print("=" * 50)
     
-    # Patterns to remove old logo styling
-    logo_icon_css_pattern = r'\.logo-icon\s*{[^}]*}'
-    logo_hover_pattern = r'\.logo\s+a:hover\s*{[^}]*}'
-    
-    for filename in files_to_fix:
-        file_path = os.path.join(applications_dir, filename)
+    for file_path in paths:
+        filename = os.path.basename(file_path)
         
         if not os.path.exists(file_path):
             print(f"❌ File not found: {filename}")
@@ -47,28 +78,13 @@ def fix_logo_styling():
             
         try:
             # Read the file
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            original_content = content
-            
-            # Remove old logo-icon CSS
-            content = re.sub(logo_icon_css_pattern, '', content, flags=re.DOTALL)
-            
-            # Ensure logo links don't have icons - fix any remaining old logo HTML
-            # Pattern to match <a href="..."><i class="fas fa-keyboard logo-icon"></i> Shortcut Sensei</a>
-            old_logo_html_pattern = r'<a href="([^"]*)">\s*<i class="fas fa-keyboard[^"]*"></i>\s*Shortcut Sensei\s*</a>'
-            new_logo_html = r'<a href="\1">Shortcut Sensei</a>'
-            content = re.sub(old_logo_html_pattern, new_logo_html, content)
+            content = writer.read(file_path)
             
-            # Also fix pattern with different icon classes
-            old_logo_html_pattern2 = r'<a href="([^"]*)">\s*<i class="[^"]*logo-icon[^"]*"></i>\s*Shortcut Sensei\s*</a>'
-            content = re.sub(old_logo_html_pattern2, new_logo_html, content)
+            new_content = writer.apply(fix_logo, content)
             
-            if content != original_content:
+            if new_content:
                 # Write the updated content back
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                writer.write(file_path, content, new_content)
                 
                 print(f"✅ Fixed logo styling: {filename}")
                 success_count += 1
@@ -80,6 +96,7 @@ def fix_logo_styling():
     
     print("=" * 50)
     print(f"Successfully fixed {success_count}/{len(files_to_fix)} files")
+    writer.finish()
     
     print("\n📋 Logo styling now ensures:")
     print("• Clean 'Shortcut Sensei' text logo (no icons)")
@@ -88,4 +105,7 @@ def fix_logo_styling():
     print("• No cyan keyboard icons")
 
 if __name__ == "__main__":
-    fix_logo_styling()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Remove old logo-icon styling from application pages")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+    fix_logo_styling(**batch_options(args))
\ No newline at end of file
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import re
-import glob
+
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from selector_index import candidates
 
 # Directory containing application HTML files
-app_dir = "/Users/rafi/Downloads/Fix Errors and Ensure Full Application Functionality/Shortcut_Sensei/pages/applications"
+app_dir = "pages/applications"
 
 # Files to skip (already updated)
 skip_files = ["Discord.html", "Adobe PhotoShop.html", "7-zip.html", "Microsoft Edge.html", "Microsoft Teams.html"]
@@ -79,88 +82,97 @@ new_search_css = """        .search-container {
             background-color: #7b1fa2;
         }"""
 
-def update_search_container(file_path):
-    """Update search container CSS in a file"""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Pattern to match search-container CSS block and related styles
-        pattern = r'(\s*\.search-container\s*\{[^}]*\}(?:\s*\.dark-mode\s+\.search-container\s*\{[^}]*\})?(?:\s*\.search-container[^{]*\{[^}]*\})*(?:\s*\.dark-mode[^{]*search-container[^{]*\{[^}]*\})*(?:\s*\.search-container[^{]*\{[^}]*\})*)'
-        
-        # More comprehensive pattern to catch the entire search-container block
-        search_pattern = r'(\.search-container\s*\{.*?)(?=\s*\.(?!search-container|dark-mode.*search-container)[a-zA-Z-]+\s*\{)'
+# Pattern to match search-container CSS block and related styles
+SEARCH_BLOCK_PATTERN = r'(\s*\.search-container\s*\{[^}]*\}(?:\s*\.dark-mode\s+\.search-container\s*\{[^}]*\})?(?:\s*\.search-container[^{]*\{[^}]*\})*(?:\s*\.dark-mode[^{]*search-container[^{]*\{[^}]*\})*(?:\s*\.search-container[^{]*\{[^}]*\})*)'
+
+# More comprehensive pattern to catch the entire search-container block
+SEARCH_PATTERN = r'(\.search-container\s*\{.*?)(?=\s*\.(?!search-container|dark-mode.*search-container)[a-zA-Z-]+\s*\{)'
+
+def replace_search_container_css(content):
+    """Return a Splice replacing the search-container CSS block, or None"""
+    if '.search-container' in content:
+        # Find the start of search-container CSS
+        start_idx = content.find('.search-container {')
+        if start_idx == -1:
+            start_idx = content.find('.search-container{')
         
-        if '.search-container' in content:
-            # Find the start of search-container CSS
-            start_idx = content.find('.search-container {')
-            if start_idx == -1:
-                start_idx = content.find('.search-container{')
+        if start_idx != -1:
+            # Find the end of the search-container block (before the next CSS rule)
+            # Count braces to find the complete block
+            brace_count = 0
+            in_search_block = False
+            end_idx = start_idx
             
-            if start_idx != -1:
-                # Find the end of the search-container block (before the next CSS rule)
-                remaining = content[start_idx:]
-                
-                # Count braces to find the complete block
-                brace_count = 0
-                in_search_block = False
-                end_idx = start_idx
-                
-                for i, char in enumerate(remaining):
-                    if char == '{':
-                        brace_count += 1
-                        in_search_block = True
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0 and in_search_block:
-                            # Check if next rule is still search-container related
-                            next_part = remaining[i+1:i+200]
-                            if not (('.search-container' in next_part and next_part.find('.search-container') < next_part.find('{')) or 
-                                   ('.dark-mode' in next_part and '.search-container' in next_part)):
-                                end_idx = start_idx + i + 1
-                                break
+            for i in range(start_idx, len(content)):
+                char = content[i]
+                if char == '{':
+                    brace_count += 1
+                    in_search_block = True
+                elif char == '}':
+                    brace_count -= 1
+                    if brace_count == 0 and in_search_block:
+                        # Check if next rule is still search-container related
+                        next_part = content[i+1:min(i+200, len(content))]
+                        if not (('.search-container' in next_part and next_part.find('.search-container') < next_part.find('{')) or 
+                               ('.dark-mode' in next_part and '.search-container' in next_part)):
+                            end_idx = i + 1
+                            break
+            
+            if end_idx > start_idx:
+                # Add proper indentation
+                indent = "        "  # 8 spaces
+                indented_css = "\n".join([indent + line if line.strip() else line for line in new_search_css.split('\n')])
                 
-                if end_idx > start_idx:
-                    # Replace the old CSS with new CSS
-                    before = content[:start_idx]
-                    after = content[end_idx:]
-                    
-                    # Add proper indentation
-                    indent = "        "  # 8 spaces
-                    indented_css = "\n".join([indent + line if line.strip() else line for line in new_search_css.split('\n')])
-                    
-                    new_content = before + indented_css + after
-                    
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        f.write(new_content)
-                    
-                    return True
+                # Replace the old CSS with new CSS
+                splice = Splice(content)
+                splice.replace(start_idx, end_idx, indented_css)
+                return splice
+    
+    return None
+
+def update_search_container(file_path, writer):
+    """Update search container CSS in a file"""
+    try:
+        content = writer.read(file_path)
+        
+        new_content = writer.apply(replace_search_container_css, content)
+        if new_content is not None:
+            writer.write(file_path, content, new_content)
+            return True
         
         return False
     except Exception as e:
         print(f"Error processing {file_path}: {e}")
         return False
 
-def main():
+def main(dry_run=False, **io_options):
     """Main function to update all application files"""
-    html_files = glob.glob(os.path.join(app_dir, "*.html"))
+    # Only open the pages the index says carry search-container rules
+    html_files = [f for f in candidates('css:.search-container', directory=app_dir) if f.endswith('.html')]
     
     updated_count = 0
     
+    writer = PageWriter('fix_search_containers', dry_run, **io_options)
     for file_path in html_files:
         filename = os.path.basename(file_path)
-        
         if filename in skip_files:
             print(f"Skipping {filename} (already updated)")
-            continue
+    to_update = (f for f in html_files if os.path.basename(f) not in skip_files)
+    
+    for file_path in writer.begin(to_update):
+        filename = os.path.basename(file_path)
             
-        if update_search_container(file_path):
+        if update_search_container(file_path, writer):
             print(f"Updated {filename}")
             updated_count += 1
         else:
             print(f"No search-container found in {filename} or failed to update")
     
     print(f"\nUpdated {updated_count} files total")
+    writer.finish()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Standardize search-container CSS in application pages")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+    main(**batch_options(args))
\ No newline at end of file
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Generate the paginated blog pages from a structured post list.
+
+pages/blogs/blogs-page-2.html ... blogs-page-N.html are rendered from one
+template (blog_source/blog-page.html) and the post list in
+blog_source/posts.json, POSTS_PER_PAGE posts to a page. blogs.html, the
+landing page, stays hand-maintained.
+
+Each page's inputs (template, its slice of posts, subtitle and the page
+count) are hashed, and .blog_build.json records the hash every page was
+last rendered from. Only pages whose inputs changed are rendered and
+written: editing a post rewrites the one page it is on, and appending a
+post rewrites the last page (or, when it starts a new page, every page,
+since each page's pagination links to the last one).
+
+Post fields are stored as HTML, exactly as they appear in the cards.
+
+Usage:
+    python generate_blog_pages.py [--force] [--dry-run]
+    python generate_blog_pages.py --extract    # rebuild posts.json from the current pages
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from string import Template
+
+from page_batch import PageWriter, add_batch_arguments, batch_options
+from page_snapshots import atomic_write
+
+BLOG_DIR = 'pages/blogs'
+SOURCE_DIR = 'blog_source'
+POSTS_FILE = os.path.join(SOURCE_DIR, 'posts.json')
+TEMPLATE_FILE = os.path.join(SOURCE_DIR, 'blog-page.html')
+STATE_FILE = '.blog_build.json'
+
+# Page 1 is the hand-maintained blogs.html landing page
+FIRST_PAGE = 2
+POSTS_PER_PAGE = 6
+DEFAULT_SUBTITLE = 'Explore more productivity tips and keyboard shortcut strategies'
+
+# Bump when the rendering code changes, so every page is rebuilt once
+RENDER_VERSION = 1
+
+CARD_TEMPLATE = '''            <!-- Blog card $number -->
+            <div class="blog-card" data-category="$category">
+                <img src="$image" alt="$alt" class="blog-image">
+                <div class="blog-content">
+                    <div class="blog-meta">
+                        <span class="blog-category">$label</span>
+                        <span>$date</span>
+                    </div>
+                    <h2 class="blog-title">$title</h2>
+                    <p class="blog-excerpt">$excerpt</p>
+                    <a href="$url" target="_blank" class="blog-read-more">Read More <i class="fas fa-arrow-right"></i></a>
+                </div>
+            </div>'''
+CARD_SEPARATOR = '\n            \n'
+
+CARD_PATTERN = re.compile(
+    r'<div class="blog-card" data-category="(?P<category>[^"]*)">\s*'
+    r'<img src="(?P<image>[^"]*)" alt="(?P<alt>[^"]*)" class="blog-image">\s*'
+    r'<div class="blog-content">\s*<div class="blog-meta">\s*'
+    r'<span class="blog-category">(?P<label>.*?)</span>\s*<span>(?P<date>.*?)</span>\s*</div>\s*'
+    r'<h2 class="blog-title">(?P<title>.*?)</h2>\s*'
+    r'<p class="blog-excerpt">(?P<excerpt>.*?)</p>\s*'
+    r'<a href="(?P<url>[^"]*)" target="_blank" class="blog-read-more">', re.DOTALL)
+SUBTITLE_PATTERN = re.compile(r'<p class="page-subtitle">(.*?)</p>', re.DOTALL)
+POST_FIELDS = ('title', 'date', 'category', 'label', 'excerpt', 'url', 'image', 'alt')
+
+
+def page_filename(number):
+    return 'blogs.html' if number == 1 else f'blogs-page-{number}.html'
+
+
+def render_filter_options(posts):
+    """One <option> per category on the page, in order of first appearance"""
+    options = {}
+    for post in posts:
+        options.setdefault(post['category'], post['label'])
+    return '\n'.join(f'                    <option value="{value}">{label}</option>'
+                     for value, label in options.items())
+
+
+def render_pagination(number, last):
+    """Prev/next arrows, pages 1, 2 and last, and the current page's neighbours"""
+    shown = sorted({1, 2, last, number - 1, number, number + 1} & set(range(1, last + 1)))
+    lines = []
+    if number > 1:
+        lines.append(f'<a href="{page_filename(number - 1)}" class="pagination-btn">'
+                     f'<i class="fas fa-chevron-left"></i></a>')
+    previous = 0
+    for page in shown:
+        if page - previous == 2:
+            shown_gap = previous + 1
+            lines.append(f'<a href="{page_filename(shown_gap)}" class="pagination-btn">{shown_gap}</a>')
+        elif page - previous > 2:
+            lines.append('<span class="pagination-btn">...</span>')
+        active = ' active' if page == number else ''
+        lines.append(f'<a href="{page_filename(page)}" class="pagination-btn{active}">{page}</a>')
+        previous = page
+    if number < last:
+        lines.append(f'<a href="{page_filename(number + 1)}" class="pagination-btn">'
+                     f'<i class="fas fa-chevron-right"></i></a>')
+    return '\n'.join('            ' + line for line in lines)
+
+
+def plan_pages(data):
+    """Split the post list into the pages to render"""
+    posts = data['posts']
+    subtitles = data.get('subtitles', [])
+    per_page = data.get('per_page', POSTS_PER_PAGE)
+    count = max(1, -(-len(posts) // per_page))
+    last = FIRST_PAGE + count - 1
+    pages = []
+    for offset in range(count):
+        pages.append({
+            'number': FIRST_PAGE + offset,
+            'last': last,
+            'subtitle': subtitles[offset] if offset < len(subtitles) else DEFAULT_SUBTITLE,
+            'posts': posts[offset * per_page:(offset + 1) * per_page],
+        })
+    return pages
+
+
+def render_page(template, page):
+    cards = CARD_SEPARATOR.join(Template(CARD_TEMPLATE).substitute(post, number=number)
+                                for number, post in enumerate(page['posts'], 1))
+    return Template(template).substitute(
+        number=page['number'],
+        subtitle=page['subtitle'],
+        filter_options=render_filter_options(page['posts']),
+        cards=cards,
+        pagination=render_pagination(page['number'], page['last']),
+    )
+
+
+def page_hash(template, page):
+    """Hash of everything a page is rendered from"""
+    payload = json.dumps([RENDER_VERSION, template, page], sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def load_state():
+    try:
+        with open(STATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def extract_posts(blog_dir=BLOG_DIR):
+    """Rebuild the post list from the rendered pages, in page order"""
+    data = {'per_page': POSTS_PER_PAGE, 'subtitles': [], 'posts': []}
+    number = FIRST_PAGE
+    while os.path.exists(os.path.join(blog_dir, page_filename(number))):
+        with open(os.path.join(blog_dir, page_filename(number)), 'r', encoding='utf-8') as f:
+            content = f.read()
+        subtitle = SUBTITLE_PATTERN.search(content)
+        data['subtitles'].append(subtitle.group(1) if subtitle else DEFAULT_SUBTITLE)
+        for match in CARD_PATTERN.finditer(content):
+            data['posts'].append({field: match.group(field) for field in POST_FIELDS})
+        number += 1
+    return data
+
+
+def generate_blog_pages(force=False, dry_run=False, **io_options):
+    """Render the blog pages whose inputs changed since the last run"""
+    with open(POSTS_FILE, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    with open(TEMPLATE_FILE, 'r', encoding='utf-8') as f:
+        template = f.read()
+
+    pages = plan_pages(data)
+    state = load_state()
+    hashes = {page_filename(page['number']): page_hash(template, page) for page in pages}
+    todo = [page for page in pages
+            if force or state.get(page_filename(page['number'])) != hashes[page_filename(page['number'])]
+            or not os.path.exists(os.path.join(BLOG_DIR, page_filename(page['number'])))]
+
+    print(f"Generating blog pages from {len(data['posts'])} posts ({len(pages)} pages)...")
+    writer = PageWriter('generate_blog_pages', dry_run, **io_options)
+    by_path = {os.path.join(BLOG_DIR, page_filename(page['number'])): page for page in todo}
+    print("=" * 50)
+
+    rendered = 0
+    for path in writer.begin(by_path):
+        page = by_path[path]
+        try:
+            old_content = writer.read(path) if os.path.exists(path) else ''
+            new_content = writer.apply(render_page, template, page)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error rendering {page_filename(page['number'])}: {e}")
+            # Not recorded as built, so the next run renders it again
+            hashes.pop(page_filename(page['number']))
+            continue
+        if new_content == old_content:
+            print(f"✔️  Up to date: {page_filename(page['number'])}")
+            continue
+        writer.write(path, old_content, new_content)
+        rendered += 1
+        print(f"📝 Rendered {page_filename(page['number'])} ({len(page['posts'])} posts)")
+
+    # Pages beyond the new last page are left for review rather than deleted
+    number = pages[-1]['number'] + 1
+    while os.path.exists(os.path.join(BLOG_DIR, page_filename(number))):
+        print(f"⚠️  Stale page past the last one: {page_filename(number)}")
+        number += 1
+
+    print("=" * 50)
+    print(f"{rendered} pages rendered, {len(pages) - rendered} unchanged")
+    failed = writer.finish()
+    if not dry_run and not failed:
+        atomic_write(STATE_FILE, json.dumps(hashes, indent=1, sort_keys=True) + '\n')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the paginated blog pages from blog_source/")
+    parser.add_argument('--force', action='store_true', help="Render every page, ignoring the build state")
+    parser.add_argument('--extract', action='store_true',
+                        help=f"Rebuild {POSTS_FILE} from the current pages and exit")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    if args.extract:
+        posts = extract_posts()
+        atomic_write(POSTS_FILE, json.dumps(posts, indent=2, ensure_ascii=False) + '\n')
+        print(f"📄 Extracted {len(posts['posts'])} posts from {len(posts['subtitles'])} pages into {POSTS_FILE}")
+    else:
+        generate_blog_pages(args.force, **batch_options(args))
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Read the Firebase Hosting settings in firebase.json.
+
+HostingConfig answers the questions Firebase Hosting asks about a path:
+is the file left out of the deploy (ignore), where does a request go when
+no file matches it (rewrites), is it redirected (redirects) and which
+extra response headers apply (headers). Globs are matched the way Hosting
+matches them: ** crosses directories, * and ? stay within one, and {a,b}
+and @(a|b) pick alternatives. Rules given as "regex" are used as they are.
+
+Usage:
+    python hosting_config.py [PATH...]    show how firebase.json treats paths
+"""
+
+import argparse
+import json
+import os
+import re
+
+CONFIG_FILE = 'firebase.json'
+
+# Hosting's Cache-Control when firebase.json sets none for a path
+DEFAULT_CACHE_CONTROL = 'max-age=3600'
+
+
+def _alternatives(pattern, start, close, separator):
+    """Split pattern[start:] up to the matching close character; return (parts, end)"""
+    depth = 0
+    parts = []
+    current = ''
+    i = start
+    while i < len(pattern):
+        char = pattern[i]
+        if char in '{(':
+            depth += 1
+        elif char in '})':
+            if depth == 0 and char == close:
+                return parts + [current], i + 1
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(current)
+            current = ''
+            i += 1
+            continue
+        current += char
+        i += 1
+    raise ValueError(f"unclosed {close!r} in glob {pattern!r}")
+
+
+def _glob_regex(pattern):
+    regex = ''
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith('**/', i):
+            regex += '(?:.*/)?'
+            i += 3
+        elif pattern.startswith('**', i):
+            regex += '.*'
+            i += 2
+        elif char == '*':
+            regex += '[^/]*'
+            i += 1
+        elif char == '?':
+            regex += '[^/]'
+            i += 1
+        elif char == '{':
+            parts, i = _alternatives(pattern, i + 1, '}', ',')
+            regex += '(?:' + '|'.join(_glob_regex(part) for part in parts) + ')'
+        elif pattern.startswith('@(', i):
+            parts, i = _alternatives(pattern, i + 2, ')', '|')
+            regex += '(?:' + '|'.join(_glob_regex(part) for part in parts) + ')'
+        elif char == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                regex += re.escape(char)
+                i += 1
+            else:
+                regex += '[' + pattern[i + 1:end].replace('!', '^', 1) + ']'
+                i = end + 1
+        else:
+            regex += re.escape(char)
+            i += 1
+    return regex
+
+
+def compile_glob(pattern):
+    """Compile a Hosting glob; the leading slash of a request path is optional"""
+    return re.compile(_glob_regex(pattern.lstrip('/')) + r'\Z')
+
+
+def _rule_pattern(rule):
+    if 'regex' in rule:
+        return re.compile(rule['regex'])
+    return compile_glob(rule['source'])
+
+
+def _match(pattern, path):
+    """Match a request path, with or without its leading slash"""
+    return pattern.fullmatch(path) or pattern.fullmatch(path.lstrip('/'))
+
+
+class HostingConfig:
+    """The "hosting" section of firebase.json"""
+
+    def __init__(self, hosting, base_dir='.'):
+        self.public = os.path.normpath(os.path.join(base_dir, hosting.get('public', '.')))
+        self.ignore = [compile_glob(pattern) for pattern in hosting.get('ignore', [])]
+        self.rewrites = [(_rule_pattern(rule), rule) for rule in hosting.get('rewrites', [])]
+        self.redirects = [(_rule_pattern(rule), rule) for rule in hosting.get('redirects', [])]
+        self.headers = [(_rule_pattern(rule), [(h['key'], h['value']) for h in rule.get('headers', [])])
+                        for rule in hosting.get('headers', [])]
+        self.clean_urls = hosting.get('cleanUrls', False)
+
+    @classmethod
+    def load(cls, path=CONFIG_FILE):
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        hosting = config.get('hosting', {})
+        if isinstance(hosting, list):
+            # Multi-site configs: the first site is the one served locally
+            hosting = hosting[0] if hosting else {}
+        return cls(hosting, os.path.dirname(os.path.abspath(path)))
+
+    def is_ignored(self, relpath):
+        """True if a file (path relative to the public directory) is left out of the deploy
+
+        As in the deploy's directory walk, a file under an ignored directory
+        is ignored too.
+        """
+        parts = relpath.replace(os.sep, '/').split('/')
+        prefixes = ['/'.join(parts[:i]) for i in range(1, len(parts) + 1)]
+        return any(pattern.match(prefix) for prefix in prefixes for pattern in self.ignore)
+
+    def rewrite(self, path):
+        """The first rewrite rule matching a request path, or None"""
+        return next((rule for pattern, rule in self.rewrites if _match(pattern, path)), None)
+
+    def redirect(self, path):
+        """Return (status, location) for a redirected request path, or None"""
+        for pattern, rule in self.redirects:
+            match = _match(pattern, path)
+            if match:
+                location = rule['destination']
+                for name, value in match.groupdict().items():
+                    location = location.replace(':' + name, value or '')
+                return rule.get('type', 301), location
+        return None
+
+    def headers_for(self, path):
+        """The extra response headers for a request path, in firebase.json order"""
+        headers = []
+        for pattern, rule_headers in self.headers:
+            if _match(pattern, path):
+                headers.extend(rule_headers)
+        if not any(key.lower() == 'cache-control' for key, _ in headers):
+            headers.append(('Cache-Control', DEFAULT_CACHE_CONTROL))
+        return headers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show how firebase.json treats request paths and files")
+    parser.add_argument('paths', nargs='*', help="Request paths or public files (default: the rules)")
+    parser.add_argument('--config', default=CONFIG_FILE, help=f"Hosting config (default: {CONFIG_FILE})")
+    args = parser.parse_args()
+
+    config = HostingConfig.load(args.config)
+    if not args.paths:
+        print(f"📂 Public directory: {config.public}")
+        print(f"{len(config.ignore)} ignore globs, {len(config.rewrites)} rewrites, "
+              f"{len(config.redirects)} redirects, {len(config.headers)} header rules")
+        return
+    for path in args.paths:
+        relpath = path.lstrip('/')
+        rewrite = config.rewrite(path)
+        redirect = config.redirect(path)
+        print(path)
+        print(f"   ignored:  {config.is_ignored(relpath)}")
+        print(f"   redirect: {redirect}")
+        print(f"   rewrite:  {rewrite}")
+        print(f"   headers:  {config.headers_for(path)}")
+
+
+if __name__ == "__main__":
+    main()
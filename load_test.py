@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""
+Load-test the built site with a replayed navigation mix.
+
+Each simulated visit walks the navigation steps in order (by default the
+home page, an application page, the search results for that application
+and the quiz page), the way a visitor would. A page view fetches the
+document, then its same-origin stylesheets, scripts and images, six at a
+time like a browser. The quiz view also reads a practice quiz out of the
+question bank with the same Range requests quiz-handler.js makes.
+
+Each of the --users simulated users keeps a browser cache across its
+visits, like a returning visitor (--cold-cache starts every visit empty).
+A resource still fresh under its Cache-Control max-age is not requested
+again, and a stale one is revalidated with If-None-Match. The cache hit
+ratio counts both against all resource loads; the share of conditional
+requests answered 304 shows whether revalidation works (ETags stable
+across builds). Requests go over a shared pool of --connections
+keep-alive connections.
+
+Reported per page type: TTFB of the document and full page-view time
+(min, p50, p90, p95, p99, max, mean) over the views that requested the
+document, the view time of views served from the browser cache
+separately, and requests and bytes on the wire per view. Also reported: throughput, the cache hit ratio and connection
+reuse. --json writes the report, and --compare BASE.json [NEW.json]
+compares two reports (or this run against BASE.json).
+
+Usage:
+    python load_test.py --serve [--users 50] [--sessions 500] [--json run.json]
+    python load_test.py --url http://127.0.0.1:8080 --duration 30
+    python load_test.py --compare before.json after.json
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import re
+import socket
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from urllib.parse import quote, unquote, urljoin, urlsplit
+
+from build_quiz_bank import APP_ENTRY, APP_ENTRY_SIZE, HEADER, INDEX_ENTRY, INDEX_ENTRY_SIZE, MAGIC
+from template_drift import application_pages
+
+try:
+    import brotli
+except ImportError:  # br is only advertised when it can be decoded
+    brotli = None
+
+DEFAULT_URL = 'http://127.0.0.1:8080'
+DEFAULT_STEPS = ('home', 'application', 'search', 'quiz')
+DEFAULT_USERS = 50
+DEFAULT_SESSIONS = 500
+DEFAULT_CONNECTIONS = 32
+ACCEPT_ENCODING = 'gzip, deflate, br' if brotli else 'gzip, deflate'
+
+# Parallel subresource requests per page view, as browsers allow per host
+SUBRESOURCE_PARALLELISM = 6
+
+HOME_URL = '/home-page.html'
+SEARCH_URL = '/search-results.html?q={query}'
+QUIZ_URL = '/pages/quizzes.html'
+QUIZ_BANK_URL = '/assets/data/quiz-bank.bin'
+# Mirrors quiz-handler.js: the first read, and the questions of a practice quiz
+QUIZ_BANK_HEAD = 4096
+PRACTICE_QUESTION_COUNT = 10
+
+# A compared metric changing by less than this is reported as unchanged
+COMPARE_THRESHOLD = 0.05
+
+_subresource_pattern = re.compile(
+    r'<link\b[^>]*\brel="stylesheet"[^>]*\bhref="([^"]+)"'
+    r'|<script\b[^>]*\bsrc="([^"]+)"'
+    r'|<img\b[^>]*\bsrc="([^"]+)"', re.IGNORECASE)
+_max_age_pattern = re.compile(r'max-age=(\d+)')
+
+
+class Response:
+    def __init__(self, status, headers, body, ttfb, elapsed, wire_bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.ttfb = ttfb
+        self.elapsed = elapsed
+        self.wire_bytes = wire_bytes
+
+    def content(self):
+        """The body with its Content-Encoding undone"""
+        coding = self.headers.get('content-encoding', '').lower()
+        if coding == 'gzip':
+            return gzip.decompress(self.body)
+        if coding == 'deflate':
+            return zlib.decompress(self.body)
+        if coding == 'br' and brotli:
+            return brotli.decompress(self.body)
+        return self.body
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection"""
+
+    def __init__(self, reader, writer, host):
+        self.reader = reader
+        self.writer = writer
+        self.host = host
+        self.requests = 0
+        self.open = True
+
+    async def request(self, method, target, headers):
+        lines = [f'{method} {target} HTTP/1.1', f'Host: {self.host}', f'Accept-Encoding: {ACCEPT_ENCODING}']
+        lines += [f'{key}: {value}' for key, value in headers.items()]
+        started = time.perf_counter()
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await self.writer.drain()
+
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed before the response")
+        ttfb = time.perf_counter() - started
+        wire_bytes = len(status_line)
+        status = int(status_line.split()[1])
+        response_headers = {}
+        while True:
+            line = await self.reader.readline()
+            wire_bytes += len(line)
+            if line in (b'\r\n', b'\n', b''):
+                break
+            key, _, value = line.decode('latin-1').partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+            body = b''
+        elif response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            body, chunk_bytes = await self._read_chunked()
+            wire_bytes += chunk_bytes
+        elif 'content-length' in response_headers:
+            body = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            body = await self.reader.read()
+            self.open = False
+        wire_bytes += len(body) if 'transfer-encoding' not in response_headers else 0
+        if response_headers.get('connection', '').lower() == 'close':
+            self.open = False
+        self.requests += 1
+        return Response(status, response_headers, body, ttfb, time.perf_counter() - started, wire_bytes)
+
+    async def _read_chunked(self):
+        chunks = []
+        wire_bytes = 0
+        while True:
+            size_line = await self.reader.readline()
+            wire_bytes += len(size_line)
+            size = int(size_line.split(b';')[0], 16)
+            data = await self.reader.readexactly(size + 2)
+            wire_bytes += len(data)
+            if size == 0:
+                # Trailers, if any, end with an empty line
+                while data not in (b'\r\n', b''):
+                    data = await self.reader.readline()
+                    wire_bytes += len(data)
+                return b''.join(chunks), wire_bytes
+            chunks.append(data[:-2])
+
+    def close(self):
+        self.open = False
+        self.writer.close()
+
+
+class ConnectionPool:
+    """At most size connections to one server, idle ones kept for reuse"""
+
+    def __init__(self, host, port, size):
+        self.host = host
+        self.port = port
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+        self.opened = 0
+        self.reused = 0
+
+    async def _connect(self):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        self.opened += 1
+        return Connection(reader, writer, f'{self.host}:{self.port}')
+
+    async def fetch(self, target, headers=None, method='GET'):
+        async with self.slots:
+            connection = self.idle.pop() if self.idle else await self._connect()
+            reused = connection.requests > 0
+            try:
+                response = await connection.request(method, target, headers or {})
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection.close()
+                if not reused:
+                    raise
+                # The server closed an idle connection; retry on a new one
+                connection = await self._connect()
+                reused = False
+                response = await connection.request(method, target, headers or {})
+            self.reused += reused
+            if connection.open:
+                self.idle.append(connection)
+            else:
+                connection.close()
+            return response
+
+    def close(self):
+        for connection in self.idle:
+            connection.close()
+        self.idle = []
+
+
+def percentiles(values):
+    """Summary of a list of seconds, in milliseconds"""
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def at(p):
+        position = (len(ordered) - 1) * p
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+    summary = {'min': ordered[0], 'p50': at(0.5), 'p90': at(0.9), 'p95': at(0.95), 'p99': at(0.99),
+               'max': ordered[-1], 'mean': sum(ordered) / len(ordered)}
+    return {key: round(value * 1000, 2) for key, value in summary.items()}
+
+
+class PageStats:
+    def __init__(self):
+        self.views = 0
+        self.errors = 0
+        self.requests = 0
+        self.bytes = 0
+        self.ttfb = []
+        self.load = []
+        # Views whose document was still fresh in the cache: no request, so no TTFB
+        self.cached_load = []
+        self.statuses = {}
+
+    def report(self):
+        return {
+            'views': self.views,
+            'errors': self.errors,
+            'requests': self.requests,
+            'requests_per_view': round(self.requests / self.views, 2) if self.views else 0,
+            'bytes_total': self.bytes,
+            'bytes_per_view': round(self.bytes / self.views) if self.views else 0,
+            'ttfb_ms': percentiles(self.ttfb),
+            'load_ms': percentiles(self.load),
+            'cached_views': len(self.cached_load),
+            'cached_load_ms': percentiles(self.cached_load),
+            'statuses': {str(status): count for status, count in sorted(self.statuses.items())},
+        }
+
+
+class LoadTest:
+    """Visits replaying the navigation steps against one server"""
+
+    def __init__(self, base_url, steps, connections, think=0, seed=None, cold_cache=False):
+        parts = urlsplit(base_url)
+        self.base_url = f'{parts.scheme}://{parts.netloc}'
+        self.pool = ConnectionPool(parts.hostname, parts.port or 80, connections)
+        self.steps = steps
+        self.think = think
+        self.cold_cache = cold_cache
+        self.random = random.Random(seed)
+        self.applications = ['/' + quote(path.replace(os.sep, '/')) for path in application_pages()]
+        self.pages = {step: PageStats() for step in steps}
+        self.cache_fresh = 0
+        self.cache_revalidated = 0
+        self.cache_misses = 0
+        self.conditional = 0
+        self.sessions = 0
+        self.bank = None
+
+    def _record(self, stats, response):
+        stats.requests += 1
+        stats.bytes += response.wire_bytes
+        stats.statuses[response.status] = stats.statuses.get(response.status, 0) + 1
+
+    async def load_resource(self, url, cache, stats):
+        """Fetch a document or subresource through a user's cache; return its body"""
+        now = time.monotonic()
+        cached = cache.get(url)
+        if cached and cached['fresh_until'] > now:
+            self.cache_fresh += 1
+            return cached['body'], None
+        headers = {'If-None-Match': cached['etag']} if cached and cached['etag'] else {}
+        self.conditional += bool(headers)
+        response = await self.pool.fetch(url, headers)
+        self._record(stats, response)
+        if response.status == 304 and cached:
+            self.cache_revalidated += 1
+            body = cached['body']
+        else:
+            self.cache_misses += 1
+            body = response.content()
+        cache_control = response.headers.get('cache-control', '')
+        max_age = _max_age_pattern.search(cache_control)
+        if 'no-store' not in cache_control and response.status in (200, 304):
+            fresh_for = int(max_age.group(1)) if max_age and 'no-cache' not in cache_control else 0
+            cache[url] = {'etag': response.headers.get('etag'), 'fresh_until': now + fresh_for, 'body': body}
+        return body, response
+
+    def subresources(self, document_url, body):
+        """Same-origin stylesheets, scripts and images of a document, in page order"""
+        html = body.decode('utf-8', 'replace') if body else ''
+        urls = []
+        for match in _subresource_pattern.finditer(html):
+            url = urljoin(self.base_url + document_url, next(group for group in match.groups() if group))
+            parts = urlsplit(url)
+            if f'{parts.scheme}://{parts.netloc}' == self.base_url:
+                # Percent-encode what a browser would (spaces in file names)
+                target = quote(parts.path, safe="/%:@!$&'()*+,;=~") + (f'?{parts.query}' if parts.query else '')
+                if target not in urls:
+                    urls.append(target)
+        return urls
+
+    async def read_bank(self, stats, start, end):
+        response = await self.pool.fetch(QUIZ_BANK_URL, {'Range': f'bytes={start}-{end - 1}'})
+        self._record(stats, response)
+        if response.status == 200:
+            return response.content()[start:end]
+        return response.content()
+
+    async def practice_quiz(self, stats):
+        """The bank reads of one practice quiz, as quiz-handler.js makes them"""
+        head = await self.read_bank(stats, 0, QUIZ_BANK_HEAD)
+        magic, _, app_count, _, index_offset = HEADER.unpack_from(head, 0)
+        if magic != MAGIC:
+            raise ValueError("not a quiz bank")
+        table_end = HEADER.size + app_count * APP_ENTRY_SIZE
+        if table_end > len(head):
+            head = await self.read_bank(stats, 0, table_end)
+        first, count, _ = APP_ENTRY.unpack_from(head, HEADER.size + self.random.randrange(app_count) * APP_ENTRY_SIZE)
+        for number in self.random.sample(range(first, first + count), min(count, PRACTICE_QUESTION_COUNT)):
+            entry = index_offset + number * INDEX_ENTRY_SIZE
+            offset, length = INDEX_ENTRY.unpack(await self.read_bank(stats, entry, entry + INDEX_ENTRY_SIZE))
+            json.loads(await self.read_bank(stats, offset, offset + length))
+
+    def page_url(self, step, application):
+        if step == 'home':
+            return HOME_URL
+        if step == 'application':
+            return application
+        if step == 'search':
+            name = unquote(os.path.splitext(application.rsplit('/', 1)[-1])[0])
+            return SEARCH_URL.format(query=quote(name))
+        if step == 'quiz':
+            return QUIZ_URL
+        # Any other step is taken as a site path
+        return step
+
+    async def page_view(self, step, url, cache):
+        stats = self.pages[step]
+        started = time.perf_counter()
+        try:
+            body, response = await self.load_resource(url, cache, stats)
+            if response is not None:
+                stats.ttfb.append(response.ttfb)
+            parallel = asyncio.Semaphore(SUBRESOURCE_PARALLELISM)
+
+            async def load(resource):
+                async with parallel:
+                    await self.load_resource(resource, cache, stats)
+
+            await asyncio.gather(*(load(resource) for resource in self.subresources(url, body)))
+            if step == 'quiz':
+                await self.practice_quiz(stats)
+        except (OSError, ValueError, struct.error, asyncio.IncompleteReadError) as e:
+            stats.errors += 1
+            print(f"❌ {url}: {type(e).__name__}: {e}", file=sys.stderr)
+            return
+        stats.views += 1
+        (stats.load if response is not None else stats.cached_load).append(time.perf_counter() - started)
+
+    async def visit(self, cache):
+        application = self.random.choice(self.applications)
+        for step in self.steps:
+            await self.page_view(step, self.page_url(step, application), cache)
+            if self.think:
+                await asyncio.sleep(self.think)
+        self.sessions += 1
+
+    async def run(self, users, sessions=None, duration=None):
+        deadline = time.monotonic() + duration if duration else None
+        remaining = [sessions]
+
+        async def user():
+            cache = {}
+            while True:
+                if deadline is not None and time.monotonic() >= deadline:
+                    return
+                if deadline is None:
+                    if remaining[0] <= 0:
+                        return
+                    remaining[0] -= 1
+                if self.cold_cache:
+                    cache = {}
+                await self.visit(cache)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(users)))
+        elapsed = time.perf_counter() - started
+        self.pool.close()
+        return elapsed
+
+    def report(self, elapsed, config):
+        pages = {step: stats.report() for step, stats in self.pages.items()}
+        views = sum(stats.views for stats in self.pages.values())
+        requests = sum(stats.requests for stats in self.pages.values())
+        transferred = sum(stats.bytes for stats in self.pages.values())
+        loads = self.cache_fresh + self.cache_revalidated + self.cache_misses
+        return {
+            'target': self.base_url,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'config': config,
+            'elapsed_s': round(elapsed, 3),
+            'sessions': self.sessions,
+            'page_views': views,
+            'requests': requests,
+            'bytes': transferred,
+            'throughput': {
+                'views_per_s': round(views / elapsed, 2) if elapsed else 0,
+                'requests_per_s': round(requests / elapsed, 2) if elapsed else 0,
+                'bytes_per_s': round(transferred / elapsed) if elapsed else 0,
+            },
+            'cache': {
+                'fresh': self.cache_fresh,
+                'revalidated': self.cache_revalidated,
+                'misses': self.cache_misses,
+                'hit_ratio': round((self.cache_fresh + self.cache_revalidated) / loads, 4) if loads else 0,
+                'conditional': self.conditional,
+                'not_modified_ratio': round(self.cache_revalidated / self.conditional, 4) if self.conditional else 0,
+            },
+            'connections': {'opened': self.pool.opened, 'reused_requests': self.pool.reused},
+            'pages': pages,
+        }
+
+
+def print_report(report):
+    print(f"🚦 {report['sessions']} visits, {report['page_views']} page views, {report['requests']} requests "
+          f"in {report['elapsed_s']:.1f}s against {report['target']}")
+    print("=" * 50)
+    for step, page in report['pages'].items():
+        ttfb, load, cached = page['ttfb_ms'], page['load_ms'], page['cached_load_ms']
+        print(f"📄 {step}: {page['views']} views, {page['requests_per_view']} requests and "
+              f"{page['bytes_per_view']:,} bytes per view" + (f", {page['errors']} errors" if page['errors'] else ''))
+        if ttfb:
+            print(f"   TTFB  p50 {ttfb['p50']:.1f}ms  p90 {ttfb['p90']:.1f}ms  p95 {ttfb['p95']:.1f}ms  "
+                  f"p99 {ttfb['p99']:.1f}ms  max {ttfb['max']:.1f}ms")
+        if load:
+            print(f"   View  p50 {load['p50']:.1f}ms  p90 {load['p90']:.1f}ms  p95 {load['p95']:.1f}ms  "
+                  f"p99 {load['p99']:.1f}ms  max {load['max']:.1f}ms")
+        if cached:
+            print(f"   Cached view ({page['cached_views']})  p50 {cached['p50']:.1f}ms  p90 {cached['p90']:.1f}ms  "
+                  f"p95 {cached['p95']:.1f}ms  p99 {cached['p99']:.1f}ms  max {cached['max']:.1f}ms")
+    print("=" * 50)
+    throughput, cache, connections = report['throughput'], report['cache'], report['connections']
+    print(f"⚡ {throughput['views_per_s']:.1f} views/s, {throughput['requests_per_s']:.1f} requests/s, "
+          f"{throughput['bytes_per_s'] / 1048576:.2f} MB/s ({report['bytes']:,} bytes)")
+    print(f"💾 Cache hit ratio {cache['hit_ratio']:.1%} ({cache['fresh']} fresh, "
+          f"{cache['revalidated']} revalidated, {cache['misses']} fetched)")
+    if cache.get('conditional'):
+        print(f"   {cache['not_modified_ratio']:.1%} of {cache['conditional']} conditional requests answered 304")
+    print(f"🔌 {connections['opened']} connections opened, {connections['reused_requests']} requests reused one")
+
+
+# (label, path into a page report, True when higher is better)
+PAGE_METRICS = (
+    ('TTFB p50 ms', ('ttfb_ms', 'p50'), False),
+    ('TTFB p95 ms', ('ttfb_ms', 'p95'), False),
+    ('View p50 ms', ('load_ms', 'p50'), False),
+    ('View p95 ms', ('load_ms', 'p95'), False),
+    ('Cached p50 ms', ('cached_load_ms', 'p50'), False),
+    ('Bytes/view', ('bytes_per_view',), False),
+    ('Requests/view', ('requests_per_view',), False),
+)
+TOTAL_METRICS = (
+    ('Views/s', ('throughput', 'views_per_s'), True),
+    ('Requests/s', ('throughput', 'requests_per_s'), True),
+    ('Cache hit ratio', ('cache', 'hit_ratio'), True),
+    ('304 share', ('cache', 'not_modified_ratio'), True),
+)
+
+
+def _lookup(report, path):
+    for key in path:
+        if not isinstance(report, dict) or key not in report:
+            return None
+        report = report[key]
+    return report
+
+
+def _compare_line(label, old, new, higher_is_better):
+    if old is None or new is None:
+        return f"   {label:<16} {old!s:>12} → {new!s:<12}"
+    if old:
+        change = (new - old) / old
+        changed = abs(change) >= COMPARE_THRESHOLD
+        shown = f"{change:+.1%}"
+    else:
+        changed = new != old
+        shown = "new" if changed else "+0.0%"
+    if not changed:
+        marker = '  '
+    elif (new > old) == higher_is_better:
+        marker = '✅'
+    else:
+        marker = '⚠️ '
+    return f"{marker} {label:<16} {old:>12,} → {new:<12,} {shown}"
+
+
+def compare_reports(old, new):
+    """Print the changes between two reports; return the number of regressions"""
+    print(f"📊 {old.get('created', '?')} → {new.get('created', '?')}")
+    print("=" * 50)
+    lines = []
+    for step in new['pages']:
+        if step not in old['pages']:
+            continue
+        lines.append(f"📄 {step}")
+        for label, path, higher_is_better in PAGE_METRICS:
+            lines.append(_compare_line(label, _lookup(old['pages'][step], path),
+                                       _lookup(new['pages'][step], path), higher_is_better))
+    lines.append("🌐 totals")
+    for label, path, higher_is_better in TOTAL_METRICS:
+        lines.append(_compare_line(label, _lookup(old, path), _lookup(new, path), higher_is_better))
+    for line in lines:
+        print(line)
+    regressions = sum(1 for line in lines if line.startswith('⚠️'))
+    print("=" * 50)
+    print(f"{regressions} metrics worse by {COMPARE_THRESHOLD:.0%} or more")
+    return regressions
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server():
+    """Start serve_site.py on a free port; return (process, base URL)"""
+    port = _free_port()
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'serve_site.py')
+    process = subprocess.Popen([sys.executable, script, '--port', str(port)], stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process, f'http://127.0.0.1:{port}'
+        except OSError:
+            if process.poll() is not None:
+                break
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError("serve_site.py did not start")
+
+
+def load_report(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the site with a replayed navigation mix")
+    parser.add_argument('--url', default=DEFAULT_URL, help=f"Server to test (default: {DEFAULT_URL})")
+    parser.add_argument('--serve', action='store_true', help="Start serve_site.py for the run and test it")
+    parser.add_argument('--steps', default=','.join(DEFAULT_STEPS),
+                        help=f"Navigation steps of a visit (default: {','.join(DEFAULT_STEPS)}); "
+                             f"other steps are taken as site paths")
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS,
+                        help=f"Visits in progress at once (default: {DEFAULT_USERS})")
+    parser.add_argument('--sessions', type=int, default=DEFAULT_SESSIONS,
+                        help=f"Visits to make (default: {DEFAULT_SESSIONS})")
+    parser.add_argument('--duration', type=float, help="Run for this many seconds instead of --sessions visits")
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS,
+                        help=f"Keep-alive connection pool size (default: {DEFAULT_CONNECTIONS})")
+    parser.add_argument('--cold-cache', action='store_true',
+                        help="Start every visit with an empty cache instead of keeping each user's cache")
+    parser.add_argument('--think', type=float, default=0, help="Seconds between a visit's page views")
+    parser.add_argument('--seed', type=int, help="Seed for the visits' page choices")
+    parser.add_argument('--json', help="Write the report to this file")
+    parser.add_argument('--compare', nargs='+', metavar='REPORT',
+                        help="Compare against a baseline report: BASE.json (after this run) or BASE.json NEW.json")
+    args = parser.parse_args()
+
+    if args.compare and len(args.compare) > 2:
+        parser.error("--compare takes a baseline report and at most one other report")
+    if args.compare and len(args.compare) == 2:
+        regressions = compare_reports(load_report(args.compare[0]), load_report(args.compare[1]))
+        sys.exit(1 if regressions else 0)
+
+    process = None
+    url = args.url
+    if args.serve:
+        process, url = start_server()
+        print(f"🌐 Started serve_site.py on {url}")
+    config = {'steps': args.steps.split(','), 'users': args.users, 'connections': args.connections,
+              'sessions': None if args.duration else args.sessions, 'duration_s': args.duration,
+              'think_s': args.think, 'seed': args.seed, 'cold_cache': args.cold_cache}
+    test = LoadTest(url, config['steps'], args.connections, args.think, args.seed, args.cold_cache)
+    try:
+        elapsed = asyncio.run(test.run(args.users, args.sessions, args.duration))
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+    report = test.report(elapsed, config)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+        print(f"📝 Wrote {args.json}")
+    if args.compare:
+        print()
+        if compare_reports(load_report(args.compare[0]), report):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
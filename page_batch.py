@@ -0,0 +1,468 @@
+#!/usr/bin/env python3
+"""
+Shared read/write path for the batch page tools.
+
+PageWriter snapshots a batch's pages and writes them atomically, or, with
+--dry-run, writes nothing and streams a unified diff for each page as soon
+as that page is transformed. The diff and the change statistics (changed
+bytes and regions per transform) come from the same SequenceMatcher pass
+over the in-memory old and new text, so a dry run costs one diff per
+changed page.
+
+File I/O goes through PageIO, which runs an asyncio loop on a background
+thread with a bounded thread pool for the blocking calls. Reads are
+prefetched up to --prefetch pages ahead of the page being transformed and
+writes are flushed in batches of --concurrency, so on a network filesystem
+the per-file round trips overlap with each other and with the transforms.
+
+With --stream, a batch never holds its whole page list: begin() takes the
+paths lazily (e.g. from page_corpus.iter_pages), keeps at most --prefetch
+pages read ahead and snapshots each page just before it is handed out.
+Transforms record their edits in a Splice, and the page is written from
+its chunks without building the new text, so memory stays at a window of
+pages however large the corpus is. finish() then reports the peak RSS.
+
+Transforms applied through PageWriter.apply() run in a worker process
+under a per-page time budget (--time-budget). A page whose regexes backtrack
+past the budget gets the worker killed and fails with TransformTimeout, so
+one malformed page cannot stall the batch; regex_audit.py finds the patterns
+that could do that.
+"""
+
+import asyncio
+import multiprocessing
+import re
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from difflib import SequenceMatcher
+
+from page_snapshots import SnapshotWriter, atomic_write, snapshot
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+DIFF_CONTEXT = 3
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PREFETCH = 16
+# Write batches allowed in flight before write() waits for the oldest one
+MAX_WRITE_BATCHES = 2
+DEFAULT_TIME_BUDGET = 10.0
+
+
+def add_batch_arguments(parser, stream=True):
+    """Add the options every batch page tool understands
+
+    Tools that must see every page before writing any (they write shared
+    files first) pass stream=False and do not offer --stream.
+    """
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Write nothing; stream a unified diff per page and print change statistics")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"File operations in flight at once (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--prefetch', type=int, default=DEFAULT_PREFETCH,
+                        help=f"Pages to read ahead of the one being transformed (default: {DEFAULT_PREFETCH})")
+    if stream:
+        parser.add_argument('--stream', action='store_true',
+                            help="Discover, snapshot and transform pages lazily in constant memory")
+    parser.add_argument('--time-budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help=f"Seconds a transform may spend on one page before the page fails "
+                             f"(default: {DEFAULT_TIME_BUDGET:g}; 0 runs transforms in-process with no limit)")
+
+
+def batch_options(args):
+    """Return the PageWriter keyword arguments for parsed batch arguments"""
+    return {'dry_run': args.dry_run, 'concurrency': args.concurrency, 'prefetch': args.prefetch,
+            'stream': getattr(args, 'stream', False), 'time_budget': args.time_budget}
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes, or None where unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class Splice:
+    """A page edit kept as replacements over the original text
+
+    Transforms record (start, end, replacement) edits instead of building
+    the new page with re.sub or slicing and concatenation. chunks() yields
+    the new page piece by piece for writing; str() joins it when the whole
+    text is needed (diffs, golden checks).
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.edits = []
+
+    def _overlaps(self, start, end):
+        return any(start < edit_end and edit_start < end or start == edit_start == end
+                   for edit_start, edit_end, _ in self.edits)
+
+    def replace(self, start, end, replacement):
+        """Replace text[start:end] of the original text"""
+        self.edits.append((start, end, replacement))
+
+    def sub(self, pattern, repl, flags=0):
+        """Like re.sub over the original text; return the number of replacements
+
+        Matches overlapping an earlier edit are skipped, as they would have
+        been rewritten by it.
+        """
+        count = 0
+        for match in re.finditer(pattern, self.text, flags):
+            if self._overlaps(match.start(), match.end()):
+                continue
+            self.replace(match.start(), match.end(), match.expand(repl) if isinstance(repl, str) else repl(match))
+            count += 1
+        return count
+
+    def __bool__(self):
+        return bool(self.edits)
+
+    def chunks(self):
+        position = 0
+        for start, end, replacement in sorted(self.edits, key=lambda edit: edit[:2]):
+            yield self.text[position:start]
+            yield replacement
+            position = end
+        yield self.text[position:]
+
+    def __str__(self):
+        return ''.join(self.chunks())
+
+
+class TransformTimeout(TimeoutError):
+    """A transform ran past its time budget on one page"""
+
+
+def _transform_worker(conn):
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message is None:
+            return
+        func, args = message
+        try:
+            result = (True, func(*args))
+        except Exception as e:
+            result = (False, e)
+        conn.send(result)
+
+
+class TransformWorker:
+    """Runs transforms in a child process that is killed when one overruns
+
+    The process is started on first use and replaced after a kill, so a
+    timed-out page costs one process start and the batch moves on.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        # A fresh interpreter: the batch's I/O thread makes fork unsafe
+        self._context = multiprocessing.get_context('spawn')
+        self._process = None
+        self._conn = None
+
+    def _start(self):
+        self._conn, child = self._context.Pipe()
+        self._process = self._context.Process(target=_transform_worker, args=(child,),
+                                              name='page-transform', daemon=True)
+        self._process.start()
+        child.close()
+
+    def _kill(self):
+        self._process.kill()
+        self._process.join()
+        self._conn.close()
+        self._process = None
+
+    def run(self, func, *args):
+        """Return func(*args), raising TransformTimeout if it takes over the budget"""
+        if self._process is None:
+            self._start()
+        self._conn.send((func, args))
+        if not self._conn.poll(self.budget):
+            self._kill()
+            raise TransformTimeout(f"{func.__name__} ran past its {self.budget:g}s budget")
+        try:
+            ok, value = self._conn.recv()
+        except EOFError:
+            self._kill()
+            raise RuntimeError(f"transform worker exited during {func.__name__}") from None
+        if not ok:
+            raise value
+        return value
+
+    def close(self):
+        if self._process is not None:
+            self._conn.send(None)
+            self._process.join(self.budget)
+            if self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+            self._conn.close()
+            self._process = None
+
+
+def _format_range(start, length):
+    # Same range format as difflib.unified_diff
+    beginning = start + 1
+    if length == 1:
+        return str(beginning)
+    if not length:
+        beginning -= 1
+    return f'{beginning},{length}'
+
+
+def _diff_lines(lines, prefix):
+    for line in lines:
+        yield prefix + line
+        if not line.endswith('\n'):
+            yield '\n\\ No newline at end of file\n'
+
+
+def diff_page(path, old, new, out):
+    """Stream a unified diff of old -> new to out; return (changed_bytes, regions)"""
+    a = old.splitlines(keepends=True)
+    b = new.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, a, b, autojunk=False)
+
+    changed_bytes = 0
+    regions = 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        regions += 1
+        changed_bytes += sum(len(line.encode('utf-8')) for line in a[i1:i2])
+        changed_bytes += sum(len(line.encode('utf-8')) for line in b[j1:j2])
+
+    if regions:
+        out.write(f'--- a/{path}\n+++ b/{path}\n')
+        # get_grouped_opcodes reuses the opcodes computed above
+        for group in matcher.get_grouped_opcodes(DIFF_CONTEXT):
+            first, last = group[0], group[-1]
+            out.write(f'@@ -{_format_range(first[1], last[2] - first[1])} '
+                      f'+{_format_range(first[3], last[4] - first[3])} @@\n')
+            for tag, i1, i2, j1, j2 in group:
+                if tag == 'equal':
+                    out.writelines(_diff_lines(a[i1:i2], ' '))
+                    continue
+                out.writelines(_diff_lines(a[i1:i2], '-'))
+                out.writelines(_diff_lines(b[j1:j2], '+'))
+        out.flush()
+    return changed_bytes, regions
+
+
+def _read_text(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+class PageIO:
+    """Overlapped page reads and batched atomic writes"""
+
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY, prefetch=DEFAULT_PREFETCH):
+        self.concurrency = max(1, concurrency)
+        self.prefetch_window = max(0, prefetch)
+        self._pool = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='page-io')
+        self._loop = asyncio.new_event_loop()
+        self._loop.set_default_executor(self._pool)
+        self._thread = threading.Thread(target=self._loop.run_forever, name='page-io-loop', daemon=True)
+        self._thread.start()
+        self._upcoming = deque()
+        self._reads = OrderedDict()
+        self._pending_writes = []
+        self._write_batches = deque()
+        self.failed_writes = []
+
+    async def _call(self, func, *args):
+        return await self._loop.run_in_executor(None, func, *args)
+
+    async def _write_batch(self, batch):
+        results = await asyncio.gather(*(self._call(atomic_write, path, content) for path, content in batch),
+                                       return_exceptions=True)
+        return [(path, result) for (path, _), result in zip(batch, results) if isinstance(result, Exception)]
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _fill(self):
+        while self._upcoming and len(self._reads) < self.prefetch_window:
+            path = self._upcoming.popleft()
+            if path not in self._reads:
+                self._reads[path] = self._submit(self._call(_read_text, path))
+
+    def prefetch(self, paths):
+        """Queue pages that will be read, in order, so they can be fetched ahead"""
+        self._upcoming.extend(paths)
+        self._fill()
+
+    def read(self, path):
+        """Return a page's text, from the prefetch window when it is there"""
+        future = None
+        if path in self._reads:
+            # Pages prefetched ahead of this one were skipped by the caller
+            while future is None:
+                queued, queued_future = self._reads.popitem(last=False)
+                if queued == path:
+                    future = queued_future
+                else:
+                    queued_future.cancel()
+        self._fill()
+        if future is None:
+            future = self._submit(self._call(_read_text, path))
+        return future.result()
+
+    def write(self, path, content):
+        """Queue an atomic write; batches go out once concurrency writes are queued"""
+        self._pending_writes.append((path, content))
+        if len(self._pending_writes) >= self.concurrency:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        if self._pending_writes:
+            self._write_batches.append(self._submit(self._write_batch(self._pending_writes)))
+            self._pending_writes = []
+        while len(self._write_batches) > MAX_WRITE_BATCHES:
+            self.failed_writes.extend(self._write_batches.popleft().result())
+
+    def flush(self):
+        """Wait for every queued write; return [(path, exception)] for the ones that failed"""
+        self._flush_batch()
+        while self._write_batches:
+            self.failed_writes.extend(self._write_batches.popleft().result())
+        failed, self.failed_writes = self.failed_writes, []
+        return failed
+
+    def close(self):
+        """Flush writes and stop the I/O loop; return the failed writes"""
+        failed = self.flush()
+        for future in self._reads.values():
+            future.cancel()
+        self._reads.clear()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._pool.shutdown(wait=True)
+        return failed
+
+
+class PageWriter:
+    """Snapshot-and-write, or diff-only when dry_run is set"""
+
+    def __init__(self, transform, dry_run=False, out=None,
+                 concurrency=DEFAULT_CONCURRENCY, prefetch=DEFAULT_PREFETCH, stream=False,
+                 time_budget=DEFAULT_TIME_BUDGET):
+        self.transform = transform
+        self.dry_run = dry_run
+        self.stream = stream
+        self.out = out or sys.stdout
+        self.io = PageIO(concurrency, prefetch)
+        self.worker = TransformWorker(time_budget) if time_budget else None
+        self.pages_changed = 0
+        self.changed_bytes = 0
+        self.regions = 0
+
+    def snapshot(self, paths):
+        """Snapshot the batch's pages before writing; no-op in dry-run mode"""
+        if self.dry_run:
+            print("🔍 Dry run: no files will be written")
+            return None
+        snapshot_id = snapshot(paths, self.transform)
+        print(f"📸 Snapshot {snapshot_id} (undo with: python page_snapshots.py rollback)")
+        return snapshot_id
+
+    def prefetch(self, paths):
+        """Start reading the batch's pages ahead of the transform loop"""
+        self.io.prefetch(paths)
+
+    def begin(self, paths):
+        """Return the batch's pages to loop over
+
+        The pages are snapshotted and prefetched up front, or, in stream
+        mode, taken lazily from the iterable with a bounded read-ahead
+        window and snapshotted one by one as they are handed out.
+        """
+        if not self.stream:
+            paths = list(paths)
+            self.snapshot(paths)
+            self.prefetch(paths)
+            return paths
+        return self._stream(iter(paths))
+
+    def _stream(self, paths):
+        if self.dry_run:
+            print("🔍 Dry run: no files will be written")
+        snapshot_writer = None if self.dry_run else SnapshotWriter(self.transform)
+        ahead = deque()
+        try:
+            while True:
+                for path in paths:
+                    ahead.append(path)
+                    self.io.prefetch((path,))
+                    if len(ahead) > self.io.prefetch_window:
+                        break
+                if not ahead:
+                    break
+                path = ahead.popleft()
+                if snapshot_writer:
+                    snapshot_writer.add(path)
+                yield path
+        finally:
+            if snapshot_writer:
+                snapshot_writer.close()
+                print(f"📸 Snapshot {snapshot_writer.id}: {snapshot_writer.count} files "
+                      f"(undo with: python page_snapshots.py rollback)")
+
+    def read(self, path):
+        """Return a page's text"""
+        return self.io.read(path)
+
+    def apply(self, func, *args):
+        """Return func(*args), run within the per-page time budget
+
+        Raises TransformTimeout when the budget runs out; the batch goes on
+        with the next page.
+        """
+        if self.worker is None:
+            return func(*args)
+        return self.worker.run(func, *args)
+
+    def write(self, path, old, new):
+        """Queue new content (a str or a Splice) for a page, or diff it against old in dry-run mode"""
+        if not self.dry_run:
+            self.io.write(path, new.chunks() if isinstance(new, Splice) else new)
+            return
+        changed_bytes, regions = diff_page(path, old, str(new), self.out)
+        if regions:
+            self.pages_changed += 1
+            self.changed_bytes += changed_bytes
+            self.regions += regions
+
+    def finish(self):
+        """Flush queued writes, report failed ones and print dry-run statistics
+
+        Returns the number of writes that failed. Writes are queued, so a page
+        reported as fixed during the loop is only on disk once this returns.
+        """
+        failed = self.io.close()
+        if self.worker:
+            self.worker.close()
+        for path, error in failed:
+            print(f"❌ Error writing {path}: {error}")
+        if self.dry_run:
+            print(f"\n📊 {self.transform}: {self.pages_changed} pages would change, "
+                  f"{self.regions} regions, {self.changed_bytes:,} bytes")
+        peak = peak_rss()
+        if self.stream and peak is not None:
+            print(f"📈 Peak RSS: {peak / 1048576:.1f} MB")
+        return len(failed)
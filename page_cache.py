@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Pre-parsed page cache shared by the page tools.
+
+A page is parsed once into three offset tables:
+
+    tags    (start, end, name id, flags)  every tag, script/style bodies skipped
+    rules   (selector start, body start, end, depth)  every rule in <style> blocks
+    rows    (start, end, table ordinal)  every <tr> in every table
+
+Offsets are byte offsets into the UTF-8 page. The tables are stored in
+.page_cache/ as flat little-endian uint32 arrays behind a fixed header and
+are memory-mapped on load, so a warm load is a hash check plus an mmap.
+Each cache file records the SHA-1 of the page bytes it was built from and
+is rebuilt as soon as the page content changes.
+
+Usage:
+    python page_cache.py [--clear] [paths...]
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+
+from page_corpus import find_pages
+
+CACHE_DIR = '.page_cache'
+CACHE_MAGIC = b'SSPC'
+CACHE_VERSION = 1
+
+# magic, version, reserved, sha1, page length, tag/rule/row counts, names length
+_header = struct.Struct('<4sHH20sIIIII')
+
+TAG_FIELDS = 4
+RULE_FIELDS = 4
+ROW_FIELDS = 3
+
+FLAG_CLOSING = 1
+FLAG_SELF_CLOSING = 2
+
+_token_pattern = re.compile(rb'<!--.*?-->|<(/?)([a-zA-Z][\w-]*)[^>]*>', re.DOTALL)
+_css_token_pattern = re.compile(rb'/\*.*?\*/|[{}]', re.DOTALL)
+_attr_pattern = re.compile(rb'(?<![\w:-])([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))')
+_raw_text_end = {b'script': re.compile(rb'</script\s*>', re.IGNORECASE),
+                 b'style': re.compile(rb'</style\s*>', re.IGNORECASE)}
+
+if sys.byteorder != 'little':
+    raise ImportError("page_cache stores little-endian tables and needs a little-endian host")
+
+
+class ParsedPage:
+    """A page plus its tag, style rule and table row offset tables"""
+
+    def __init__(self, path, data, tags, rules, rows, names, mapping=None):
+        self.path = path
+        self.data = data
+        self.tags = tags
+        self.rules = rules
+        self.rows = rows
+        self.names = names
+        self._mapping = mapping
+
+    def close(self):
+        """Release the memory-mapped cache file, if any"""
+        if self._mapping is not None:
+            for table in (self.tags, self.rules, self.rows):
+                if isinstance(table, memoryview):
+                    table.release()
+            self._mapping.close()
+            self._mapping = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def tag_count(self):
+        return len(self.tags) // TAG_FIELDS
+
+    def iter_tags(self, name=None, closing=False):
+        """Yield (index, start, end) for opening (or closing) tags, optionally by name"""
+        name_id = None
+        if name is not None:
+            if name not in self.names:
+                return
+            name_id = self.names.index(name)
+        tags = self.tags
+        for i in range(0, len(tags), TAG_FIELDS):
+            if name_id is not None and tags[i + 2] != name_id:
+                continue
+            if bool(tags[i + 3] & FLAG_CLOSING) != closing:
+                continue
+            yield i // TAG_FIELDS, tags[i], tags[i + 1]
+
+    def tag_name(self, index):
+        return self.names[self.tags[index * TAG_FIELDS + 2]]
+
+    def tag_attrs(self, index):
+        """Parse the attributes of one tag on demand"""
+        start = self.tags[index * TAG_FIELDS]
+        end = self.tags[index * TAG_FIELDS + 1]
+        attrs = {}
+        for name, dq, sq, bare in _attr_pattern.findall(bytes(self.data[start:end])):
+            value = dq or sq or bare
+            attrs[name.decode('ascii', 'replace').lower()] = value.decode('utf-8', 'replace')
+        return attrs
+
+    def iter_rules(self):
+        """Yield (selector, body, depth) for every rule in the page's <style> blocks"""
+        rules = self.rules
+        for i in range(0, len(rules), RULE_FIELDS):
+            selector_start, body_start, end, depth = rules[i:i + RULE_FIELDS]
+            selector = bytes(self.data[selector_start:body_start - 1]).decode('utf-8', 'replace')
+            body = bytes(self.data[body_start:end - 1]).decode('utf-8', 'replace')
+            yield ' '.join(selector.split()), body, depth
+
+    def iter_rows(self):
+        """Yield (table ordinal, start, end) for every table row"""
+        rows = self.rows
+        for i in range(0, len(rows), ROW_FIELDS):
+            yield rows[i + 2], rows[i], rows[i + 1]
+
+    def text(self, start, end):
+        return bytes(self.data[start:end]).decode('utf-8', 'replace')
+
+
+def _parse_rules(data, start, end, rules):
+    """Append offsets of the rules in data[start:end] to rules"""
+    stack = []
+    selector_start = start
+    for match in _css_token_pattern.finditer(data, start, end):
+        token = match.group()
+        if token == b'{':
+            while selector_start < match.start() and data[selector_start] in b' \t\r\n':
+                selector_start += 1
+            stack.append((selector_start, match.end()))
+            selector_start = match.end()
+        elif token == b'}':
+            if stack:
+                rule_start, body_start = stack.pop()
+                # @media and friends only wrap other rules
+                if not data.startswith(b'@', rule_start):
+                    rules.extend((rule_start, body_start, match.end(), len(stack)))
+            selector_start = match.end()
+        else:
+            selector_start = match.end()
+
+
+def parse_bytes(data, path=None):
+    """Parse page bytes into a ParsedPage backed by in-memory arrays"""
+    tags = array('I')
+    rules = array('I')
+    rows = array('I')
+    names = []
+    name_ids = {}
+
+    table_ordinal = -1
+    row_start = None
+    pos = 0
+    length = len(data)
+
+    while pos < length:
+        match = _token_pattern.search(data, pos)
+        if match is None:
+            break
+        pos = match.end()
+        if match.group(2) is None:
+            continue  # comment
+
+        name = match.group(2).lower()
+        closing = bool(match.group(1))
+        name_text = name.decode('ascii')
+        if name_text not in name_ids:
+            name_ids[name_text] = len(names)
+            names.append(name_text)
+        flags = (FLAG_CLOSING if closing else 0) | (FLAG_SELF_CLOSING if match.group().endswith(b'/>') else 0)
+        tags.extend((match.start(), match.end(), name_ids[name_text], flags))
+
+        if name == b'table' and not closing:
+            table_ordinal += 1
+        elif name == b'tr':
+            if row_start is not None:
+                # An unclosed row ends where the next one starts
+                rows.extend((row_start, match.start(), max(table_ordinal, 0)))
+                row_start = None
+            if not closing:
+                row_start = match.start()
+        elif name in (b'tbody', b'thead', b'tfoot', b'table') and closing and row_start is not None:
+            rows.extend((row_start, match.start(), max(table_ordinal, 0)))
+            row_start = None
+
+        if name in _raw_text_end and not closing:
+            end_match = _raw_text_end[name].search(data, pos)
+            body_end = end_match.start() if end_match else length
+            if name == b'style':
+                _parse_rules(data, pos, body_end, rules)
+            pos = body_end
+
+    if row_start is not None:
+        rows.extend((row_start, length, max(table_ordinal, 0)))
+
+    return ParsedPage(path, data, tags, rules, rows, names)
+
+
+def _cache_path(path, cache_dir):
+    key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, key + '.bin')
+
+
+def _write_cache(cache_file, digest, page):
+    names = '\0'.join(page.names).encode('ascii')
+    header = _header.pack(CACHE_MAGIC, CACHE_VERSION, 0, digest, len(page.data),
+                          len(page.tags) // TAG_FIELDS, len(page.rules) // RULE_FIELDS,
+                          len(page.rows) // ROW_FIELDS, len(names))
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    tmp_file = f'{cache_file}.{os.getpid()}.tmp'
+    with open(tmp_file, 'wb') as f:
+        f.write(header)
+        page.tags.tofile(f)
+        page.rules.tofile(f)
+        page.rows.tofile(f)
+        f.write(names)
+    os.replace(tmp_file, cache_file)
+
+
+def _map_cache(cache_file, digest, path, data):
+    """Return a ParsedPage over a memory-mapped cache file, or None if stale"""
+    try:
+        with open(cache_file, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, _, cached_digest, length, n_tags, n_rules, n_rows, names_len = \
+            _header.unpack_from(mapping)
+    except struct.error:
+        mapping.close()
+        return None
+    if (magic, version, cached_digest, length) != (CACHE_MAGIC, CACHE_VERSION, digest, len(data)):
+        mapping.close()
+        return None
+
+    view = memoryview(mapping)
+    offset = _header.size
+    tables = []
+    for count, fields in ((n_tags, TAG_FIELDS), (n_rules, RULE_FIELDS), (n_rows, ROW_FIELDS)):
+        size = count * fields * 4
+        tables.append(view[offset:offset + size].cast('I'))
+        offset += size
+    names_raw = bytes(view[offset:offset + names_len])
+    view.release()
+    names = names_raw.decode('ascii').split('\0') if names_raw else []
+    return ParsedPage(path, data, *tables, names, mapping=mapping)
+
+
+def load_page(path, cache_dir=CACHE_DIR):
+    """Return the parsed page, from the cache when the content hash matches"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    digest = hashlib.sha1(data).digest()
+    cache_file = _cache_path(path, cache_dir)
+
+    page = _map_cache(cache_file, digest, path, data)
+    if page is not None:
+        return page
+
+    page = parse_bytes(data, path)
+    try:
+        _write_cache(cache_file, digest, page)
+    except OSError:
+        pass  # a read-only checkout still gets the parsed page
+    return page
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or refresh the pre-parsed page cache")
+    parser.add_argument('paths', nargs='*', help="Pages to cache (default: every page in the site)")
+    parser.add_argument('--clear', action='store_true', help="Remove all cached pages first")
+    args = parser.parse_args()
+
+    if args.clear and os.path.isdir(CACHE_DIR):
+        for name in os.listdir(CACHE_DIR):
+            os.remove(os.path.join(CACHE_DIR, name))
+
+    paths = args.paths or find_pages()
+    tags = rules = rows = 0
+    start = time.perf_counter()
+    for path in paths:
+        with load_page(path) as page:
+            tags += page.tag_count
+            rules += len(page.rules) // RULE_FIELDS
+            rows += len(page.rows) // ROW_FIELDS
+    elapsed = time.perf_counter() - start
+
+    print(f"🗂️  {len(paths)} pages cached in {elapsed * 1000:.1f} ms "
+          f"({tags:,} tags, {rules:,} style rules, {rows:,} table rows)")
+
+
+if __name__ == "__main__":
+    main()
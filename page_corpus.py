@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for locating and reading the site's HTML pages.
+All page tools run from the repository root and use paths relative to it.
+"""
+
+import os
+
+PAGE_EXTENSIONS = ('.html', '.htm')
+
+# Directories that never contain site pages
+EXCLUDED_DIRS = {'.git', '.github', 'node_modules', 'backend', 'supabase', '__pycache__', 'transform_goldens',
+                 'blog_source'}
+
+
+def is_page(filename):
+    """Return True if the file name looks like an HTML page"""
+    return filename.lower().endswith(PAGE_EXTENSIONS)
+
+
+def find_pages(root='.'):
+    """Return a sorted list of page paths under root, relative to root"""
+    pages = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames
+                             if d not in EXCLUDED_DIRS and not d.startswith('.'))
+        for filename in filenames:
+            if is_page(filename):
+                pages.append(os.path.relpath(os.path.join(dirpath, filename), root))
+    return sorted(pages)
+
+
+def iter_pages(directory, recursive=False):
+    """Yield the page paths in directory as os.scandir finds them, without listing it first
+
+    Paths are joined onto directory, as os.path.join(directory, name) would.
+    Unlike find_pages() the order is the directory's own, not sorted.
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if recursive and entry.name not in EXCLUDED_DIRS and not entry.name.startswith('.'):
+                    yield from iter_pages(entry.path, recursive)
+            elif is_page(entry.name):
+                yield entry.path
+
+
+def read_page(path):
+    """Read a page as text, tolerating stray bytes in older pages"""
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        return f.read()
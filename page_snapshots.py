@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Cheap snapshots and atomic writes for batch page rewrites.
+
+Before a batch, snapshot() records the target pages in .page_snapshots/
+using a reflink (copy-on-write clone) where the filesystem supports it and
+a hard link otherwise, so taking a snapshot costs one metadata operation
+per file and copies no data. Page tools then write through atomic_write(),
+which writes a temp file next to the page and renames it into place. The
+rename gives the page a new inode, leaving the snapshot's link pointing at
+the old content, and an interrupted run never leaves a truncated page.
+
+Note: a hard-linked snapshot is only as safe as the writers. Anything that
+edits a snapshotted page in place (rather than replacing it) also changes
+the snapshot; reflinks do not have that problem.
+
+Batches that stream their pages snapshot each page just before it is
+transformed, through SnapshotWriter, so the snapshot never needs the whole
+page list.
+
+Usage:
+    python page_snapshots.py snapshot FILE [FILE...]
+    python page_snapshots.py list
+    python page_snapshots.py rollback [SNAPSHOT_ID]
+    python page_snapshots.py prune [--keep N]
+"""
+
+import argparse
+import errno
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.page_snapshots')
+LATEST_FILE = 'LATEST'
+MANIFEST_FILE = 'manifest.json'
+DEFAULT_KEEP = 10
+
+# Linux FICLONE ioctl: share the source's extents with the destination
+_FICLONE = 0x40049409
+
+
+def _reflink(src, dst):
+    import fcntl
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+
+
+def clone_file(src, dst):
+    """Clone src to dst without copying data where possible; return the method used"""
+    if sys.platform.startswith('linux'):
+        try:
+            _reflink(src, dst)
+            return 'reflink'
+        except (OSError, ImportError):
+            if os.path.exists(dst):
+                os.unlink(dst)
+    try:
+        os.link(src, dst)
+        return 'hardlink'
+    except OSError as e:
+        if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP, errno.EACCES):
+            raise
+    shutil.copy2(src, dst)
+    return 'copy'
+
+
+def atomic_write(path, content, encoding='utf-8'):
+    """Write content (str, bytes or an iterable of str chunks) to path via a temp file and an atomic rename"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        if isinstance(content, (bytes, bytearray)):
+            f = os.fdopen(fd, 'wb')
+        else:
+            f = os.fdopen(fd, 'w', encoding=encoding, newline='')
+        with f:
+            if isinstance(content, (str, bytes, bytearray)):
+                f.write(content)
+            else:
+                # An iterable of chunks, so large outputs need not be joined first
+                for chunk in content:
+                    f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except FileNotFoundError:
+            os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+class SnapshotWriter:
+    """Snapshot files one at a time, streaming the manifest to disk
+
+    The manifest is written under a temporary name and only renamed into
+    place by close(), so list() and rollback() never see half a snapshot.
+    """
+
+    def __init__(self, label=None):
+        self.id = time.strftime('%Y%m%d-%H%M%S') + f'-{time.time_ns() % 1_000_000_000:09d}'
+        self.path = os.path.join(SNAPSHOT_DIR, self.id)
+        self.count = 0
+        os.makedirs(os.path.join(self.path, 'files'))
+        self._manifest = open(os.path.join(self.path, MANIFEST_FILE + '.tmp'), 'w', encoding='utf-8')
+        header = json.dumps({'id': self.id, 'label': label, 'created': time.time()})
+        self._manifest.write(header[:-1] + ', "files": [')
+
+    def add(self, path):
+        """Record one file (or its absence, for a file the batch will create)"""
+        abs_path = os.path.abspath(path)
+        entry = {'path': abs_path, 'existed': os.path.exists(abs_path)}
+        if entry['existed']:
+            entry['blob'] = f'{self.count:05d}'
+            entry['method'] = clone_file(abs_path, os.path.join(self.path, 'files', entry['blob']))
+        self._manifest.write((',\n ' if self.count else '\n ') + json.dumps(entry))
+        self.count += 1
+
+    def close(self):
+        """Finish the manifest and make this the latest snapshot"""
+        if self._manifest.closed:
+            return
+        self._manifest.write('\n]}\n')
+        self._manifest.close()
+        os.replace(self._manifest.name, os.path.join(self.path, MANIFEST_FILE))
+        atomic_write(os.path.join(SNAPSHOT_DIR, LATEST_FILE), self.id + '\n')
+
+
+def snapshot(paths, label=None):
+    """Snapshot the given files; return the snapshot id"""
+    writer = SnapshotWriter(label)
+    try:
+        for path in paths:
+            writer.add(path)
+    finally:
+        writer.close()
+    return writer.id
+
+
+def list_snapshots():
+    """Return the snapshot manifests, oldest first"""
+    if not os.path.isdir(SNAPSHOT_DIR):
+        return []
+    manifests = []
+    for name in sorted(os.listdir(SNAPSHOT_DIR)):
+        manifest_path = os.path.join(SNAPSHOT_DIR, name, MANIFEST_FILE)
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifests.append(json.load(f))
+    return manifests
+
+
+def latest_snapshot_id():
+    try:
+        with open(os.path.join(SNAPSHOT_DIR, LATEST_FILE), 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def rollback(snapshot_id=None):
+    """Restore every file recorded in a snapshot (default: the latest one)"""
+    snapshot_id = snapshot_id or latest_snapshot_id()
+    if snapshot_id is None:
+        raise FileNotFoundError("no snapshot to roll back to")
+    snapshot_path = os.path.join(SNAPSHOT_DIR, snapshot_id)
+    with open(os.path.join(snapshot_path, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    restored = []
+    for entry in manifest['files']:
+        path = entry['path']
+        if not entry['existed']:
+            # The batch created this file; rolling back removes it
+            if os.path.exists(path):
+                os.unlink(path)
+                restored.append(path)
+            continue
+        blob = os.path.join(snapshot_path, 'files', entry['blob'])
+        if os.path.exists(path) and os.path.samefile(blob, path):
+            # Still a hardlink to the blob: the batch never rewrote it
+            continue
+        # Clone to a temp name first so the snapshot blob stays intact
+        tmp_path = f"{path}.{os.getpid()}.rollback"
+        clone_file(blob, tmp_path)
+        os.replace(tmp_path, path)
+        if os.path.lexists(tmp_path):
+            # rename() between two links to one inode leaves both in place
+            os.unlink(tmp_path)
+        restored.append(path)
+    return restored
+
+
+def prune(keep=DEFAULT_KEEP):
+    """Delete all but the newest keep snapshots; return the removed ids"""
+    removed = []
+    latest = latest_snapshot_id()
+    for manifest in list_snapshots()[:-keep or None]:
+        if manifest['id'] == latest:
+            continue
+        shutil.rmtree(os.path.join(SNAPSHOT_DIR, manifest['id']))
+        removed.append(manifest['id'])
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot and roll back page batches")
+    sub = parser.add_subparsers(dest='command', required=True)
+    snap = sub.add_parser('snapshot', help="Snapshot files before a batch")
+    snap.add_argument('files', nargs='+')
+    snap.add_argument('--label', help="Description stored with the snapshot")
+    sub.add_parser('list', help="List snapshots")
+    back = sub.add_parser('rollback', help="Restore the latest (or given) snapshot")
+    back.add_argument('snapshot_id', nargs='?')
+    pr = sub.add_parser('prune', help="Delete old snapshots")
+    pr.add_argument('--keep', type=int, default=DEFAULT_KEEP)
+    args = parser.parse_args()
+
+    if args.command == 'snapshot':
+        snapshot_id = snapshot(args.files, args.label)
+        print(f"📸 Snapshot {snapshot_id}: {len(args.files)} files")
+    elif args.command == 'list':
+        latest = latest_snapshot_id()
+        for manifest in list_snapshots():
+            marker = '*' if manifest['id'] == latest else ' '
+            label = f"  {manifest['label']}" if manifest.get('label') else ''
+            print(f"{marker} {manifest['id']}  {len(manifest['files'])} files{label}")
+    elif args.command == 'rollback':
+        try:
+            restored = rollback(args.snapshot_id)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        for path in restored:
+            print(f"↩️  Restored {os.path.relpath(path)}")
+        print(f"Rolled back {len(restored)} files")
+    elif args.command == 'prune':
+        removed = prune(args.keep)
+        print(f"🧹 Removed {len(removed)} snapshots")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Time the transform regexes on adversarial pages and flag super-linear ones.
+
+Every pattern the page transforms match against whole documents (and the
+transforms themselves, as registered in check_transforms.py) is timed on
+inputs built from the golden fixture pages, each at growing sizes:
+
+    unclosed_tags    the pages with every closing tag removed, repeated
+    missing_braces   the pages with every } removed, repeated
+    huge_style       one <style> block holding the pages' CSS many times over
+    long_whitespace  every line of the pages indented further at each size
+    one_line         the pages with their newlines removed, repeated
+
+The growth exponent is the slope of time against input size between the
+two largest sizes: about 1 for a linear scan and 2 or more for a pattern
+that backtracks over the rest of the document from every candidate start.
+Patterns above --threshold are flagged. Timing runs in a page_batch
+TransformWorker, so a catastrophic case is killed at --budget and flagged
+instead of hanging the audit; batch tools apply the same budget per page
+(--time-budget). Cases run one at a time so the timings do not compete.
+
+Usage:
+    python regex_audit.py                  # audit every pattern
+    python regex_audit.py -k fix_logo      # only entries matching a substring
+    python regex_audit.py --seed pages/applications/Discord.html --scales 1 2 4 8 16
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+
+import apply_complete_template
+import build_anchor_index
+import build_lazy_tables
+import check_links
+import fix_header_structure
+import fix_logo_styling
+import fix_search_containers
+import split_dark_css
+import standardize_applications
+from check_transforms import INPUT_DIR, TRANSFORMS
+from page_batch import DEFAULT_TIME_BUDGET, TransformTimeout, TransformWorker
+
+# (module, attribute, flags the transform uses it with)
+PATTERNS = [
+    (fix_header_structure, 'OLD_HEADER_PATTERN', re.DOTALL),
+    (fix_logo_styling, 'LOGO_ICON_CSS_PATTERN', re.DOTALL),
+    (fix_logo_styling, 'LOGO_HOVER_PATTERN', 0),
+    (fix_logo_styling, 'OLD_LOGO_HTML_PATTERN', 0),
+    (fix_logo_styling, 'OLD_LOGO_HTML_PATTERN2', 0),
+    (fix_search_containers, 'SEARCH_BLOCK_PATTERN', 0),
+    (fix_search_containers, 'SEARCH_PATTERN', 0),
+    (apply_complete_template, 'STYLE_PATTERN', re.DOTALL),
+    (standardize_applications, 'ROOT_PATTERN', re.DOTALL),
+    (standardize_applications, 'STYLE_OPEN_PATTERN', 0),
+    (split_dark_css, '_style_pattern', 0),
+    (split_dark_css, '_sheet_link_pattern', 0),
+    (split_dark_css, '_loader_pattern', 0),
+    (build_lazy_tables, '_lazy_body_pattern', 0),
+    (build_anchor_index, '_toc_pattern', 0),
+    (build_anchor_index, '_script_src_pattern', 0),
+    (build_anchor_index, '_script_id_pattern', 0),
+    (check_links, '_ref_pattern', 0),
+    (check_links, '_css_url_pattern', 0),
+    (check_links, '_js_path_pattern', 0),
+]
+
+DEFAULT_SCALES = (1, 2, 4, 8)
+DEFAULT_THRESHOLD = 1.5
+# Cheap cases are repeated for this long and the best run kept
+MIN_SAMPLE = 0.02
+MAX_RUNS = 50
+
+_closing_tag = re.compile(r'</[A-Za-z][^>]*>')
+_style_block = re.compile(r'(<style\b[^>]*>)(.*?)(</style>)', re.DOTALL | re.IGNORECASE)
+
+
+def unclosed_tags(seed, scale):
+    return _closing_tag.sub('', seed) * scale
+
+
+def missing_braces(seed, scale):
+    return seed.replace('}', '') * scale
+
+
+def huge_style(seed, scale):
+    css = ''.join(m.group(2) for m in _style_block.finditer(seed))
+    return f'<html><head><style>{css * scale}</style></head><body></body></html>'
+
+
+def long_whitespace(seed, scale):
+    return seed.replace('\n', '\n' + ' ' * (64 * scale))
+
+
+def one_line(seed, scale):
+    return seed.replace('\n', ' ') * scale
+
+
+GENERATORS = {
+    'unclosed_tags': unclosed_tags,
+    'missing_braces': missing_braces,
+    'huge_style': huge_style,
+    'long_whitespace': long_whitespace,
+    'one_line': one_line,
+}
+
+
+def _best_time(call):
+    best = math.inf
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        t = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - t)
+        runs += 1
+        if runs >= MAX_RUNS or time.perf_counter() - start >= MIN_SAMPLE:
+            return best
+
+
+def time_pattern(pattern, flags, text):
+    """Seconds to find every match of pattern in text (run in the worker)"""
+    compiled = re.compile(pattern, flags)
+    return _best_time(lambda: sum(1 for _ in compiled.finditer(text)))
+
+
+def time_transform(name, text):
+    """Seconds for a registered transform to process text (run in the worker)"""
+    transform = TRANSFORMS[name]
+    return _best_time(lambda: transform(text))
+
+
+def audit_entries():
+    """Yield (name, timing function, arguments before the text)"""
+    for module, attribute, flags in PATTERNS:
+        pattern = getattr(module, attribute)
+        if isinstance(pattern, re.Pattern):
+            pattern, flags = pattern.pattern, pattern.flags
+        yield f'{module.__name__}.{attribute}', time_pattern, (pattern, flags)
+    for name in TRANSFORMS:
+        yield f'transform:{name}', time_transform, (name,)
+
+
+def load_seed(paths):
+    seeds = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            seeds.append(f.read())
+    return '\n'.join(seeds)
+
+
+def growth_exponent(samples):
+    """Slope of log(time) against log(size) over the two largest samples"""
+    (size_a, time_a), (size_b, time_b) = samples[-2:]
+    if size_b <= size_a or time_a <= 0 or time_b <= 0:
+        return None
+    return math.log(time_b / time_a) / math.log(size_b / size_a)
+
+
+def measure(worker, func, args, generator, seed, scales):
+    """Return ([(size, seconds)], scale that ran past the budget or None)"""
+    samples = []
+    for scale in scales:
+        text = generator(seed, scale)
+        try:
+            samples.append((len(text), worker.run(func, *args, text)))
+        except TransformTimeout:
+            return samples, scale
+    return samples, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag transform regexes that backtrack super-linearly")
+    parser.add_argument('-k', dest='keyword', help="Only audit entries whose name contains this")
+    parser.add_argument('--seed', action='append',
+                        help="Page to build the adversarial inputs from (repeatable; default: the golden fixtures)")
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help=f"Input size multipliers (default: {' '.join(map(str, DEFAULT_SCALES))})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Growth exponent above which a pattern is flagged (default: {DEFAULT_THRESHOLD:g})")
+    parser.add_argument('--budget', type=float, default=DEFAULT_TIME_BUDGET,
+                        help=f"Seconds one case may take before it is killed (default: {DEFAULT_TIME_BUDGET:g})")
+    args = parser.parse_args()
+
+    seed_paths = args.seed or sorted(os.path.join(INPUT_DIR, f) for f in os.listdir(INPUT_DIR)
+                                     if not f.startswith('.'))
+    seed = load_seed(seed_paths)
+    scales = sorted(set(args.scales))
+    if len(scales) < 2:
+        parser.error("--scales needs at least two sizes")
+    entries = [e for e in audit_entries() if not args.keyword or args.keyword in e[0]]
+    print(f"Auditing {len(entries)} entries on {len(GENERATORS)} adversarial inputs "
+          f"from {len(seed_paths)} pages ({len(seed):,} characters), scales {' '.join(map(str, scales))}")
+    print("=" * 50)
+
+    worker = TransformWorker(args.budget)
+    flagged = 0
+    start = time.perf_counter()
+    try:
+        for name, func, func_args in entries:
+            findings = []
+            worst = None
+            for label, generator in GENERATORS.items():
+                samples, overrun = measure(worker, func, func_args, generator, seed, scales)
+                if overrun is not None:
+                    findings.append(f"{label}: ran past {args.budget:g}s at scale {overrun}")
+                    continue
+                exponent = growth_exponent(samples)
+                if exponent is None:
+                    continue
+                size, seconds = samples[-1]
+                detail = f"{label}: exponent {exponent:.2f}, {seconds * 1000:.1f} ms at {size / 1024:,.0f} KB"
+                if exponent > args.threshold:
+                    findings.append(detail)
+                elif worst is None or exponent > worst[0]:
+                    worst = (exponent, detail)
+            if findings:
+                flagged += 1
+                print(f"🐌 {name}")
+                for finding in findings:
+                    print(f"   {finding}")
+            else:
+                print(f"✅ {name}" + (f" (worst {worst[1]})" if worst else ""))
+    finally:
+        worker.close()
+
+    print("=" * 50)
+    print(f"{flagged}/{len(entries)} entries super-linear or over budget "
+          f"({time.perf_counter() - start:.1f}s)")
+    sys.exit(1 if flagged else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,6 @@
 # Script to apply Microsoft Edge header and footer to all application pages
 # This script will update all .html and .htm files with the consistent header and footer structure
 
-# Create a backup directory if it doesn't exist
-mkdir -p ./header_footer_backups
-
 # Get the header from Microsoft Edge.html
 HEADER_START_LINE=$(grep -n "<header>" "Microsoft Edge.html" | cut -d: -f1)
 HEADER_END_LINE=$(grep -n "</header>" "Microsoft Edge.html" | cut -d: -f1)
@@ -52,15 +49,17 @@ FILES=(
     "Google Chrome.html"
 )
 
+# Snapshot every target page before the batch (hard links/reflinks, no copies).
+# Undo the whole batch with: python3 page_snapshots.py rollback
+REPO_ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+python3 "$REPO_ROOT/page_snapshots.py" snapshot --label apply_header_footer "${FILES[@]}" || exit 1
+
 echo "Starting header and footer updates..."
 
 for file in "${FILES[@]}"; do
     if [ -f "$file" ]; then
         echo "Processing: $file"
         
-        # Create backup
-        cp "$file" "./header_footer_backups/${file}.backup"
-        
         # Find existing header and footer sections
         EXISTING_HEADER_START=$(grep -n "<header>" "$file" | head -1 | cut -d: -f1)
         EXISTING_HEADER_END=$(grep -n "</header>" "$file" | head -1 | cut -d: -f1)
@@ -105,7 +104,7 @@ rm -f temp_header.txt temp_footer.txt
 
 echo ""
 echo "Header and footer update completed!"
-echo "Backups saved in ./header_footer_backups/"
+echo "Snapshot saved; roll back with: python3 $REPO_ROOT/page_snapshots.py rollback"
 echo ""
 echo "Summary:"
 echo "- Applied Microsoft Edge header and footer structure to all application pages"
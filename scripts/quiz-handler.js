@@ -29,6 +29,18 @@ let quizStartTime = null;
 let timerInterval = null;
 let timeRemaining = 0;
 
+// Practice quizzes drawn from the compiled question bank (build_quiz_bank.py)
+const QUIZ_BANK_URL = '/assets/data/quiz-bank.bin';
+const QUIZ_BANK_HEAD = 4096;
+const QUIZ_BANK_HEADER_SIZE = 16;
+const QUIZ_BANK_APP_ENTRY_SIZE = 64;
+const QUIZ_BANK_INDEX_ENTRY_SIZE = 8;
+const PRACTICE_QUESTION_COUNT = 10;
+const PRACTICE_TIME_LIMIT = 600;
+const PRACTICE_PASSING_SCORE = 70;
+let quizBank = null;
+let quizBankBody = null;
+
 auth.onAuthStateChanged(async (user) => {
     if (user && user.emailVerified) {
         currentUser = user;
@@ -88,12 +100,7 @@ async function loadQuizzes() {
 
         if (error) throw error;
 
-        if (!quizzes || quizzes.length === 0) {
-            grid.innerHTML = '<div style="text-align: center; color: white; padding: 40px;"><h3>No quizzes available yet</h3></div>';
-            return;
-        }
-
-        grid.innerHTML = quizzes.map(quiz => createQuizCard(quiz)).join('');
+        grid.innerHTML = createPracticeCard() + (quizzes || []).map(quiz => createQuizCard(quiz)).join('');
     } catch (error) {
         console.error('Error loading quizzes:', error);
         grid.innerHTML = '<div style="text-align: center; color: white; padding: 40px;"><h3>Error loading quizzes</h3></div>';
@@ -131,6 +138,134 @@ function createQuizCard(quiz) {
     `;
 }
 
+function createPracticeCard() {
+    return `
+        <div class="quiz-card" onclick="startPracticeQuiz()">
+            <span class="quiz-difficulty intermediate">mixed</span>
+            <h3>Quick Practice</h3>
+            <p>${PRACTICE_QUESTION_COUNT} random questions from every application's shortcut tables.</p>
+            <div class="quiz-meta">
+                <div class="meta-item">
+                    <i class="fas fa-question-circle"></i>
+                    <span>${PRACTICE_QUESTION_COUNT} questions</span>
+                </div>
+                <div class="meta-item">
+                    <i class="fas fa-clock"></i>
+                    <span>${Math.floor(PRACTICE_TIME_LIMIT / 60)} min</span>
+                </div>
+                <div class="meta-item">
+                    <i class="fas fa-trophy"></i>
+                    <span>${PRACTICE_PASSING_SCORE}% to pass</span>
+                </div>
+            </div>
+            <button class="btn-start-quiz" onclick="event.stopPropagation(); startPracticeQuiz()">
+                Start Practice
+            </button>
+        </div>
+    `;
+}
+
+// Read bytes [start, end) of the bank. A server that ignores Range answers
+// 200 with the whole file, which is then kept and sliced for later reads.
+async function readQuizBank(start, end) {
+    if (quizBankBody) {
+        return new DataView(quizBankBody, start, Math.min(end, quizBankBody.byteLength) - start);
+    }
+    const response = await fetch(QUIZ_BANK_URL, { headers: { Range: `bytes=${start}-${end - 1}` } });
+    if (!response.ok) {
+        throw new Error(`Quiz bank request failed: ${response.status}`);
+    }
+    const buffer = await response.arrayBuffer();
+    if (response.status === 206) {
+        return new DataView(buffer);
+    }
+    quizBankBody = buffer;
+    return new DataView(buffer, start, Math.min(end, buffer.byteLength) - start);
+}
+
+async function loadQuizBank() {
+    if (quizBank) return quizBank;
+    const head = await readQuizBank(0, QUIZ_BANK_HEAD);
+    const magic = String.fromCharCode(...[0, 1, 2, 3].map(i => head.getUint8(i)));
+    if (magic !== 'SSQB' || head.getUint16(4, true) !== 1) {
+        throw new Error('Unsupported quiz bank format');
+    }
+    const appCount = head.getUint16(6, true);
+    const tableEnd = QUIZ_BANK_HEADER_SIZE + appCount * QUIZ_BANK_APP_ENTRY_SIZE;
+    const table = tableEnd <= head.byteLength ? head : await readQuizBank(0, tableEnd);
+    const decoder = new TextDecoder();
+    const apps = [];
+    for (let i = 0; i < appCount; i++) {
+        const base = QUIZ_BANK_HEADER_SIZE + i * QUIZ_BANK_APP_ENTRY_SIZE;
+        const name = new Uint8Array(table.buffer, table.byteOffset + base + 8, QUIZ_BANK_APP_ENTRY_SIZE - 8);
+        const length = name.indexOf(0) === -1 ? name.length : name.indexOf(0);
+        apps.push({
+            name: decoder.decode(name.subarray(0, length)),
+            first: table.getUint32(base, true),
+            count: table.getUint32(base + 4, true)
+        });
+    }
+    quizBank = {
+        apps,
+        questionCount: head.getUint32(8, true),
+        indexOffset: head.getUint32(12, true)
+    };
+    return quizBank;
+}
+
+async function readBankQuestion(bank, number) {
+    const entry = bank.indexOffset + number * QUIZ_BANK_INDEX_ENTRY_SIZE;
+    const index = await readQuizBank(entry, entry + QUIZ_BANK_INDEX_ENTRY_SIZE);
+    const offset = index.getUint32(0, true);
+    const record = await readQuizBank(offset, offset + index.getUint32(4, true));
+    const question = JSON.parse(new TextDecoder().decode(record));
+    // Same shape as the quiz_questions rows: options as a JSON string
+    return { ...question, options: JSON.stringify(question.options) };
+}
+
+function pickQuestionNumbers(first, count, wanted) {
+    const numbers = new Set();
+    while (numbers.size < Math.min(wanted, count)) {
+        numbers.add(first + Math.floor(Math.random() * count));
+    }
+    return [...numbers];
+}
+
+window.startPracticeQuiz = async function(appName) {
+    try {
+        const bank = await loadQuizBank();
+        const app = appName ? bank.apps.find(a => a.name === appName) : null;
+        const numbers = app
+            ? pickQuestionNumbers(app.first, app.count, PRACTICE_QUESTION_COUNT)
+            : pickQuestionNumbers(0, bank.questionCount, PRACTICE_QUESTION_COUNT);
+        const questions = await Promise.all(numbers.map(number => readBankQuestion(bank, number)));
+
+        currentQuiz = {
+            id: 'bank',
+            fromBank: true,
+            app: app ? app.name : null,
+            title: app ? `${app.name} Practice` : 'Quick Practice',
+            time_limit: PRACTICE_TIME_LIMIT,
+            passing_score: PRACTICE_PASSING_SCORE
+        };
+        currentQuestions = questions;
+        currentQuestionIndex = 0;
+        userAnswers = new Array(questions.length).fill(null);
+        quizStartTime = Date.now();
+        timeRemaining = currentQuiz.time_limit;
+
+        document.getElementById('quizListView').style.display = 'none';
+        document.getElementById('quizView').classList.add('active');
+        document.getElementById('resultsView').classList.remove('active');
+
+        startTimer();
+        displayQuestion();
+    } catch (error) {
+        console.error('Error starting practice quiz:', error);
+        alert('Failed to start practice quiz. Please try again.');
+    }
+};
+
 window.startQuiz = async function(quizId) {
     try {
         const { data: quiz, error: quizError } = await supabase
@@ -205,13 +340,24 @@ function displayQuestion() {
     const options = JSON.parse(question.options);
     const optionsList = document.getElementById('optionsList');
 
+    // Options come from the shortcut tables (backslashes, <, &), so they are
+    // set as text and picked by index rather than inlined into markup
     optionsList.innerHTML = options.map((option, index) => `
         <button class="option-btn ${userAnswers[currentQuestionIndex] === option ? 'selected' : ''}"
-                onclick="selectOption('${option.replace(/'/g, "\\'")}')">
+                data-index="${index}">
             <span style="font-weight: 600; margin-right: 8px;">${String.fromCharCode(65 + index)}.</span>
-            ${option}
+            <span class="option-label"></span>
         </button>
     `).join('');
+    optionsList.querySelectorAll('.option-label').forEach((label, index) => {
+        label.textContent = options[index];
+    });
+    optionsList.onclick = event => {
+        const button = event.target.closest('.option-btn');
+        if (button) {
+            selectOption(options[Number(button.dataset.index)]);
+        }
+    };
 
     const nextBtn = document.getElementById('nextBtn');
     if (currentQuestionIndex === currentQuestions.length - 1) {
@@ -262,7 +408,8 @@ async function submitQuiz() {
     const passed = score >= currentQuiz.passing_score;
 
     try {
-        const userId = await getCurrentUserId();
+        // Practice quizzes are not rows in the quizzes table
+        const userId = currentQuiz.fromBank ? null : await getCurrentUserId();
         if (userId) {
             await supabase
                 .from('quiz_attempts')
@@ -313,7 +460,9 @@ window.backToQuizzes = function() {
 };
 
 window.retakeQuiz = function() {
-    if (currentQuiz) {
+    if (currentQuiz && currentQuiz.fromBank) {
+        startPracticeQuiz(currentQuiz.app || undefined);
+    } else if (currentQuiz) {
         startQuiz(currentQuiz.id);
     }
 };
@@ -4,6 +4,9 @@ class ShortcutOfTheDaySystem {
         this.shortcuts = this.initializeShortcuts();
         this.storageKey = 'shortcut_sensei_daily_shortcuts';
         this.historyKey = 'shortcut_sensei_shortcut_history';
+        // Precomputed schedule from build_shortcut_schedule.py: one fixed-width record per day
+        this.scheduleUrl = year => `/assets/data/shortcut-of-the-day-${year}.jsonl`;
+        this.scheduleRecordSize = 512;
         this.currentShortcut = null;
         this.shortcutHistory = this.loadShortcutHistory();
         this.initializeToday();
@@ -428,12 +431,47 @@ class ShortcutOfTheDaySystem {
         if (storedData && storedData.date === today) {
             // Use stored shortcut for today
             this.currentShortcut = storedData.shortcut;
-        } else {
-            // Generate new shortcut for today
-            this.generateTodaysShortcut();
+            this.updateDisplay();
+            return;
         }
 
+        // Today's entry from the precomputed schedule; the built-in list is the fallback
         this.updateDisplay();
+        this.loadScheduledShortcut(new Date())
+            .catch(error => {
+                console.warn('Shortcut schedule unavailable, using built-in list:', error);
+                return null;
+            })
+            .then(shortcut => {
+                if (shortcut) {
+                    this.currentShortcut = shortcut;
+                    this.addToHistory(shortcut);
+                    this.storeTodaysShortcut();
+                } else {
+                    this.generateTodaysShortcut();
+                }
+                this.updateDisplay();
+            });
+    }
+
+    async loadScheduledShortcut(date) {
+        const size = this.scheduleRecordSize;
+        const start = (this.getDayOfYear(date) - 1) * size;
+        const response = await fetch(this.scheduleUrl(date.getFullYear()), {
+            headers: { Range: `bytes=${start}-${start + size - 1}` }
+        });
+        if (!response.ok) {
+            return null;
+        }
+
+        // 206 carries just today's record; a server that ignores Range sends the
+        // whole file, whose records are ASCII so character and byte offsets match
+        const text = await response.text();
+        const record = response.status === 206 ? text : text.slice(start, start + size);
+        const shortcut = JSON.parse(record);
+        const localDate = [date.getFullYear(), date.getMonth() + 1, date.getDate()]
+            .map(part => String(part).padStart(2, '0')).join('-');
+        return shortcut.date === localDate ? shortcut : null;
     }
 
     getTodaysStoredShortcut() {
@@ -645,6 +683,18 @@ class ShortcutOfTheDaySystem {
         // This method can be used for additional event handling if needed
     }
 
+    findShortcut(shortcutId) {
+        // Scheduled shortcuts are not in the built-in list: look at today's and the history first
+        if (this.currentShortcut && this.currentShortcut.id === shortcutId) {
+            return this.currentShortcut;
+        }
+        const historyEntry = [...this.shortcutHistory].reverse().find(entry => entry.shortcut.id === shortcutId);
+        if (historyEntry) {
+            return historyEntry.shortcut;
+        }
+        return this.shortcuts.find(s => s.id === shortcutId);
+    }
+
     learnShortcut(shortcutId) {
         this.markShortcutAsLearned(shortcutId);
         this.updateDisplay();
@@ -659,7 +709,7 @@ class ShortcutOfTheDaySystem {
         }
 
         if (window.badgeSystem) {
-            const shortcut = this.shortcuts.find(s => s.id === shortcutId);
+            const shortcut = this.findShortcut(shortcutId);
             if (shortcut) {
                 window.badgeSystem.updateProgress('shortcuts_learned', {
                     app: shortcut.application.toLowerCase()
@@ -683,7 +733,7 @@ class ShortcutOfTheDaySystem {
     }
 
     shareShortcut(shortcutId) {
-        const shortcut = this.shortcuts.find(s => s.id === shortcutId);
+        const shortcut = this.findShortcut(shortcutId);
         if (!shortcut) return;
 
         const shareText = `💡 Today's shortcut tip: ${shortcut.combination} - ${shortcut.description} in ${shortcut.application}. ${shortcut.tip} #ShortcutSensei`;
@@ -708,7 +758,7 @@ class ShortcutOfTheDaySystem {
     }
 
     showShortcutDetails(shortcutId) {
-        const shortcut = this.shortcuts.find(s => s.id === shortcutId);
+        const shortcut = this.findShortcut(shortcutId);
         if (!shortcut) return;
 
         const modal = this.createShortcutDetailsModal(shortcut);
@@ -868,7 +918,7 @@ class ShortcutOfTheDaySystem {
     }
 
     getShortcutById(id) {
-        return this.shortcuts.find(s => s.id === id);
+        return this.findShortcut(id);
     }
 
     getAllShortcuts() {
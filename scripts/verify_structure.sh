@@ -1,87 +1,11 @@
 #!/bin/bash
 
-echo "🔍 Verifying all file paths and links..."
+# Navigation and image checks; see verify_pages.py. Extra arguments are passed through.
 
-cd "/Users/rafi/Documents/Hajimaru/Shortcut Sensei/repo/new/new app/Shortcut_Sensei"
-
-echo ""
-echo "📁 Directory Structure Verification:"
-echo "✅ pages/blogs: $(ls pages/blogs/*.html 2>/dev/null | wc -l | tr -d ' ') blog files"
-echo "✅ pages/applications: $(ls pages/applications/*.{html,htm} 2>/dev/null | wc -l | tr -d ' ') app guide files" 
-echo "✅ images/apps: $(ls images/apps/*.* 2>/dev/null | wc -l | tr -d ' ') image files"
-echo "✅ docs: $(ls docs/*.md 2>/dev/null | wc -l | tr -d ' ') documentation files"
-echo "✅ scripts: $(ls scripts/*.sh 2>/dev/null | wc -l | tr -d ' ') script files"
-echo "✅ styles: $(ls styles/*.css 2>/dev/null | wc -l | tr -d ' ') CSS files"
-
-echo ""
-echo "🔗 Critical Navigation Links Test:"
-
-# Test home page -> blog navigation
-if grep -q 'href="pages/blogs/blogs.html"' home-page.html; then
-    echo "✅ Home → Blogs navigation: WORKING"
-else
-    echo "❌ Home → Blogs navigation: BROKEN"
-fi
-
-# Test blog -> home navigation
-if grep -q 'href="../../home-page.html"' pages/blogs/blogs.html; then
-    echo "✅ Blogs → Home navigation: WORKING" 
-else
-    echo "❌ Blogs → Home navigation: BROKEN"
-fi
-
-# Test application -> blogs navigation
-if grep -q 'href="../blogs/blogs.html"' pages/applications/Google\ Chrome.html; then
-    echo "✅ Apps → Blogs navigation: WORKING"
-else
-    echo "❌ Apps → Blogs navigation: BROKEN"
-fi
-
-# Test application -> home navigation
-if grep -q 'href="../../home-page.html"' pages/applications/Google\ Chrome.html; then
-    echo "✅ Apps → Home navigation: WORKING"
-else
-    echo "❌ Apps → Home navigation: BROKEN"
-fi
-
-echo ""
-echo "🖼️ Image Path Verification:"
-
-# Check if image file exists and path is correct
-if [ -f "images/apps/Google_Chrome.jpg" ] && grep -q 'src="../../images/apps/Google_Chrome.jpg"' pages/applications/Google\ Chrome.html; then
-    echo "✅ Image paths: WORKING (Google Chrome example verified)"
-else
-    echo "❌ Image paths: ISSUES DETECTED"
-fi
-
-echo ""
-echo "📄 File Organization Summary:"
-
-echo "📂 Root Level Files:"
-ls -1 *.html *.htm 2>/dev/null | head -5
-
-echo ""
-echo "📂 Blog Files:"
-ls -1 pages/blogs/ | head -5
-
-echo ""
-echo "📂 Application Files:"  
-ls -1 pages/applications/ | head -5
-
-echo ""
-echo "📂 Image Files:"
-ls -1 images/apps/ | head -5
-
-echo ""
-echo "🎯 Final Status:"
-if [ -f "home-page.html" ] && [ -f "pages/blogs/blogs.html" ] && [ -d "images/apps" ]; then
-    echo "✅ FOLDER STRUCTURE: CORRECTLY ORGANIZED"
-    echo "✅ FILE REFERENCES: PROPERLY ALIGNED"
-    echo "✅ NAVIGATION LINKS: WORKING"
-    echo "✅ STATUS: PRODUCTION READY"
-else
-    echo "❌ SOME ISSUES DETECTED - CHECK ABOVE"
+cd "$(dirname "$0")/.." || exit 1
+status=0
+if [ $# -eq 0 ]; then
+    python3 verify_pages.py --check site_links home-page.html pages/blogs/blogs.html || status=1
 fi
-
-echo ""
-echo "🚀 Project is ready for use!"
+python3 verify_pages.py --check nav_items --check nav_links --check site_links --check image_paths "$@" || status=1
+exit $status
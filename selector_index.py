@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Persistent selector-to-page index for the page tools.
+
+Maps markers found in each page to the pages that contain them, so a
+transform can ask for its candidate pages instead of opening every file.
+Markers are:
+
+    .name                     a class used in markup or in a CSS selector
+    #name                     an id used in markup or in a CSS selector
+    css:<selector>            a full selector from an inline <style> block
+    <header>                  a key structural tag without a class attribute
+    <header class="x y">      the same tag with its exact class attribute
+    data-category=value       a data-category attribute value
+
+The index lives in .page_index.json and is refreshed incrementally: pages
+whose size and mtime are unchanged are not opened, and pages whose content
+hash is unchanged are not re-scanned.
+
+Usage:
+    python selector_index.py MARKER [MARKER...] [--dir pages/applications]
+    python selector_index.py --stats
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+
+from page_corpus import find_pages, read_page
+
+INDEX_FILE = '.page_index.json'
+INDEX_VERSION = 1
+
+# Tags whose bare vs classed form is tracked as a marker
+KEY_TAGS = {'header', 'nav', 'footer', 'main', 'section', 'table', 'style', 'script', 'form'}
+
+_tag_pattern = re.compile(r'<([a-zA-Z][\w-]*)(\s[^>]*)?>')
+_attr_pattern = re.compile(r'(?<![\w:-])([\w:-]+)\s*=\s*(?:"([^"]*)"|\'([^\']*)\')')
+_style_pattern = re.compile(r'<style[^>]*>(.*?)</style>', re.DOTALL | re.IGNORECASE)
+_css_comment_pattern = re.compile(r'/\*.*?\*/', re.DOTALL)
+_brace_pattern = re.compile(r'([{}])')
+_selector_token_pattern = re.compile(r'([.#])(-?[_a-zA-Z][\w-]*)')
+_whitespace = re.compile(r'\s+')
+
+
+def extract_markers(content):
+    """Return the sorted list of markers found in a page"""
+    markers = set()
+
+    for match in _tag_pattern.finditer(content):
+        tag = match.group(1).lower()
+        attrs = {name.lower(): dq if dq is not None else sq
+                 for name, dq, sq in _attr_pattern.findall(match.group(2) or '')}
+        classes = attrs.get('class')
+        if tag in KEY_TAGS:
+            markers.add(f'<{tag} class="{classes}">' if classes is not None else f'<{tag}>')
+        if classes:
+            markers.update('.' + c for c in classes.split())
+        if attrs.get('id'):
+            markers.add('#' + attrs['id'])
+        if 'data-category' in attrs:
+            markers.add('data-category=' + attrs['data-category'])
+
+    for css in _style_pattern.findall(content):
+        css = _css_comment_pattern.sub('', css)
+        # Split on braces rather than matching "selector {" so a huge block
+        # without braces stays linear
+        parts = _brace_pattern.split(css)
+        for i in range(0, len(parts) - 1, 2):
+            if parts[i + 1] != '{':
+                continue
+            selector_list = _whitespace.sub(' ', parts[i]).strip()
+            if not selector_list or selector_list.startswith('@'):
+                continue
+            for selector in selector_list.split(','):
+                selector = selector.strip()
+                if selector:
+                    markers.add('css:' + selector)
+            for prefix, name in _selector_token_pattern.findall(selector_list):
+                markers.add(prefix + name)
+
+    return sorted(markers)
+
+
+class PageIndex:
+    """Incrementally maintained marker -> pages index"""
+
+    def __init__(self, index_file=INDEX_FILE, root='.'):
+        self.index_file = index_file
+        self.root = root
+        self.pages = {}
+        self.dirty = False
+        self._postings = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.pages = data.get('pages', {})
+
+    def save(self):
+        """Write the index back if anything changed"""
+        if not self.dirty:
+            return
+        tmp_file = self.index_file + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'pages': self.pages}, f, separators=(',', ':'))
+        os.replace(tmp_file, self.index_file)
+        self.dirty = False
+
+    def refresh(self, paths=None):
+        """Bring the index up to date; return the number of re-scanned pages"""
+        paths = find_pages(self.root) if paths is None else paths
+        rescanned = 0
+        seen = set()
+
+        for path in paths:
+            seen.add(path)
+            try:
+                st = os.stat(os.path.join(self.root, path))
+            except OSError:
+                continue
+            entry = self.pages.get(path)
+            if entry and entry['mtime_ns'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                continue
+
+            content = read_page(os.path.join(self.root, path))
+            digest = hashlib.sha1(content.encode('utf-8')).hexdigest()
+            if entry and entry['sha1'] == digest:
+                entry.update(mtime_ns=st.st_mtime_ns, size=st.st_size)
+            else:
+                self.pages[path] = {
+                    'mtime_ns': st.st_mtime_ns,
+                    'size': st.st_size,
+                    'sha1': digest,
+                    'markers': extract_markers(content),
+                }
+                rescanned += 1
+                self._postings = None
+            self.dirty = True
+
+        for path in list(self.pages):
+            if path not in seen and not os.path.exists(os.path.join(self.root, path)):
+                del self.pages[path]
+                self._postings = None
+                self.dirty = True
+
+        return rescanned
+
+    def pages_with(self, marker):
+        """Return the set of indexed pages containing a marker"""
+        if self._postings is None:
+            self._postings = {}
+            for path, entry in self.pages.items():
+                for m in entry['markers']:
+                    self._postings.setdefault(m, set()).add(path)
+        return self._postings.get(marker, set())
+
+    def candidates(self, *markers, directory=None):
+        """Return the sorted pages containing any of the markers"""
+        found = set()
+        for marker in markers:
+            found |= self.pages_with(marker)
+        if directory is not None:
+            prefix = os.path.normpath(directory) + os.sep
+            found = {p for p in found if p.startswith(prefix)}
+        return sorted(found)
+
+
+def candidates(*markers, directory=None):
+    """Refresh the on-disk index and return the pages containing any marker"""
+    index = PageIndex()
+    index.refresh()
+    index.save()
+    return index.candidates(*markers, directory=directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query the selector-to-page index")
+    parser.add_argument('markers', nargs='*', help="Markers such as .logo-icon, '<header>' or data-category=general")
+    parser.add_argument('--dir', help="Only list pages under this directory")
+    parser.add_argument('--rebuild', action='store_true', help="Discard the index and re-scan every page")
+    parser.add_argument('--stats', action='store_true', help="Print index statistics")
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(INDEX_FILE):
+        os.remove(INDEX_FILE)
+
+    index = PageIndex()
+    rescanned = index.refresh()
+    index.save()
+
+    if args.stats or not args.markers:
+        markers = {m for entry in index.pages.values() for m in entry['markers']}
+        print(f"📇 {len(index.pages)} pages indexed, {len(markers)} distinct markers, "
+              f"{rescanned} re-scanned this run")
+
+    for path in index.candidates(*args.markers, directory=args.dir) if args.markers else []:
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+Serve the site locally the way Firebase Hosting serves it.
+
+server.js needs the whole Express stack and answers / with its API, so it
+says little about how the deployed pages load. This server reads
+firebase.json (see hosting_config.py) and, like Hosting:
+
+    - serves files from the public directory, except ignored ones, with
+      /dir/ answered by dir/index.html
+    - applies redirects, then rewrites for paths no file matches, then
+      404.html
+    - sends the configured headers, and Cache-Control: max-age=3600 where
+      none is configured
+
+Responses carry a strong ETag (a hash of the bytes sent), so a client
+revalidating with If-None-Match gets a 304. A file with a .br or .gz
+sidecar next to it is sent precompressed when Accept-Encoding allows it;
+other text files are gzipped on the fly, as Hosting compresses them, and
+the result is cached (--no-compress turns that off). Byte ranges
+(Range, If-Range) are served from the uncompressed file, one range per
+request. HEAD works for every GET.
+
+Connections are HTTP/1.1 keep-alive (pipelined requests are answered in
+order) on one asyncio event loop. Small files are kept in memory, larger
+ones are streamed from a thread, so thousands of concurrent connections
+cost a socket each.
+
+Usage:
+    python serve_site.py [--port 8080] [--host 127.0.0.1] [--config firebase.json] [--log]
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import mimetypes
+import os
+import signal
+import sys
+import time
+from collections import OrderedDict
+from email.utils import formatdate
+from urllib.parse import unquote, urlsplit
+
+from hosting_config import CONFIG_FILE, HostingConfig
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8080
+
+KEEPALIVE_TIMEOUT = 15
+MAX_HEADER_BYTES = 16384
+BACKLOG = 4096
+STREAM_CHUNK = 65536
+
+# Files up to this size are kept in memory, up to CACHE_BYTES in total
+MAX_CACHED_FILE = 1048576
+CACHE_BYTES = 64 * 1048576
+
+# Sidecar suffixes, in order of preference
+SIDECARS = (('br', '.br'), ('gzip', '.gz'))
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'application/xml',
+                      'image/svg+xml')
+MIN_COMPRESS_BYTES = 1024
+
+REASONS = {200: 'OK', 206: 'Partial Content', 301: 'Moved Permanently', 302: 'Found',
+           304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           416: 'Range Not Satisfiable', 431: 'Request Header Fields Too Large',
+           500: 'Internal Server Error', 501: 'Not Implemented'}
+
+
+def content_type(path):
+    kind = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    if kind.startswith('text/') or kind in ('application/javascript', 'application/json', 'application/xml'):
+        kind += '; charset=utf-8'
+    return kind
+
+
+def is_compressible(kind):
+    return kind.startswith(COMPRESSIBLE_TYPES)
+
+
+def accepted_encodings(header):
+    """Codings of an Accept-Encoding header with a non-zero q value"""
+    accepted = set()
+    for item in (header or '').split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+def parse_range(header, size):
+    """Return (start, end) inclusive for a single-range Range header, None to ignore it, or 'invalid'"""
+    unit, _, spec = (header or '').partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        # Multiple ranges are answered with the whole file, which RFC 9110 allows
+        return None
+    first, dash, last = spec.strip().partition('-')
+    if not dash:
+        return None
+    try:
+        if not first:
+            length = int(last)
+            if length <= 0:
+                return 'invalid'
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return 'invalid'
+    return start, min(end, size - 1)
+
+
+def etag_matches(header, etag):
+    """If-None-Match comparison (weak, as RFC 9110 asks for it)"""
+    if header.strip() == '*':
+        return True
+    tags = [tag.strip() for tag in header.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in tags)
+
+
+class Representation:
+    """One file as sent: its bytes (or path, when too large to keep), ETag and coding"""
+
+    def __init__(self, path, size, etag, coding=None, data=None):
+        self.path = path
+        self.size = size
+        self.etag = etag
+        self.coding = coding
+        self.data = data
+        # (size, mtime) of the file it was made from
+        self.key = None
+
+
+class FileCache:
+    """ETags and small file contents, checked against each file's size and mtime"""
+
+    def __init__(self, compress=True):
+        self.compress = compress
+        self.entries = OrderedDict()
+        self.cached_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self, path, key, coding):
+        digest = hashlib.sha1()
+        data = None
+        with open(path, 'rb') as f:
+            if key[0] <= MAX_CACHED_FILE:
+                data = f.read()
+                digest.update(data)
+            else:
+                for chunk in iter(lambda: f.read(STREAM_CHUNK), b''):
+                    digest.update(chunk)
+        # Each coding of a file is a different representation with its own ETag
+        suffix = f'-{coding}' if coding else ''
+        return Representation(path, key[0], f'"{digest.hexdigest()[:20]}{suffix}"', coding, data)
+
+    def _gzip(self, entry):
+        data = gzip.compress(entry.data, compresslevel=6, mtime=0)
+        return Representation(entry.path, len(data), entry.etag[:-1] + '-gzip"', 'gzip', data)
+
+    def _store(self, cache_key, entry):
+        old = self.entries.pop(cache_key, None)
+        if old is not None and old.data is not None:
+            self.cached_bytes -= len(old.data)
+        self.entries[cache_key] = entry
+        if entry.data is None:
+            return
+        self.cached_bytes += len(entry.data)
+        while self.cached_bytes > CACHE_BYTES and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            if old.data is not None:
+                self.cached_bytes -= len(old.data)
+
+    async def get(self, path, coding=None, compress=False):
+        """The representation of a file: as it is (coding names a sidecar's) or gzipped on the fly"""
+        stat = os.stat(path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        cache_key = (path, compress)
+        entry = self.entries.get(cache_key)
+        if entry is not None and entry.key == key:
+            self.entries.move_to_end(cache_key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        loop = asyncio.get_running_loop()
+        if not compress:
+            entry = await loop.run_in_executor(None, self._load, path, key, coding)
+        else:
+            identity = await self.get(path)
+            entry = await loop.run_in_executor(None, self._gzip, identity)
+        entry.key = key
+        self._store(cache_key, entry)
+        return entry
+
+    async def select(self, path, accept_encoding, ranged):
+        """Pick the representation to send: sidecar, on-the-fly gzip or the file itself"""
+        if ranged:
+            return await self.get(path), False
+        accepted = accepted_encodings(accept_encoding)
+        negotiable = False
+        for coding, suffix in SIDECARS:
+            if os.path.isfile(path + suffix):
+                negotiable = True
+                if coding in accepted:
+                    return await self.get(path + suffix, coding), True
+        identity = await self.get(path)
+        if self.compress and identity.data is not None and identity.size >= MIN_COMPRESS_BYTES \
+                and is_compressible(content_type(path)):
+            if 'gzip' in accepted:
+                return await self.get(path, compress=True), True
+            negotiable = True
+        return identity, negotiable
+
+
+class SiteServer:
+    """Firebase Hosting's request handling over asyncio streams"""
+
+    def __init__(self, config, compress=True, log=False):
+        self.config = config
+        self.files = FileCache(compress)
+        self.log = log
+        self.connections = 0
+        self.requests = 0
+        self.writers = set()
+
+    def resolve(self, path):
+        """The public file a request path names, or None"""
+        relpath = os.path.normpath(path.lstrip('/')) if path.strip('/') else ''
+        if relpath.startswith('..') or os.path.isabs(relpath) or '\0' in relpath:
+            return None
+        candidates = [relpath, os.path.join(relpath, 'index.html')]
+        if self.config.clean_urls and not os.path.splitext(relpath)[1]:
+            candidates.insert(1, relpath + '.html')
+        for candidate in candidates:
+            if not candidate or self.config.is_ignored(candidate):
+                continue
+            file_path = os.path.join(self.config.public, candidate)
+            if os.path.isfile(file_path):
+                return file_path
+        return None
+
+    def route(self, path):
+        """Return (status, file path or None, redirect location or None) for a request path"""
+        redirect = self.config.redirect(path)
+        if redirect:
+            return redirect[0], None, redirect[1]
+        file_path = self.resolve(path)
+        if file_path:
+            return 200, file_path, None
+        rule = self.config.rewrite(path)
+        if rule is not None:
+            if 'destination' not in rule:
+                # Function and Cloud Run rewrites have no local stand-in
+                return 501, None, None
+            file_path = self.resolve(rule['destination'])
+            if file_path:
+                return 200, file_path, None
+        return 404, self.resolve('/404.html'), None
+
+    async def respond(self, writer, method, target, headers, connection=None):
+        """Write one response; return (status, bytes of body sent, coding)"""
+        path = unquote(urlsplit(target).path)
+        extra = self.config.headers_for(path)
+        if connection:
+            extra.append(('Connection', connection))
+        if method not in ('GET', 'HEAD'):
+            return await self.send(writer, method, 405, [('Allow', 'GET, HEAD')] + extra, b'Method Not Allowed\n')
+        if not path.startswith('/'):
+            return await self.send(writer, method, 400, extra, b'Bad Request\n')
+
+        status, file_path, location = self.route(path)
+        if location is not None:
+            return await self.send(writer, method, status, [('Location', location)] + extra, b'')
+        if file_path is None:
+            body = REASONS[status].encode() + b'\n'
+            return await self.send(writer, method, status, extra, body)
+
+        range_header = headers.get('range') if status == 200 else None
+        if range_header and 'if-range' in headers:
+            identity = await self.files.get(file_path)
+            if headers['if-range'].strip() != identity.etag:
+                range_header = None
+        entry, negotiable = await self.files.select(file_path, headers.get('accept-encoding'), bool(range_header))
+
+        response = [('Content-Type', content_type(file_path)), ('ETag', entry.etag), ('Accept-Ranges', 'bytes')]
+        if negotiable:
+            response.append(('Vary', 'Accept-Encoding'))
+        if entry.coding:
+            response.append(('Content-Encoding', entry.coding))
+        response += extra
+
+        if status == 200 and 'if-none-match' in headers and etag_matches(headers['if-none-match'], entry.etag):
+            return await self.send(writer, method, 304, response, b'', entry.coding)
+
+        start, end = 0, entry.size - 1
+        if range_header:
+            byte_range = parse_range(range_header, entry.size)
+            if byte_range == 'invalid':
+                response = [('Content-Range', f'bytes */{entry.size}')] + extra
+                return await self.send(writer, method, 416, response, b'')
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                response.append(('Content-Range', f'bytes {start}-{end}/{entry.size}'))
+        return await self.send(writer, method, status, response, entry, entry.coding, start, end)
+
+    async def send(self, writer, method, status, headers, body, coding=None, start=0, end=None):
+        if isinstance(body, Representation):
+            length = end - start + 1 if body.size else 0
+        else:
+            length = len(body)
+        lines = [f'HTTP/1.1 {status} {REASONS.get(status, "")}', f'Date: {formatdate(usegmt=True)}',
+                 f'Content-Length: {length if status != 304 else 0}']
+        if status == 304:
+            lines[-1:] = []
+        lines += [f'{key}: {value}' for key, value in headers]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        sent = 0
+        if method != 'HEAD' and status != 304:
+            if not isinstance(body, Representation):
+                writer.write(body)
+                sent = len(body)
+            elif body.data is not None:
+                writer.write(body.data[start:end + 1])
+                sent = length
+            else:
+                sent = await self.stream_file(writer, body.path, start, length)
+        await writer.drain()
+        return status, sent, coding
+
+    async def stream_file(self, writer, path, start, length):
+        loop = asyncio.get_running_loop()
+        with open(path, 'rb') as f:
+            f.seek(start)
+            remaining = length
+            while remaining > 0:
+                chunk = await loop.run_in_executor(None, f.read, min(STREAM_CHUNK, remaining))
+                if not chunk:
+                    break
+                writer.write(chunk)
+                remaining -= len(chunk)
+                await writer.drain()
+        return length - remaining
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.writers.add(writer)
+        peer = writer.get_extra_info('peername')
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 'GET', 431, [('Connection', 'close')], b'')
+                    return
+                try:
+                    request_line, *header_lines = head.decode('latin-1').split('\r\n')
+                    method, target, version = request_line.split(' ')
+                except ValueError:
+                    await self.send(writer, 'GET', 400, [('Connection', 'close')], b'Bad Request\n')
+                    return
+                headers = {}
+                for line in header_lines:
+                    if ':' in line:
+                        key, _, value = line.partition(':')
+                        headers[key.strip().lower()] = value.strip()
+                connection = headers.get('connection', '').lower()
+                keep_alive = 'close' not in connection if version == 'HTTP/1.1' else 'keep-alive' in connection
+                if 'transfer-encoding' in headers:
+                    keep_alive = False
+                elif headers.get('content-length', '0').isdigit() and int(headers.get('content-length', '0')):
+                    await reader.readexactly(int(headers['content-length']))
+
+                self.requests += 1
+                started = time.perf_counter()
+                connection = 'close' if not keep_alive else 'keep-alive' if version != 'HTTP/1.1' else None
+                try:
+                    status, sent, coding = await self.respond(writer, method, target, headers, connection)
+                except OSError as e:
+                    print(f"❌ {target}: {e}", file=sys.stderr)
+                    return
+                if self.log:
+                    elapsed = (time.perf_counter() - started) * 1000
+                    print(f'{peer[0] if peer else "-"} "{request_line}" {status} {sent} '
+                          f'{coding or "identity"} {elapsed:.1f}ms')
+                if not keep_alive:
+                    return
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+
+    async def close(self):
+        """Close every connection, idle keep-alive ones included, and let their handlers finish"""
+        writers = list(self.writers)
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except (ConnectionError, OSError):
+                pass
+        # The handlers see end of stream and return
+        await asyncio.sleep(0)
+
+
+def raise_open_file_limit():
+    """Allow as many open sockets as the hard limit does; return the soft limit"""
+    if resource is None:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard == resource.RLIM_INFINITY or hard > soft:
+        target = hard if hard != resource.RLIM_INFINITY else max(soft, 65536)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+            soft = target
+        except (ValueError, OSError):
+            pass
+    return soft
+
+
+async def serve(config, host, port, compress=True, log=False):
+    site = SiteServer(config, compress, log)
+    server = await asyncio.start_server(site.handle, host, port, backlog=BACKLOG, limit=MAX_HEADER_BYTES)
+    address = server.sockets[0].getsockname()
+    print(f"🌐 Serving {config.public} on http://{address[0]}:{address[1]}/")
+    print(f"{len(config.rewrites)} rewrites, {len(config.redirects)} redirects, "
+          f"{len(config.headers)} header rules, {len(config.ignore)} ignore globs")
+    print("=" * 50)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stop.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Windows: Ctrl-C still ends asyncio.run()
+    try:
+        async with server:
+            await stop.wait()
+            server.close()
+            await site.close()
+    finally:
+        print("=" * 50)
+        print(f"{site.requests} requests on {site.connections} connections, "
+              f"{site.files.hits} cache hits, {site.files.misses} misses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the site the way Firebase Hosting does")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"Address to listen on (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT})")
+    parser.add_argument('--config', default=CONFIG_FILE, help=f"Hosting config (default: {CONFIG_FILE})")
+    parser.add_argument('--no-compress', action='store_true',
+                        help="Only send precompressed sidecars, never gzip on the fly")
+    parser.add_argument('--log', action='store_true', help="Print a line per request")
+    args = parser.parse_args()
+
+    config = HostingConfig.load(args.config)
+    limit = raise_open_file_limit()
+    if limit is not None:
+        print(f"📂 Open file limit: {limit}")
+    try:
+        asyncio.run(serve(config, args.host, args.port, not args.no_compress, args.log))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Extract the shortcut tables from the application pages.
+
+Every table row with a key combination and a description becomes one
+shortcut record:
+
+    id            stable id (application slug + hash of combination/description)
+    application   application name from the page <title>
+    page          page path relative to the repository root
+    section       the section heading above the table
+    section_id    that heading's id, for linking to #section_id
+    category      coarse category derived from the section heading
+    difficulty    beginner / intermediate / advanced, from the key count
+    combination   normalized key combination, e.g. "Ctrl + Shift + N"
+    description   what the shortcut does
+
+Rows are read through the pre-parsed page cache, so only the row spans are
+decoded. Table bodies moved out of the page by build_lazy_tables.py are
+read from their fragment files. The same shortcut appearing on two copies
+of a page (e.g. Discord.html and Discord_old.html) is kept once.
+
+Usage:
+    python shortcut_tables.py [--json] [paths...]
+"""
+
+import argparse
+import bisect
+import hashlib
+import html
+import json
+import os
+import re
+from urllib.parse import unquote
+
+from page_cache import load_page
+from template_drift import application_pages
+
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+# Section heading word prefixes; the first matching category wins
+CATEGORY_KEYWORDS = (
+    ('formatting', ('format', 'style', 'font', 'paragraph', 'align')),
+    ('search', ('search', 'find')),
+    ('communication', ('messag', 'chat', 'call', 'voice', 'meeting', 'mail', 'emoji', 'reaction',
+                       'notification', 'channel', 'contact', 'server', 'role')),
+    ('media', ('play', 'audio', 'video', 'media', 'volume', 'record', 'subtitle')),
+    ('files', ('file', 'folder', 'archive', 'document', 'save', 'attachment')),
+    ('editing', ('edit', 'text', 'select', 'clipboard', 'input', 'cursor', 'cell', 'draw', 'tool', 'brush')),
+    ('navigation', ('navigat', 'move', 'jump', 'scroll', 'tab', 'window', 'switch', 'slide')),
+    ('view', ('view', 'zoom', 'display', 'screen', 'interface', 'layout', 'panel')),
+)
+DEFAULT_CATEGORY = 'general'
+_category_patterns = [(category, re.compile(r'\b(?:' + '|'.join(words) + ')'))
+                      for category, words in CATEGORY_KEYWORDS]
+
+_cell_pattern = re.compile(rb'<t([dh])\b[^>]*>(.*?)</t[dh]>', re.DOTALL | re.IGNORECASE)
+_tag_pattern = re.compile(r'<[^>]+>')
+_plus_pattern = re.compile(r'\s*\+\s*')
+_title_pattern = re.compile(rb'<title>(.*?)</title>', re.DOTALL | re.IGNORECASE)
+_title_suffix = re.compile(r'\s+Shortcuts\b.*$', re.IGNORECASE)
+_alternative_pattern = re.compile(r', | or ', re.IGNORECASE)
+_sequence_pattern = re.compile(r',| then ', re.IGNORECASE)
+
+
+def cell_text(fragment):
+    """Plain text of a table cell, with key separators normalized"""
+    text = html.unescape(_tag_pattern.sub(' ', fragment))
+    return _plus_pattern.sub(' + ', ' '.join(text.split()))
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def category_for(section):
+    """Map a section heading to one of the coarse categories"""
+    heading = section.lower()
+    for category, pattern in _category_patterns:
+        if pattern.search(heading):
+            return category
+    return DEFAULT_CATEGORY
+
+
+def _key_score(combination):
+    if _sequence_pattern.search(combination):
+        return 2
+    return min(max(len(combination.split(' + ')) - 2, 0), 2)
+
+
+def difficulty_for(combination):
+    """1-2 keys is beginner, 3 keys intermediate, 4+ keys or a key sequence advanced
+
+    A cell listing alternatives ("Ctrl + Shift + R or Shift + F5") is scored
+    by its easiest one.
+    """
+    return DIFFICULTIES[min(_key_score(alternative) for alternative in _alternative_pattern.split(combination))]
+
+
+def shortcut_id(application, combination, description):
+    digest = hashlib.sha1(f'{combination}\0{description}'.encode('utf-8')).hexdigest()[:8]
+    return f'{slugify(application)}-{digest}'
+
+
+def application_name(page):
+    match = _title_pattern.search(bytes(page.data[:4096]))
+    if not match:
+        return os.path.splitext(os.path.basename(page.path))[0].replace('_', ' ')
+    title = html.unescape(match.group(1).decode('utf-8', 'replace'))
+    return _title_suffix.sub('', ' '.join(title.split())).replace('_', ' ')
+
+
+def row_shortcut(data, start, end):
+    """Return (combination, description) for a shortcut row, or None"""
+    cells = _cell_pattern.findall(bytes(data[start:end]))
+    if len(cells) < 2 or cells[0][0].lower() != b'd':
+        return None
+    combination = cell_text(cells[0][1].decode('utf-8', 'replace'))
+    description = cell_text(cells[1][1].decode('utf-8', 'replace'))
+    if not combination or not description:
+        return None
+    return combination, description
+
+
+def _headings(page):
+    """Return ([start offsets], [(text, id)]) for the page's h2 headings"""
+    starts, headings = [], []
+    closes = {}
+    for index, start, end in page.iter_tags('h2', closing=True):
+        closes[start] = index
+    close_starts = sorted(closes)
+    for index, start, end in page.iter_tags('h2'):
+        position = bisect.bisect_left(close_starts, end)
+        close = close_starts[position] if position < len(close_starts) else end
+        starts.append(start)
+        headings.append((cell_text(page.text(end, close)), page.tag_attrs(index).get('id', '')))
+    return starts, headings
+
+
+def table_sections(page):
+    """Return (table start offsets, [(section, section_id)]) for the page's tables"""
+    heading_starts, headings = _headings(page)
+    table_starts = [start for _, start, _ in page.iter_tags('table')]
+    sections = []
+    for table_start in table_starts:
+        position = bisect.bisect_right(heading_starts, table_start) - 1
+        sections.append(headings[position] if position >= 0 else ('', ''))
+    return table_starts, sections
+
+
+def fragment_path(page_path, source):
+    """File a lazy table body's data-lazy-src points at"""
+    return os.path.normpath(os.path.join(os.path.dirname(page_path), unquote(html.unescape(source))))
+
+
+def _table_rows(path, page, table_starts):
+    """Return (table ordinal, combination, description) for every shortcut row, in page order
+
+    A lazy table body (data-lazy-src) holds a placeholder row; its rows are
+    read from the fragment file it points at.
+    """
+    rows = []
+    for ordinal, start, end in page.iter_rows():
+        row = row_shortcut(page.data, start, end)
+        if row:
+            rows.append((start, 0, ordinal) + row)
+    for index, start, end in page.iter_tags('tbody'):
+        source = page.tag_attrs(index).get('data-lazy-src')
+        if not source:
+            continue
+        ordinal = bisect.bisect_right(table_starts, start) - 1
+        with load_page(fragment_path(path, source)) as fragment:
+            for number, (_, row_start, row_end) in enumerate(fragment.iter_rows(), 1):
+                row = row_shortcut(fragment.data, row_start, row_end)
+                if row:
+                    rows.append((start, number, ordinal) + row)
+    return [row[2:] for row in sorted(rows)]
+
+
+def extract_shortcuts(path):
+    """Return the shortcut records in one application page"""
+    with load_page(path) as page:
+        application = application_name(page)
+        table_starts, sections = table_sections(page)
+
+        shortcuts = []
+        for ordinal, combination, description in _table_rows(path, page, table_starts):
+            section, section_id = sections[ordinal] if 0 <= ordinal < len(sections) else ('', '')
+            shortcuts.append({
+                'id': shortcut_id(application, combination, description),
+                'application': application,
+                'page': path,
+                'section': section,
+                'section_id': section_id,
+                'category': category_for(section),
+                'difficulty': difficulty_for(combination),
+                'combination': combination,
+                'description': description,
+            })
+    return shortcuts
+
+
+def load_shortcuts(paths=None):
+    """Return every shortcut in the application pages, without duplicates"""
+    seen = set()
+    shortcuts = []
+    for path in paths or application_pages():
+        for shortcut in extract_shortcuts(path):
+            if shortcut['id'] not in seen:
+                seen.add(shortcut['id'])
+                shortcuts.append(shortcut)
+    return shortcuts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract shortcuts from the application pages")
+    parser.add_argument('paths', nargs='*', help="Pages to read (default: all application pages)")
+    parser.add_argument('--json', action='store_true', help="Print the shortcut records")
+    args = parser.parse_args()
+
+    shortcuts = load_shortcuts(args.paths)
+    if args.json:
+        print(json.dumps(shortcuts, indent=2, ensure_ascii=False))
+        return
+
+    by_app, by_category, by_difficulty = {}, {}, {}
+    for shortcut in shortcuts:
+        by_app[shortcut['application']] = by_app.get(shortcut['application'], 0) + 1
+        by_category[shortcut['category']] = by_category.get(shortcut['category'], 0) + 1
+        by_difficulty[shortcut['difficulty']] = by_difficulty.get(shortcut['difficulty'], 0) + 1
+    print(f"⌨️  {len(shortcuts)} shortcuts in {len(by_app)} applications")
+    print("=" * 50)
+    for application, count in sorted(by_app.items()):
+        print(f"   {application}: {count}")
+    print("=" * 50)
+    print("Categories:   " + ', '.join(f"{k} {v}" for k, v in sorted(by_category.items())))
+    print("Difficulties: " + ', '.join(f"{k} {by_difficulty.get(k, 0)}" for k in DIFFICULTIES))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Move the .dark-mode rules out of the pages' inline CSS.
+
+Every rule of an inline <style> whose selectors are all scoped to
+.dark-mode (body.dark-mode, .dark-mode td, ...) is cut from the page,
+including ones inside @media blocks, which move with their condition.
+The rules go to a stylesheet named by its content hash,
+
+    assets/css/dark/<hash>.css
+
+so the application pages that share the standardized template share one
+cached file. The page links it right after its inline styles:
+
+    <link rel="stylesheet" href="../../assets/css/dark/1a2b3c4d5e.css"
+          media="(prefers-color-scheme: dark)" data-dark-css>
+
+A stylesheet whose media does not match does not block rendering, so light
+mode paints from the smaller inline block alone. assets/js/dark-mode-css.js
+(added to the page) switches the stylesheet on when the dark-mode toggle
+puts .dark-mode on <body>. Rules with a mix of dark and light selectors
+stay inline.
+
+Running it again moves any .dark-mode rules a template transform put back
+into the page's stylesheet (a new hash), and stylesheets no page links any
+more are removed. Pages go through the batch page writer, so --dry-run
+shows the diffs; the inline CSS bytes removed are reported per page.
+
+Usage:
+    python split_dark_css.py [--dry-run] [paths...]
+"""
+
+import argparse
+import hashlib
+import os
+import posixpath
+import re
+import textwrap
+from urllib.parse import quote, unquote
+
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from page_corpus import find_pages
+from template_drift import application_pages
+
+SHEET_DIR = 'assets/css/dark'
+LOADER_SCRIPT = 'assets/js/dark-mode-css.js'
+SHEET_MEDIA = '(prefers-color-scheme: dark)'
+SHEET_HEADER = '/* .dark-mode rules moved out of the pages\' inline CSS by split_dark_css.py */\n'
+
+# The body stops at the next <style or </style, so an unclosed tag is not rescanned to the end of the page
+_style_pattern = re.compile(r'<style\b[^>]*>([^<]*(?:<(?!/?style\b)[^<]*)*)</style>', re.IGNORECASE)
+_sheet_link_pattern = re.compile(r'^[ \t]*<link rel="stylesheet" href="([^"]*)" media="[^"]*" data-dark-css>\n',
+                                 re.MULTILINE)
+_loader_pattern = re.compile(r'<script src="[^"]*dark-mode-css\.js" defer></script>')
+_dark_selector = re.compile(r'\.dark-mode(?![\w-])')
+
+
+def _skip_string(css, i, end):
+    quote_char = css[i]
+    i += 1
+    while i < end and css[i] != quote_char:
+        i += 2 if css[i] == '\\' else 1
+    return i + 1
+
+
+def _skip_space(css, i, end):
+    """Index of the next character that is not whitespace or inside a comment"""
+    while i < end:
+        if css[i].isspace():
+            i += 1
+        elif css.startswith('/*', i):
+            close = css.find('*/', i + 2, end)
+            i = end if close == -1 else close + 2
+        else:
+            break
+    return i
+
+
+def css_rules(css, start=0, end=None):
+    """Yield (start, end, prelude, body_start, body_end) for the rules in css[start:end]
+
+    Statements without a block (@import ...;) come back with a body of None.
+    """
+    end = len(css) if end is None else end
+    i = _skip_space(css, start, end)
+    while i < end:
+        rule_start = i
+        while i < end and css[i] not in '{;}':
+            if css[i] in '"\'':
+                i = _skip_string(css, i, end)
+            elif css.startswith('/*', i):
+                i = _skip_space(css, i, end)
+            else:
+                i += 1
+        if i >= end or css[i] == '}':
+            return
+        prelude = css[rule_start:i].strip()
+        if css[i] == ';':
+            yield rule_start, i + 1, prelude, None, None
+            i = _skip_space(css, i + 1, end)
+            continue
+        body_start = i + 1
+        depth = 0
+        while i < end:
+            if css[i] in '"\'':
+                i = _skip_string(css, i, end)
+                continue
+            if css.startswith('/*', i):
+                i = _skip_space(css, i, end)
+                continue
+            if css[i] == '{':
+                depth += 1
+            elif css[i] == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            i += 1
+        yield rule_start, i + 1, prelude, body_start, i
+        i = _skip_space(css, i + 1, end)
+
+
+def _selectors(prelude):
+    selectors, depth, current = [], 0, ''
+    for char in prelude:
+        depth += char in '(['
+        depth -= char in ')]'
+        if char == ',' and depth == 0:
+            selectors.append(current)
+            current = ''
+        else:
+            current += char
+    return selectors + [current]
+
+
+def is_dark_rule(prelude):
+    """True for a style rule whose selectors all only apply in dark mode"""
+    return not prelude.startswith('@') and all(_dark_selector.search(s) for s in _selectors(prelude))
+
+
+def _removal(css, start, end, floor):
+    """Span to cut for the rule at css[start:end], with the whitespace that leads up to it"""
+    while start > floor and css[start - 1].isspace():
+        start -= 1
+    return start, end
+
+
+def _rule_text(css, start, end):
+    line_start = css.rfind('\n', 0, start) + 1
+    indent = css[line_start:start] if not css[line_start:start].strip() else ''
+    return textwrap.dedent(indent + css[start:end])
+
+
+def split_style(css):
+    """Return ([(start, end)] spans to cut from css, [rule texts for the stylesheet])"""
+    removals = []
+    moved = []
+    for start, end, prelude, body_start, body_end in css_rules(css):
+        if body_start is None:
+            continue
+        if prelude.lower().startswith('@media'):
+            inner = list(css_rules(css, body_start, body_end))
+            dark = [rule for rule in inner if rule[3] is not None and is_dark_rule(rule[2])]
+            if not dark:
+                continue
+            texts = [_rule_text(css, rule[0], rule[1]) for rule in dark]
+            moved.append(f'{prelude} {{\n' + '\n\n'.join(textwrap.indent(t, '    ') for t in texts) + '\n}')
+            if len(dark) == len(inner):
+                removals.append(_removal(css, start, end, 0))
+            else:
+                removals.extend(_removal(css, rule[0], rule[1], body_start) for rule in dark)
+        elif is_dark_rule(prelude):
+            moved.append(_rule_text(css, start, end))
+            removals.append(_removal(css, start, end, 0))
+    return removals, moved
+
+
+def sheet_rules(sheet):
+    """The rule texts of a stylesheet written by this tool"""
+    return [_rule_text(sheet, start, end) for start, end, _, _, _ in css_rules(sheet)]
+
+
+def render_sheet(rules):
+    return SHEET_HEADER + '\n' + '\n\n'.join(rules) + '\n'
+
+
+def sheet_path(content):
+    return posixpath.join(SHEET_DIR, hashlib.sha1(content.encode('utf-8')).hexdigest()[:10] + '.css')
+
+
+def _url(from_dir, path):
+    return quote(posixpath.relpath(path, from_dir or '.'))
+
+
+def _linked_path(page_dir, href):
+    return posixpath.normpath(posixpath.join(page_dir, unquote(href)))
+
+
+def read_sheet(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def split_page(path, content):
+    """Return (Splice or None, sheet path, sheet content, stats) for one page"""
+    page_dir = posixpath.dirname(path.replace(os.sep, '/'))
+    splice = Splice(content)
+    inline_bytes = 0
+    removed_bytes = 0
+    rules = []
+    last_style = None
+    for style in _style_pattern.finditer(content):
+        css = style.group(1)
+        inline_bytes += len(css.encode('utf-8'))
+        removals, moved = split_style(css)
+        for start, end in removals:
+            splice.replace(style.start(1) + start, style.start(1) + end, '')
+            removed_bytes += len(css[start:end].encode('utf-8'))
+        if moved:
+            rules += moved
+            last_style = style
+    stats = {'rules': len(rules), 'inline_bytes': inline_bytes, 'removed_bytes': removed_bytes}
+
+    link = _sheet_link_pattern.search(content)
+    old_sheet = _linked_path(page_dir, link.group(1)) if link else None
+    if not rules:
+        return None, old_sheet, None, stats
+
+    if link:
+        existing = read_sheet(old_sheet)
+        kept = sheet_rules(existing) if existing else []
+        rules = kept + [rule for rule in rules if rule not in kept]
+    sheet = render_sheet(rules)
+    target = sheet_path(sheet)
+    href = _url(page_dir, target)
+    if link:
+        splice.replace(link.start(1), link.end(1), href)
+    else:
+        line_end = content.find('\n', last_style.end()) + 1 or len(content)
+        indent = re.match(r'[ \t]*', content[content.rfind('\n', 0, last_style.start()) + 1:]).group(0)
+        splice.replace(line_end, line_end, f'{indent}<link rel="stylesheet" href="{href}" '
+                                           f'media="{SHEET_MEDIA}" data-dark-css>\n')
+    if not _loader_pattern.search(content):
+        body_end = content.rfind('</body>')
+        if body_end != -1:
+            line_start = content.rfind('\n', 0, body_end) + 1
+            loader = _url(page_dir, LOADER_SCRIPT)
+            splice.replace(line_start, line_start, f'    <script src="{loader}" defer></script>\n')
+    return splice, target, sheet, stats
+
+
+def linked_sheets(root='.'):
+    """Every dark stylesheet some page links"""
+    linked = set()
+    for path in find_pages(root):
+        with open(os.path.join(root, path), 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        page_dir = posixpath.dirname(path.replace(os.sep, '/'))
+        linked.update(_linked_path(page_dir, m.group(1)) for m in _sheet_link_pattern.finditer(content))
+    return linked
+
+
+def split_dark_css(paths=None, dry_run=False, **io_options):
+    """Move the .dark-mode rules of the given pages into shared stylesheets"""
+    paths = paths or application_pages()
+    print(f"Splitting dark-mode CSS out of {len(paths)} pages...")
+    writer = PageWriter('split_dark_css', dry_run, **io_options)
+    writer.prefetch(paths)
+
+    results = {}
+    sheets = {}
+    for path in paths:
+        try:
+            content = writer.read(path)
+            new_content, target, sheet, stats = writer.apply(split_page, path, content)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"❌ Error processing {path}: {e}")
+            continue
+        results[path] = (content, new_content, target, stats)
+        if sheet is not None:
+            sheets[target] = sheet
+
+    changed_pages = [path for path, (_, new_content, _, _) in results.items() if new_content]
+    new_sheets = [target for target, sheet in sorted(sheets.items()) if read_sheet(target) != sheet]
+    writer.snapshot(changed_pages + new_sheets)
+    print("=" * 50)
+
+    # Stylesheets go first, so a page never links one that is not there yet
+    for target in new_sheets:
+        if not dry_run:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+        writer.write(target, '', sheets[target])
+    failed = writer.io.flush() if new_sheets else []
+    if failed:
+        for path, error in failed:
+            print(f"❌ Error writing {path}: {error}")
+        print("Pages left unchanged")
+        writer.finish()
+        return
+
+    total_inline = 0
+    total_removed = 0
+    for path, (content, new_content, target, stats) in results.items():
+        if not new_content:
+            print(f"✔️  No inline dark-mode rules: {path}")
+            continue
+        writer.write(path, content, new_content)
+        total_inline += stats['inline_bytes']
+        total_removed += stats['removed_bytes']
+        share = stats['removed_bytes'] / stats['inline_bytes'] if stats['inline_bytes'] else 0
+        print(f"🌙 {path}: {stats['rules']} rules → {target}, "
+              f"{stats['removed_bytes']:,} of {stats['inline_bytes']:,} inline CSS bytes removed ({share:.0%})")
+
+    failed = writer.finish()
+    removed_sheets = []
+    if not dry_run and not failed and os.path.isdir(SHEET_DIR):
+        linked = linked_sheets()
+        for name in sorted(os.listdir(SHEET_DIR)):
+            sheet = posixpath.join(SHEET_DIR, name)
+            if name.endswith('.css') and sheet not in linked:
+                os.unlink(sheet)
+                removed_sheets.append(sheet)
+                print(f"🗑️  Removed {sheet}")
+    print("=" * 50)
+    print(f"{len(changed_pages)} pages split, {len(new_sheets)} stylesheets written, "
+          f"{len(removed_sheets)} removed")
+    print(f"{total_removed:,} of {total_inline:,} bytes of render-blocking inline CSS removed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move .dark-mode rules into a media-gated stylesheet")
+    parser.add_argument('paths', nargs='*', help="Pages (default: all application pages)")
+    add_batch_arguments(parser, stream=False)
+    args = parser.parse_args()
+
+    split_dark_css(args.paths, **batch_options(args))
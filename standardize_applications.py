@@ -4,9 +4,12 @@ Script to standardize all application pages with Discord's design template.
 Applies consistent header, footer, table, and search container styling.
 """
 
+import argparse
 import os
 import re
-import glob
+
+from page_batch import PageWriter, Splice, add_batch_arguments, batch_options
+from page_corpus import iter_pages
 
 # Discord template CSS - the standardized styles
 DISCORD_TEMPLATE_CSS = """        /* Base styles with CSS variables for easier theming */
@@ -330,27 +333,28 @@ DISCORD_TEMPLATE_CSS = """        /* Base styles with CSS variables for easier t
             transform: translateY(-5px);
         }"""
 
-def standardize_application_page(file_path):
+# Find the CSS variables root section and replace with full template
+ROOT_PATTERN = r'([ ]*\/\* Base styles with CSS variables for easier theming \*\/\s*:root\s*{[^}]*})'
+STYLE_OPEN_PATTERN = r'(<style>\s*)'
+
+def standardize_content(content):
+    """Return a Splice applying the Discord template CSS to content"""
+    splice = Splice(content)
+    # Replace only the root variables with the full template
+    if not splice.sub(ROOT_PATTERN, DISCORD_TEMPLATE_CSS, re.DOTALL):
+        # If no root variables found, look for the style tag and add template
+        splice.sub(STYLE_OPEN_PATTERN, r'\1' + DISCORD_TEMPLATE_CSS + '\n\n        ')
+    return splice
+
+def standardize_application_page(file_path, writer):
     """Standardize a single application page with Discord template CSS"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Find the CSS variables root section and replace with full template
-        root_pattern = r'([ ]*\/\* Base styles with CSS variables for easier theming \*\/\s*:root\s*{[^}]*})'
+        content = writer.read(file_path)
         
-        if re.search(root_pattern, content, re.DOTALL):
-            # Replace only the root variables with the full template
-            content = re.sub(root_pattern, DISCORD_TEMPLATE_CSS, content, flags=re.DOTALL)
-        else:
-            # If no root variables found, look for the style tag and add template
-            style_pattern = r'(<style>\s*)'
-            if re.search(style_pattern, content):
-                content = re.sub(style_pattern, r'\1' + DISCORD_TEMPLATE_CSS + '\n\n        ', content)
+        new_content = writer.apply(standardize_content, content)
         
         # Write back the updated content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        writer.write(file_path, content, new_content)
         
         print(f"✅ Standardized: {os.path.basename(file_path)}")
         return True
@@ -359,26 +363,30 @@ def standardize_application_page(file_path):
         print(f"❌ Error processing {file_path}: {e}")
         return False
 
-def main():
+def main(dry_run=False, **io_options):
     """Main function to standardize all application pages"""
-    # Get all HTML files in the applications directory
+    # Get all HTML files in the applications directory, as they are found
     app_dir = "pages/applications"
-    html_files = glob.glob(os.path.join(app_dir, "*.html"))
+    html_files = (f for f in iter_pages(app_dir) if f.endswith('.html'))
     
     # Exclude Discord.html (it's our template) and Adobe PhotoShop.html (already done)
     exclude_files = ['Discord.html', 'Adobe PhotoShop.html', 'Microsoft Edge.html', 'VLC Media Player.html']
-    files_to_process = [f for f in html_files if not any(exc in f for exc in exclude_files)]
+    files_to_process = (f for f in html_files if not any(exc in f for exc in exclude_files))
     
-    print(f"Found {len(files_to_process)} application pages to standardize...")
+    print(f"Standardizing application pages in {app_dir}...")
+    writer = PageWriter('standardize_applications', dry_run, **io_options)
     print("="*60)
     
     success_count = 0
-    for file_path in files_to_process:
-        if standardize_application_page(file_path):
+    page_count = 0
+    for file_path in writer.begin(files_to_process):
+        page_count += 1
+        if standardize_application_page(file_path, writer):
             success_count += 1
     
     print("="*60)
-    print(f"Successfully standardized {success_count}/{len(files_to_process)} pages")
+    print(f"Successfully standardized {success_count}/{page_count} pages")
+    writer.finish()
     print("\n📋 Standardization includes:")
     print("• Header with consistent navigation and search")
     print("• Enhanced table styling with hover effects")
@@ -387,4 +395,7 @@ def main():
     print("• Responsive design elements")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Standardize application pages with the Discord template CSS")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+    main(**batch_options(args))
\ No newline at end of file
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Report structural drift between application pages and the Discord template.
+
+Each page is parsed into a light DOM tree and every element gets a Merkle
+hash built from its tag, its (normalized) attributes and the hashes of its
+children. The header, nav, search container, footer and every <style> rule
+are then compared with the template by hash alone; only subtrees whose hashes
+differ are walked further to name the exact child that drifted.
+
+Usage:
+    python template_drift.py [--template PAGE] [--json] [paths...]
+    python template_drift.py --list header     # pages whose header drifted
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+from difflib import SequenceMatcher
+from html.parser import HTMLParser
+
+from page_corpus import is_page, read_page
+
+TEMPLATE_PAGE = 'pages/applications/Discord.html'
+APPLICATIONS_DIR = 'pages/applications'
+
+# Subtrees compared against the template, in report order
+SUBTREES = ('header', 'nav', 'search-container', 'footer', 'style')
+
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+# Stop naming drifted children after this many per subtree
+MAX_DRIFT_PATHS = 10
+
+_whitespace = re.compile(r'\s+')
+_css_comment = re.compile(r'/\*.*?\*/', re.DOTALL)
+
+
+def _digest(*parts):
+    h = hashlib.sha1()
+    for part in parts:
+        h.update(part.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+class Node:
+    """An element in the page tree with a Merkle hash over its subtree"""
+
+    __slots__ = ('tag', 'attrs', 'children', 'hash')
+
+    def __init__(self, tag, attrs):
+        self.tag = tag
+        self.attrs = attrs
+        self.children = []
+        self.hash = None
+
+    @property
+    def label(self):
+        classes = self.attrs.get('class', '').split()
+        return self.tag + ''.join('.' + c for c in classes)
+
+    def elements(self):
+        return [child for child in self.children if isinstance(child, Node)]
+
+    def iter(self):
+        yield self
+        for child in self.elements():
+            yield from child.iter()
+
+    def find(self, predicate):
+        for node in self.iter():
+            if predicate(node):
+                return node
+        return None
+
+    def compute_hash(self):
+        child_hashes = []
+        for child in self.children:
+            if isinstance(child, Node):
+                child_hashes.append(child.compute_hash())
+            else:
+                child_hashes.append(_digest('#text', child))
+        attrs = ' '.join(f'{k}={v}' for k, v in sorted(self.attrs.items()))
+        self.hash = _digest(self.tag, attrs, *child_hashes)
+        return self.hash
+
+
+class _TreeBuilder(HTMLParser):
+    """Builds a Node tree, tolerating unclosed and stray tags"""
+
+    def __init__(self):
+        super().__init__()
+        self.root = Node('#document', {})
+        self.stack = [self.root]
+        self.styles = []
+
+    def handle_starttag(self, tag, attrs):
+        normalized = {}
+        for name, value in attrs:
+            value = _whitespace.sub(' ', value or '').strip()
+            if name == 'class':
+                value = ' '.join(sorted(value.split()))
+            normalized[name] = value
+        node = Node(tag, normalized)
+        self.stack[-1].children.append(node)
+        if tag not in VOID_ELEMENTS:
+            self.stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_ELEMENTS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+    def handle_data(self, data):
+        if self.stack[-1].tag == 'style':
+            self.styles.append(data)
+        text = _whitespace.sub(' ', data).strip()
+        if text:
+            self.stack[-1].children.append(text)
+
+
+def parse_style_rules(css):
+    """Return {selector: declarations} for each rule, keyed with its @-rule prefix"""
+    css = _css_comment.sub('', css)
+    rules = {}
+    prefixes = []
+    start = 0
+    for i, char in enumerate(css):
+        if char == '{':
+            selector = _whitespace.sub(' ', css[start:i]).strip()
+            prefixes.append(selector)
+            start = i + 1
+        elif char == '}':
+            if not prefixes:
+                start = i + 1
+                continue
+            body = css[start:i]
+            selector = prefixes.pop()
+            if body.strip() or not selector.startswith('@'):
+                key = ' '.join(prefixes + [selector])
+                declarations = _whitespace.sub(' ', body).strip()
+                # Keep both copies of a repeated selector distinguishable
+                while key in rules:
+                    key += ' (dup)'
+                rules[key] = declarations
+            start = i + 1
+    return rules
+
+
+def page_hashes(content):
+    """Parse a page (or fragment) and return its hashed subtrees"""
+    builder = _TreeBuilder()
+    builder.feed(content)
+    builder.close()
+    root = builder.root
+    root.compute_hash()
+
+    def has_class(name):
+        return lambda node: name in node.attrs.get('class', '').split()
+
+    rules = {}
+    for css in builder.styles:
+        rules.update(parse_style_rules(css))
+    rule_hashes = {selector: _digest(selector, body) for selector, body in rules.items()}
+
+    return {
+        'header': root.find(lambda node: node.tag == 'header'),
+        'nav': root.find(lambda node: node.tag == 'nav'),
+        'search-container': root.find(has_class('search-container')),
+        'footer': root.find(lambda node: node.tag == 'footer'),
+        'style': rule_hashes,
+    }
+
+
+def _drift_paths(expected, actual, path, paths):
+    """Collect the shallowest paths where two element subtrees stop matching"""
+    if expected.hash == actual.hash or len(paths) >= MAX_DRIFT_PATHS:
+        return
+    if expected.tag != actual.tag or expected.attrs != actual.attrs:
+        paths.append(path)
+        return
+    expected_children = expected.elements()
+    actual_children = actual.elements()
+    matcher = SequenceMatcher(None, [c.label for c in expected_children],
+                              [c.label for c in actual_children], autojunk=False)
+    before = len(paths)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == 'equal':
+            for exp_child, act_child in zip(expected_children[i1:i2], actual_children[j1:j2]):
+                _drift_paths(exp_child, act_child, f'{path} > {act_child.label}', paths)
+            continue
+        for child in expected_children[i1:i2]:
+            paths.append(f'{path} > {child.label} (missing)')
+        for child in actual_children[j1:j2]:
+            paths.append(f'{path} > {child.label} (extra)')
+    if len(paths) == before:
+        # Only text directly inside this element differs
+        paths.append(path)
+
+
+def compare_subtree(name, expected, actual):
+    """Compare one named subtree; return None when it matches the template"""
+    if name == 'style':
+        changed = sorted(s for s in expected if s in actual and expected[s] != actual[s])
+        missing = sorted(s for s in expected if s not in actual)
+        extra = sorted(s for s in actual if s not in expected)
+        if not (changed or missing or extra):
+            return None
+        return {'changed': changed, 'missing': missing, 'extra': extra}
+
+    if expected is None and actual is None:
+        return None
+    if actual is None:
+        return {'status': 'missing'}
+    if expected is None:
+        return {'status': 'extra'}
+    if expected.hash == actual.hash:
+        return None
+    paths = []
+    _drift_paths(expected, actual, actual.label, paths)
+    return {'status': 'differs', 'paths': paths}
+
+
+def compare_page(template, content, subtrees=SUBTREES):
+    """Return {subtree: drift} for every subtree of a page that drifted"""
+    hashes = page_hashes(content)
+    drift = {}
+    for name in subtrees:
+        result = compare_subtree(name, template[name], hashes[name])
+        if result is not None:
+            drift[name] = result
+    return drift
+
+
+def application_pages(directory=APPLICATIONS_DIR):
+    """Return every page in a directory"""
+    return sorted(p for p in glob.glob(os.path.join(directory, '*')) if is_page(p))
+
+
+def drifted_pages(subtree, reference, directory=APPLICATIONS_DIR, template_path=TEMPLATE_PAGE):
+    """Return the file names in directory whose subtree differs from reference.
+
+    reference is the HTML of the template page, or just a fragment holding
+    the expected subtree (e.g. the correct <header> markup). The template
+    page itself is never selected, as in build_report().
+    """
+    template = page_hashes(reference)
+    selected = []
+    for path in application_pages(directory):
+        if template_path and os.path.abspath(path) == os.path.abspath(template_path):
+            continue
+        if compare_page(template, read_page(path), (subtree,)):
+            selected.append(os.path.basename(path))
+    return selected
+
+
+def build_report(template_path, paths, subtrees=SUBTREES):
+    """Return the drift of every page against the template page"""
+    template = page_hashes(read_page(template_path))
+    report = {}
+    for path in paths:
+        if os.path.abspath(path) == os.path.abspath(template_path):
+            continue
+        report[path] = compare_page(template, read_page(path), subtrees)
+    return report
+
+
+def print_report(template_path, report):
+    """Print a human readable drift report"""
+    print(f"Comparing {len(report)} pages against {template_path}")
+    print("=" * 50)
+    clean = 0
+    for path, drift in report.items():
+        if not drift:
+            clean += 1
+            continue
+        print(f"\n📄 {path}")
+        for name, result in drift.items():
+            if name == 'style':
+                print(f"   style: {len(result['changed'])} changed, "
+                      f"{len(result['missing'])} missing, {len(result['extra'])} extra rules")
+                for selector in result['changed'][:MAX_DRIFT_PATHS]:
+                    print(f"      ~ {selector}")
+                for selector in result['missing'][:MAX_DRIFT_PATHS]:
+                    print(f"      - {selector}")
+            elif result['status'] == 'differs':
+                print(f"   {name}: differs at")
+                for path_label in result['paths']:
+                    print(f"      {path_label}")
+            else:
+                print(f"   {name}: {result['status']}")
+    print("=" * 50)
+    print(f"{clean}/{len(report)} pages match the template")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report structural drift from the template page")
+    parser.add_argument('paths', nargs='*', help="Pages to compare (default: all application pages)")
+    parser.add_argument('--template', default=TEMPLATE_PAGE, help="Template page (default: %(default)s)")
+    parser.add_argument('--subtree', action='append', choices=SUBTREES,
+                        help="Only compare these subtrees (repeatable)")
+    parser.add_argument('--list', metavar='SUBTREE', choices=SUBTREES,
+                        help="Only print the pages whose SUBTREE drifted, one per line")
+    parser.add_argument('--json', action='store_true', help="Print the report as JSON")
+    args = parser.parse_args()
+
+    paths = args.paths or application_pages()
+    subtrees = (args.list,) if args.list else tuple(args.subtree or SUBTREES)
+    report = build_report(args.template, paths, subtrees)
+
+    if args.list:
+        for path, drift in report.items():
+            if drift:
+                print(path)
+    elif args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(args.template, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Verify the structure of the application pages in a single pass per page.
+
+Replaces the grep-based checks in scripts/verify_structure.sh,
+scripts/verify_updates.sh and scripts/verify_excel.sh. Every page is loaded
+once through the pre-parsed page cache and all structural assertions are
+evaluated against its tag and style-rule tables. Pages are spread over a
+process pool and the results can be emitted as JSON.
+
+Usage:
+    python verify_pages.py [--json] [--check NAME] [--workers N] [paths...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import unquote
+
+from page_cache import FLAG_CLOSING, ROW_FIELDS, TAG_FIELDS, load_page
+from template_drift import application_pages
+
+EXPECTED_NAV_ITEMS = ['Blogs', 'Features', 'Testimonials', 'About', 'Quiz']
+EXPECTED_FOOTER_COLUMNS = 4
+
+# Pages every other page links back to
+HOME_PAGE = 'home-page.html'
+BLOGS_PAGE = 'pages/blogs/blogs.html'
+
+# Selectors the standardized template CSS always defines
+TEMPLATE_SELECTORS = [':root', '.main-header', '.main-nav ul', '.quiz-btn a',
+                      '.search-container', '.table-container', 'footer', '.footer-column']
+
+
+def _classes(page, index):
+    return page.tag_attrs(index).get('class', '').split()
+
+
+def _find(page, name, cls=None, within=None):
+    """Return opening tag indices of name (with class cls) inside an optional span"""
+    found = []
+    for index, start, end in page.iter_tags(name):
+        if within is not None and not within[0] <= index < within[1]:
+            continue
+        if cls is None or cls in _classes(page, index):
+            found.append(index)
+    return found
+
+
+def _element(page, index):
+    """Return (first, last) tag indices covered by the element opened at index"""
+    name = page.tag_name(index)
+    depth = 0
+    for i in range(index, page.tag_count):
+        if page.tag_name(i) != name:
+            continue
+        closing = page.tags[i * TAG_FIELDS + 3] & FLAG_CLOSING
+        depth += -1 if closing else 1
+        if depth == 0:
+            return index, i
+    return index, page.tag_count
+
+
+def _link_texts(page, span):
+    """Return [(text, href)] for every <a> inside a tag span"""
+    links = []
+    for index in _find(page, 'a', within=span):
+        first, last = _element(page, index)
+        # Text between the tags inside the link, so icons are skipped
+        text = ''.join(page.text(page.tags[i * TAG_FIELDS + 1], page.tags[(i + 1) * TAG_FIELDS])
+                       for i in range(first, min(last, page.tag_count - 1)))
+        links.append((' '.join(text.split()), page.tag_attrs(index).get('href', '')))
+    return links
+
+
+def check_header_class(page):
+    headers = _find(page, 'header')
+    if not headers:
+        return False, "no <header>"
+    classes = _classes(page, headers[0])
+    return 'main-header' in classes, f"class=\"{' '.join(classes)}\""
+
+
+def check_nav_items(page):
+    navs = _find(page, 'nav')
+    if not navs:
+        return False, "no <nav>"
+    labels = [text for text, _ in _link_texts(page, _element(page, navs[0]))]
+    missing = [item for item in EXPECTED_NAV_ITEMS if item not in labels]
+    return not missing, f"missing {', '.join(missing)}" if missing else ', '.join(labels)
+
+
+def check_nav_links(page):
+    navs = _find(page, 'nav')
+    if not navs:
+        return False, "no <nav>"
+    base = os.path.dirname(page.path)
+    broken = []
+    for _, href in _link_texts(page, _element(page, navs[0])):
+        target = href.split('#')[0].split('?')[0]
+        if not target or '://' in target or target.startswith(('mailto:', 'javascript:')):
+            continue
+        if not os.path.exists(os.path.normpath(os.path.join(base, target))):
+            broken.append(href)
+    return not broken, f"broken {', '.join(broken)}" if broken else "all resolve"
+
+
+def _local_target(page, url):
+    """Path a relative URL on the page points at, or None for external and empty URLs"""
+    target = url.split('#')[0].split('?')[0]
+    if not target or '://' in target or target.startswith(('mailto:', 'javascript:', 'data:', '//')):
+        return None
+    return os.path.normpath(os.path.join(os.path.dirname(page.path), unquote(target)))
+
+
+def check_site_links(page):
+    targets = {_local_target(page, page.tag_attrs(index).get('href', '')) for index in _find(page, 'a')}
+    missing = [name for name in (HOME_PAGE, BLOGS_PAGE)
+               if os.path.normpath(name) not in targets and os.path.normpath(page.path) != os.path.normpath(name)]
+    return not missing, f"no link to {', '.join(missing)}" if missing else "links home and blogs"
+
+
+def check_image_paths(page):
+    images = [page.tag_attrs(index).get('src', '') for index in _find(page, 'img')]
+    broken = [src for src in images if _local_target(page, src) and not os.path.exists(_local_target(page, src))]
+    return not broken, f"missing {', '.join(broken)}" if broken else f"{len(images)} images resolve"
+
+
+def check_quiz_button(page):
+    navs = _find(page, 'nav')
+    span = _element(page, navs[0]) if navs else None
+    found = span is not None and bool(_find(page, 'li', 'quiz-btn', within=span))
+    return found, "li.quiz-btn in nav" if found else "no li.quiz-btn in nav"
+
+
+def check_search_container(page):
+    containers = _find(page, 'div', 'search-container')
+    if not containers:
+        return False, "no .search-container"
+    span = _element(page, containers[0])
+    has_input = bool(_find(page, 'input', within=span))
+    has_button = bool(_find(page, 'button', within=span))
+    return has_input and has_button, f"input={has_input} button={has_button}"
+
+
+def check_footer_columns(page):
+    footers = _find(page, 'footer')
+    if not footers:
+        return False, "no <footer>"
+    columns = len(_find(page, 'div', 'footer-column', within=_element(page, footers[0])))
+    return columns == EXPECTED_FOOTER_COLUMNS, f"{columns} columns"
+
+
+def check_unique_table_ids(page):
+    seen = {}
+    for index in _find(page, 'table'):
+        table_id = page.tag_attrs(index).get('id')
+        if table_id:
+            seen[table_id] = seen.get(table_id, 0) + 1
+    duplicates = sorted(table_id for table_id, count in seen.items() if count > 1)
+    return not duplicates, f"duplicate {', '.join(duplicates)}" if duplicates else f"{len(seen)} ids"
+
+
+def check_template_css(page):
+    selectors = {selector for selector, _, _ in page.iter_rules()}
+    missing = [s for s in TEMPLATE_SELECTORS if s not in selectors]
+    return not missing, f"missing {', '.join(missing)}" if missing else "all present"
+
+
+CHECKS = {
+    'header_class': check_header_class,
+    'nav_items': check_nav_items,
+    'nav_links': check_nav_links,
+    'site_links': check_site_links,
+    'image_paths': check_image_paths,
+    'quiz_button': check_quiz_button,
+    'search_container': check_search_container,
+    'footer_columns': check_footer_columns,
+    'unique_table_ids': check_unique_table_ids,
+    'template_css': check_template_css,
+}
+
+
+def verify_page(path, check_names=tuple(CHECKS)):
+    """Run the selected checks against one page"""
+    try:
+        page = load_page(path)
+    except OSError as e:
+        return {'passed': False, 'error': str(e), 'checks': {}}
+    with page:
+        checks = {}
+        for name in check_names:
+            ok, detail = CHECKS[name](page)
+            checks[name] = {'ok': ok, 'detail': detail}
+        stats = {
+            'tables': len(_find(page, 'table')),
+            'rows': len(page.rows) // ROW_FIELDS,
+            'sections': len(_find(page, 'h2', 'section-title')),
+        }
+    return {'passed': all(c['ok'] for c in checks.values()), 'checks': checks, 'stats': stats}
+
+
+def verify_pages(paths, check_names=tuple(CHECKS), workers=None):
+    """Verify pages on a process pool; return {path: result} in input order"""
+    if workers == 1 or len(paths) < 2:
+        return {path: verify_page(path, check_names) for path in paths}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(verify_page, paths, [check_names] * len(paths), chunksize=4)
+        return dict(zip(paths, results))
+
+
+def print_report(results, elapsed):
+    """Print a human readable verification report"""
+    print(f"Verifying {len(results)} pages...")
+    print("=" * 50)
+    for path, result in results.items():
+        if result.get('error'):
+            print(f"❌ {path}: {result['error']}")
+            continue
+        status = "✅" if result['passed'] else "❌"
+        print(f"{status} {path}")
+        for name, check in result['checks'].items():
+            if not check['ok']:
+                print(f"      ✗ {name}: {check['detail']}")
+    passed = sum(1 for r in results.values() if r['passed'])
+    print("=" * 50)
+    print(f"{passed}/{len(results)} pages passed all checks in {elapsed * 1000:.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify page structure across the site")
+    parser.add_argument('paths', nargs='*', help="Pages to verify (default: all application pages)")
+    parser.add_argument('--check', action='append', choices=sorted(CHECKS),
+                        help="Only run these checks (repeatable)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--json', action='store_true', help="Print machine-readable results")
+    args = parser.parse_args()
+
+    paths = args.paths or application_pages()
+    check_names = tuple(args.check or CHECKS)
+
+    start = time.perf_counter()
+    results = verify_pages(paths, check_names, args.workers)
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        passed = sum(1 for r in results.values() if r['passed'])
+        print(json.dumps({
+            'summary': {'pages': len(results), 'passed': passed,
+                        'failed': len(results) - passed, 'elapsed_ms': round(elapsed * 1000, 1)},
+            'pages': results,
+        }, indent=2))
+    else:
+        print_report(results, elapsed)
+
+    sys.exit(0 if all(r['passed'] for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()